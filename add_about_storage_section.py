@@ -1,6 +1,7 @@
 import os
 import re
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def add_about_storage_section():
     """
@@ -73,8 +74,7 @@ def add_about_storage_section():
                     
                     # Save the modified content
                     try:
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(str(soup))
+                        write_if_changed(file_path, str(soup))
                         modified_count += 1
                         print(f"Added About Storage section to {file_path}")
                     except Exception as e:
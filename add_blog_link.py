@@ -1,6 +1,9 @@
 import os
 import re
 from pathlib import Path
+from site_writer import write_if_changed
+from site_paths import is_generated_page
+from site_templates import require_inline_pages
 
 def add_blog_link_to_headers():
     """
@@ -8,6 +11,7 @@ def add_blog_link_to_headers():
     """
     # Directory to search for HTML files
     website_dir = 'website'
+    require_inline_pages(website_dir, "The header links the blog through NAV_LINKS in site_templates.py; change it there and rebuild.")
     
     # Counter for modified pages
     modified_pages = 0
@@ -23,8 +27,8 @@ def add_blog_link_to_headers():
                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                     content = f.read()
                 
-                # Skip if blog link already exists in navigation
-                if '<a href="../blog/index.html">Blog</a>' in content or '<a href="blog/index.html">Blog</a>' in content:
+                # Skip if blog link already exists in navigation; pages rendered from site_templates.py always have it
+                if is_generated_page(content) or '<a href="../blog/index.html">Blog</a>' in content or '<a href="blog/index.html">Blog</a>' in content:
                     skipped_pages += 1
                     continue
                 
@@ -44,8 +48,7 @@ def add_blog_link_to_headers():
                     new_content = content.replace(nav_match.group(0), replacement)
                     
                     # Write the modified content back to the file
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
+                    write_if_changed(file_path, new_content)
                     modified_pages += 1
     
     print(f"Added blog link to {modified_pages} pages")
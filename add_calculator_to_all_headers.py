@@ -1,5 +1,7 @@
 import os
 import re
+from site_writer import write_if_changed
+from site_templates import require_inline_pages
 
 def add_calculator_to_all_headers():
     """
@@ -7,6 +9,7 @@ def add_calculator_to_all_headers():
     """
     # Directory to search for HTML files
     website_dir = 'website'
+    require_inline_pages(website_dir, "The header links the calculator through NAV_LINKS in site_templates.py; change it there and rebuild.")
     
     # Pattern to find the navigation UL in the header
     nav_pattern = r'<nav>\s*<ul>(.*?)</ul>\s*</nav>'
@@ -52,8 +55,7 @@ def add_calculator_to_all_headers():
                     content = content.replace(nav_match.group(1), new_nav)
                     
                     # Write the updated content back to the file
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    write_if_changed(file_path, content)
                     
                     modified_pages += 1
     
@@ -1,14 +1,9 @@
 import os
 import re
+from site_locks import edit_page
+from page_index import load_page_index
 
 def add_favicon_to_file(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-    
-    # Check if favicon already exists
-    if 'rel="icon"' in content:
-        return
-    
     # Calculate relative path to assets
     rel_path = os.path.relpath('website/assets', os.path.dirname(file_path)).replace('\\', '/')
     if not rel_path.startswith('.'):
@@ -18,23 +13,26 @@ def add_favicon_to_file(file_path):
     favicon_links = f'''<link rel="icon" type="image/png" sizes="32x32" href="{rel_path}/img/favicon-32x32.png"/>
 <link rel="icon" type="image/png" sizes="16x16" href="{rel_path}/img/favicon-16x16.png"/>'''
     
-    # Add favicon links after meta description
-    content = re.sub(
-        r'(<meta[^>]*description[^>]*>)',
-        r'\1\n' + favicon_links,
-        content
-    )
+    def add_links(content):
+        # Check if favicon already exists
+        if 'rel="icon"' in content:
+            return None
+        
+        # Add favicon links after meta description
+        return re.sub(
+            r'(<meta[^>]*description[^>]*>)',
+            r'\1\n' + favicon_links,
+            content
+        )
     
-    with open(file_path, 'w', encoding='utf-8') as file:
-        file.write(content)
+    # The page is locked from read to write, so concurrent scripts cannot lose this edit
+    edit_page(file_path, add_links)
 
 def process_directory(directory):
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.html'):
-                file_path = os.path.join(root, file)
-                print(f"Processing: {file_path}")
-                add_favicon_to_file(file_path)
+    # Pages that already have a favicon are skipped without being opened
+    for file_path in load_page_index(directory).pages_without('favicon'):
+        print(f"Processing: {file_path}")
+        add_favicon_to_file(file_path)
 
 if __name__ == "__main__":
     process_directory('website') 
\ No newline at end of file
@@ -3,6 +3,7 @@ import re
 from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
+from site_writer import write_if_changed
 
 def find_all_html_files():
     """Find all HTML files in the website directory."""
@@ -123,8 +124,7 @@ def add_meta_description(filepath):
                     soup.insert(0, head)
         
         # Write the updated HTML back to the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(filepath, str(soup))
         
         return {'filepath': filepath, 'status': 'updated', 'message': f"Added meta description for {page_type} page"}
     
@@ -1,5 +1,6 @@
 import os
 import re
+from site_writer import write_if_changed
 
 def add_ontoplist_badge(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -21,8 +22,7 @@ def add_ontoplist_badge(file_path):
     # Replace closing footer tag with badge + closing tag
     new_content = content.replace('</footer>', f'{badge_html}</footer>')
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    write_if_changed(file_path, new_content)
     
     print(f"Added badge to {file_path}")
 
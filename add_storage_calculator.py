@@ -1,5 +1,6 @@
 import os
 import re
+from site_writer import write_if_changed
 
 def add_storage_calculator():
     """
@@ -186,8 +187,7 @@ def add_storage_calculator():
             print("Added JavaScript file reference to the head section")
         
         # Save the updated homepage
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_if_changed(homepage_path, content)
         
         print("Successfully updated the homepage with the storage calculator!")
     else:
@@ -1,6 +1,7 @@
 import os
 import re
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 # Bedford styling - this will be applied to all other city pages
 BEDFORD_STYLE = """
@@ -126,8 +127,7 @@ def apply_consistent_styling(filepath):
         style_tag.string = BEDFORD_STYLE
         
         # Save the updated file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(filepath, str(soup))
         
         print(f"Updated styling for {filepath}")
         return True
@@ -0,0 +1,369 @@
+import os
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import contextlib
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+BASELINE_FILE = "benchmark_baseline.json"
+
+# Regions used when there is no website/ directory to borrow names from
+FALLBACK_REGIONS = [
+    "greater-london", "greater-manchester", "west-yorkshire", "west-midlands",
+    "hampshire", "kent", "essex", "devon", "lancashire", "surrey"
+]
+
+CITY_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8"/>
+<title>Self Storage in {city}, {region} | Find Local Facilities</title>
+<meta content="Looking for self storage in {city}, {region}? Compare local storage facilities." name="description"/>
+<link href="../../assets/css/style.css" rel="stylesheet"/>
+</head>
+<body><header><div class="container"><div class="logo">Storage Finder</div>
+<nav><ul>
+<li><a href="../../index.html">Home</a></li>
+<li><a href="../../selfstorageregions/index.html">Regions</a></li>
+<li><a href="../../faq/index.html">FAQ</a></li>
+</ul></nav></div></header>
+<div class="container"><main>
+<h1>Self Storage in {city}, {region}</h1>
+<h2>Storage Providers in {city}</h2>
+<div class="storage-list"></div>
+</main></div>
+<footer><div class="container"><div class="footer-bottom"><p>© 2025 Storage Finder. All rights reserved.</p></div></div></footer>
+</body>
+</html>
+"""
+
+REGION_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8"/>
+<title>Self Storage in {region} - Find Storage Units Near You</title>
+<meta content="Find the best self storage facilities in {region}. Compare prices and features." name="description"/>
+<link href="../assets/css/style.css" rel="stylesheet"/>
+</head>
+<body><header><div class="container"><div class="logo">Storage Finder</div>
+<nav><ul>
+<li><a href="../index.html">Home</a></li>
+<li><a href="../selfstorageregions/index.html">Regions</a></li>
+<li><a href="../faq/index.html">FAQ</a></li>
+</ul></nav></div></header>
+<div class="container"><main>
+<h1>Self Storage in {region}</h1>
+<div class="cities-grid">{cards}</div>
+<div class="storage-list"><p>Browse the cities below to find storage near you.</p></div>
+</main></div>
+<footer><div class="container"><div class="footer-bottom"><p>© 2025 Storage Finder. All rights reserved.</p></div></div></footer>
+</body>
+</html>
+"""
+
+CITY_CARD = '<div class="city-card"><h3>{city}</h3><p>0 Storage Facilities</p><a href="selfstorage{slug}/index.html">View Storage Options</a></div>'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the main site build stages on a synthetic corpus")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000], help="Corpus sizes in facilities (e.g. 10000 100000)")
+    parser.add_argument("--stages", nargs="+", help="Only run these stages")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic corpus")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Path to the JSON baseline file")
+    parser.add_argument("--save", action="store_true", help="Append this run to the baseline file")
+    parser.add_argument("--compare", action="store_true", help="Compare this run with the latest baseline of the same size")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown ratio reported as a regression")
+    parser.add_argument("--threads", type=int, default=8, help="Number of threads for the verification stage")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary workspace for inspection")
+    return parser.parse_args()
+
+def current_commit():
+    """Return the short hash of the checked out commit, if any."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def region_names():
+    """Borrow the real region slugs from the website directory when available."""
+    if os.path.isdir("website"):
+        regions = sorted(
+            item[len('selfstorage'):] for item in os.listdir("website")
+            if item.startswith('selfstorage') and item != 'selfstorageregions'
+            and os.path.isdir(os.path.join("website", item))
+        )
+        if regions:
+            return regions
+    return FALLBACK_REGIONS
+
+def build_corpus(facility_count, seed):
+    """Generate a synthetic {region/city: [facility, ...]} corpus via generate_storage_data."""
+    from bulk_update_storage_facilities import generate_storage_data
+
+    random.seed(seed)
+    regions = region_names()
+    corpus = {}
+    total = 0
+    index = 0
+
+    while total < facility_count:
+        region = regions[index % len(regions)]
+        city_key = f"{region.replace('-', ' ')}/town{index}"
+        count = min(random.randint(3, 8), facility_count - total)
+        facilities = generate_storage_data(city_key, count)
+        corpus[city_key] = facilities
+        total += len(facilities)
+        index += 1
+
+    return corpus
+
+def write_corpus_csv(corpus, csv_path):
+    """Write the corpus in the master_storage_facilities.csv format."""
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Region", "City", "Name", "Address", "Phone", "Website", "Description", "Features"])
+        for city_key, facilities in corpus.items():
+            region, city = city_key.split('/')
+            for facility in facilities:
+                writer.writerow([
+                    region.title(), city.title(), facility['name'], facility['address'],
+                    facility['phone'], facility['website'], facility['description'],
+                    ", ".join(facility['features'])
+                ])
+
+def write_corpus_xlsx(corpus, xlsx_path):
+    """Write the corpus in the layout of 'self storage facilities uk.xlsx'."""
+    import pandas as pd
+
+    rows = []
+    for city_key, facilities in corpus.items():
+        region, city = city_key.split('/')
+        for facility in facilities:
+            rows.append({
+                'Region': region.title(),
+                'CITY': city.title(),
+                'Name of Self Storage': facility['name'],
+                'Website': facility['website'],
+                'Email / Contact': '',
+                'Telephone Number': facility['phone'],
+                'Location': facility['address'],
+                'Town Population': ''
+            })
+    pd.DataFrame(rows).to_excel(xlsx_path, index=False)
+
+def scaffold_website(corpus, website_dir):
+    """Create empty region and city pages for the corpus to be rendered into."""
+    cities_by_region = {}
+    for city_key in corpus:
+        region, city = city_key.split('/')
+        cities_by_region.setdefault(region, []).append(city)
+
+    for region, cities in cities_by_region.items():
+        region_dir = os.path.join(website_dir, f"selfstorage{region.replace(' ', '-')}")
+        cards = "".join(CITY_CARD.format(city=city.title(), slug=city.replace(' ', '-')) for city in cities)
+        os.makedirs(region_dir, exist_ok=True)
+        with open(os.path.join(region_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(REGION_PAGE.format(region=region.title(), cards=cards))
+
+        for city in cities:
+            city_dir = os.path.join(region_dir, f"selfstorage{city.replace(' ', '-')}")
+            os.makedirs(city_dir, exist_ok=True)
+            with open(os.path.join(city_dir, 'index.html'), 'w', encoding='utf-8') as f:
+                f.write(CITY_PAGE.format(city=city.title(), region=region.title()))
+
+def stage_csv_load(context):
+    from bulk_update_storage_facilities import read_csv_data
+    context["csv_data"] = read_csv_data(context["csv_path"])
+
+def stage_xlsx_load(context):
+    import pandas as pd
+    context["excel_data"] = pd.read_excel(context["xlsx_path"])
+
+def stage_normalization(context):
+    from site_paths import clean_name, to_selfstorage_path
+
+    grouped = {}
+    for city_key, facilities in context["corpus"].items():
+        region, city = city_key.split('/')
+        region_slug = to_selfstorage_path(clean_name(region))
+        city_slug = to_selfstorage_path(clean_name(city))
+        grouped.setdefault(region_slug, {}).setdefault(city_slug, []).extend(facilities)
+    context["normalized"] = grouped
+
+def stage_city_render(context):
+    from bulk_update_storage_facilities import find_city_page, update_city_page
+
+    region_updates = {}
+    for city_key, facilities in context["corpus"].items():
+        region, city = city_key.split('/')
+        success, message, count = update_city_page(find_city_page(region, city), facilities)
+        if success:
+            region_updates.setdefault(region, {})[city_key] = count
+    context["region_updates"] = region_updates
+
+def stage_region_render(context):
+    from bulk_update_storage_facilities import update_region_city_cards
+
+    region_updates = {}
+    for city_key, facilities in context["corpus"].items():
+        region_updates.setdefault(city_key.split('/')[0], {})[city_key] = len(facilities)
+    for region, city_updates in region_updates.items():
+        update_region_city_cards(region, city_updates)
+
+def stage_template_render(context):
+    from site_paths import region_page_path, city_page_path
+    from site_templates import render_city_page, render_region_page
+
+    cities_by_region = {}
+    for city_key, facilities in context["corpus"].items():
+        region, city = city_key.split('/')
+        cities_by_region.setdefault(region, []).append((city, facilities))
+
+    for region, cities in cities_by_region.items():
+        with open(os.path.join("website", region_page_path(region)), 'wb') as f:
+            f.write(render_region_page(region.title(), [(city.title(), len(facilities)) for city, facilities in cities]))
+        for city, facilities in cities:
+            with open(os.path.join("website", city_page_path(region, city)), 'wb') as f:
+                f.write(render_city_page(region.title(), city.title(), facilities))
+
+def stage_search_index(context):
+    from find_all_storage_pages import collect_storage_pages
+
+    regions, cities = collect_storage_pages("website")
+    with open("storage_site_data.json", 'w', encoding='utf-8') as f:
+        json.dump({'regions': regions, 'cities': cities}, f, indent=2)
+
+def stage_sitemap(context):
+    from generate_sitemap import generate_sitemap
+    generate_sitemap()
+
+def stage_verification(context):
+    from verify_website_structure import check_html_file, find_all_html_files
+
+    html_files = find_all_html_files()
+    with ThreadPoolExecutor(max_workers=context["threads"]) as executor:
+        list(executor.map(check_html_file, html_files))
+
+STAGES = [
+    ("csv_load", stage_csv_load),
+    ("xlsx_load", stage_xlsx_load),
+    ("normalization", stage_normalization),
+    ("city_render", stage_city_render),
+    ("region_render", stage_region_render),
+    ("template_render", stage_template_render),
+    ("search_index", stage_search_index),
+    ("sitemap", stage_sitemap),
+    ("verification", stage_verification)
+]
+
+def run_benchmark(size, seed, stage_names=None, threads=8, keep=False):
+    """Time every stage on a fresh synthetic corpus of the given size."""
+    repo_dir = os.getcwd()
+    workspace = tempfile.mkdtemp(prefix="storage_benchmark_")
+    results = {}
+
+    try:
+        print(f"Generating synthetic corpus of {size} facilities...")
+        corpus = build_corpus(size, seed)
+        context = {
+            "corpus": corpus,
+            "threads": threads,
+            "csv_path": os.path.join(workspace, "facilities.csv"),
+            "xlsx_path": os.path.join(workspace, "facilities.xlsx")
+        }
+        write_corpus_csv(corpus, context["csv_path"])
+        try:
+            write_corpus_xlsx(corpus, context["xlsx_path"])
+        except ImportError:
+            pass
+        scaffold_website(corpus, os.path.join(workspace, "website"))
+        print(f"Corpus has {len(corpus)} cities in {workspace}")
+
+        os.chdir(workspace)
+        for name, stage in STAGES:
+            if stage_names and name not in stage_names:
+                continue
+
+            start = time.perf_counter()
+            try:
+                # The scripts print a line per page; keep that out of the report
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    stage(context)
+            except ImportError as e:
+                print(f"- {name}: skipped ({e})")
+                results[name] = None
+                continue
+            results[name] = round(time.perf_counter() - start, 3)
+            print(f"- {name}: {results[name]:.3f} seconds")
+    finally:
+        os.chdir(repo_dir)
+        if keep:
+            print(f"Workspace kept at {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    return {
+        "commit": current_commit(),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "facilities": size,
+        "cities": len(corpus),
+        "stages": results
+    }
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {"runs": []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_with_baseline(run, baseline, threshold):
+    """Print stage timings against the latest baseline run of the same size."""
+    previous = [r for r in baseline["runs"] if r["facilities"] == run["facilities"]]
+    if not previous:
+        print(f"No baseline for {run['facilities']} facilities yet")
+        return []
+
+    reference = previous[-1]
+    regressions = []
+    print(f"\nCompared with {reference['commit']} ({reference['timestamp']}):")
+    for name, seconds in run["stages"].items():
+        old = reference["stages"].get(name)
+        if seconds is None or not old:
+            continue
+        change = seconds / old - 1
+        marker = "  REGRESSION" if change > threshold else ""
+        print(f"- {name}: {old:.3f}s -> {seconds:.3f}s ({change:+.1%}){marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+def main():
+    args = parse_args()
+    baseline = load_baseline(args.baseline)
+    regressions = []
+
+    for size in args.sizes:
+        print(f"\nBenchmarking build stages with {size} facilities")
+        run = run_benchmark(size, args.seed, args.stages, args.threads, args.keep)
+
+        if args.compare:
+            regressions.extend(compare_with_baseline(run, baseline, args.threshold))
+
+        if args.save:
+            baseline["runs"].append(run)
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline saved to: {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) slower than the baseline by more than {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
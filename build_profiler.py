@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import atexit
+import pstats
+import cProfile
+import functools
+import threading
+from contextlib import contextmanager
+
+# Set to a file path to record a trace from scripts without command line options
+TRACE_ENV_VAR = "STORAGE_BUILD_TRACE"
+
+class BuildProfiler:
+    """Record timed spans for build stages and pages.
+
+    Spans are kept as Chrome trace events so a run can be opened in
+    chrome://tracing or Perfetto. Recording is off until enable() is called,
+    so instrumented scripts pay almost nothing by default.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.cprofile = None
+
+    def enable(self, cprofile=False):
+        self.enabled = True
+        self.origin = time.perf_counter()
+        if cprofile:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    @contextmanager
+    def span(self, name, category="stage", **args):
+        """Time the enclosed block as one trace event."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start - self.origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args
+            }
+            with self.lock:
+                self.events.append(event)
+
+    def page(self, path, **args):
+        """Time the enclosed block as the processing of one page."""
+        return self.span(str(path), category="page", **args)
+
+    def page_function(self, func):
+        """Decorate a function whose first argument is the page it processes."""
+        @functools.wraps(func)
+        def wrapper(path, *args, **kwargs):
+            with self.page(path):
+                return func(path, *args, **kwargs)
+        return wrapper
+
+    def stage_totals(self):
+        """Return total seconds per stage name, slowest first."""
+        totals = {}
+        for event in self.events:
+            if event["cat"] != "page":
+                totals[event["name"]] = totals.get(event["name"], 0) + event["dur"] / 1e6
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def slowest_pages(self, count=20):
+        """Return the slowest page spans as (path, seconds) tuples."""
+        pages = [event for event in self.events if event["cat"] == "page"]
+        pages.sort(key=lambda event: event["dur"], reverse=True)
+        return [(event["name"], event["dur"] / 1e6) for event in pages[:count]]
+
+    def write_trace(self, path):
+        """Write the recorded spans as Chrome trace-event JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def write_cprofile(self, path):
+        """Stop cProfile and dump its stats for snakeviz, gprof2dot or flameprof."""
+        if not self.cprofile:
+            return
+        self.cprofile.disable()
+        self.cprofile.dump_stats(path)
+
+    def print_summary(self, top=20):
+        totals = self.stage_totals()
+        if totals:
+            print("\nTime by stage:")
+            for name, seconds in totals:
+                print(f"  {seconds:9.3f}s  {name}")
+
+        pages = self.slowest_pages(top)
+        if pages:
+            print(f"\nSlowest {len(pages)} pages:")
+            for path, seconds in pages:
+                print(f"  {seconds * 1000:9.1f}ms  {path}")
+
+        if self.cprofile:
+            print("\nTop functions by cumulative time:")
+            pstats.Stats(self.cprofile).sort_stats("cumulative").print_stats(top)
+
+PROFILER = BuildProfiler()
+
+def add_profiling_args(parser):
+    """Add the --trace, --cprofile and --top options to an argument parser."""
+    parser.add_argument("--trace", help="Write a Chrome trace-event JSON of stages and pages to this path")
+    parser.add_argument("--cprofile", help="Also run under cProfile and write the stats to this path")
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest pages to list with --trace")
+
+def start_profiling(args):
+    if args.trace or args.cprofile:
+        PROFILER.enable(cprofile=bool(args.cprofile))
+
+def finish_profiling(args):
+    if not PROFILER.enabled:
+        return
+    if args.cprofile:
+        PROFILER.write_cprofile(args.cprofile)
+        print(f"cProfile stats saved to: {args.cprofile}")
+    PROFILER.print_summary(args.top)
+    if args.trace:
+        PROFILER.write_trace(args.trace)
+        print(f"Trace saved to: {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+
+def enable_from_env():
+    """Record a trace when STORAGE_BUILD_TRACE is set, for scripts without options.
+
+    The trace is written to that path when the script exits. cProfile stats
+    are also recorded when STORAGE_BUILD_CPROFILE is set to a path.
+    """
+    trace_path = os.environ.get(TRACE_ENV_VAR)
+    if not trace_path:
+        return
+
+    cprofile_path = os.environ.get("STORAGE_BUILD_CPROFILE")
+    PROFILER.enable(cprofile=bool(cprofile_path))
+
+    def write_on_exit():
+        if cprofile_path:
+            PROFILER.write_cprofile(cprofile_path)
+        PROFILER.print_summary()
+        PROFILER.write_trace(trace_path)
+        print(f"Trace saved to: {trace_path}")
+
+    atexit.register(write_on_exit)
@@ -1,13 +1,22 @@
 import os
+import sys
 import csv
 import re
 import time
 import argparse
-from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 import json
 import random
 from colorama import Fore, Style, init
+from build_profiler import PROFILER, add_profiling_args, start_profiling, finish_profiling
+from site_writer import WRITER, write_if_changed
+from site_manifest import update_manifest
+from site_aggregates import update_city_counts
+from facility_stream import MAX_BUFFERED_ROWS, stream_city_groups
+from facility_record import Facility
+from site_paths import slugify
+from run_journal import JOURNAL_PATH, RunJournal, page_hash
 
 # Initialize colorama for colored terminal output
 init()
@@ -22,7 +31,16 @@ def parse_args():
     parser.add_argument("--output", default="update_report.json", help="Path to save the report JSON")
     parser.add_argument("--threads", type=int, default=8, help="Number of threads to use for parallel processing")
     parser.add_argument("--dry-run", action="store_true", help="Print changes without modifying files")
+    parser.add_argument("--patch", default="dry_run.patch", help="With --dry-run, path of the unified diff of every page that would change")
+    parser.add_argument("--db", help="Read facilities for the CSV from this SQLite database (see facility_db.py)")
+    parser.add_argument("--changed-only", action="store_true", help="Only rebuild cities whose rows changed since the last import into --db")
+    parser.add_argument("--stream", action="store_true", help="Stream the CSV in city groups instead of loading it whole, for very large feeds")
+    parser.add_argument("--sorted", action="store_true", help="With --stream, the CSV is ordered by region and city so groups are handed out as they end")
+    parser.add_argument("--max-rows", type=int, default=MAX_BUFFERED_ROWS, help="With --stream, rows grouped in memory before spilling to disk")
     parser.add_argument("--fix-card-counts", action="store_true", help="Update the storage count on city cards in region pages")
+    parser.add_argument("--journal", default=JOURNAL_PATH, help="Path of the run journal of completed cities")
+    parser.add_argument("--resume", action="store_true", help="Skip cities an interrupted run with the same options already finished")
+    add_profiling_args(parser)
     return parser.parse_args()
 
 def read_csv_data(csv_file):
@@ -51,17 +69,19 @@ def read_csv_data(csv_file):
                 if 'Features' in row:
                     features = [feat.strip() for feat in row['Features'].split(',') if feat.strip()]
                 
-                facility = {
-                    'name': row.get('Name', '').strip(),
-                    'address': row.get('Address', '').strip(),
-                    'phone': row.get('Phone', '').strip(),
-                    'website': row.get('Website', '').strip(),
-                    'description': row.get('Description', '').strip(),
-                    'features': features
-                }
+                facility = Facility(
+                    name=row.get('Name', '').strip(),
+                    address=row.get('Address', '').strip(),
+                    phone=row.get('Phone', '').strip(),
+                    website=row.get('Website', '').strip(),
+                    description=row.get('Description', '').strip(),
+                    features=features,
+                    region=row.get('Region', '').strip(),
+                    city=row.get('City', '').strip()
+                )
                 
                 # Only add if it has at least a name
-                if facility['name']:
+                if facility.name:
                     facilities_data[key].append(facility)
         
         return facilities_data
@@ -70,6 +90,78 @@ def read_csv_data(csv_file):
         print(f"{Fore.RED}Error reading CSV file: {str(e)}{Style.RESET_ALL}")
         return {}
 
+class DBCityFacilities:
+    """The CSV's facilities in the database, looked up by 'region/city' slug key.
+
+    Only the city keys are loaded up front; each city's facilities are
+    fetched with the indexed city query when its page is rendered.
+    """
+    
+    def __init__(self, db, csv_file):
+        self.db = db
+        self.csv_file = csv_file
+        self.keys = {f"{slugify(region)}/{slugify(city)}" for region, city in db.city_names(csv_file)}
+    
+    def __contains__(self, city_key):
+        return city_key in self.keys
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def __getitem__(self, city_key):
+        region, city = city_key.split('/')
+        return self.db.city_facilities(region, city, self.csv_file)
+    
+    def close(self):
+        self.db.close()
+
+def read_db_data(db_path, csv_file, refresh=True):
+    """Read the CSV's facilities through the indexed database, keyed by 'region/city' slugs.
+
+    The CSV is imported first if it is new or changed, whatever its path,
+    and a DBCityFacilities is returned; close it once the pages are updated.
+    With refresh=False the sheet is parsed directly into a dict and the
+    database snapshot is left at the last import, so --changed-only can
+    commit it once the pages are rebuilt.
+    """
+    from facility_db import open_db, reader_for, row_to_facility, source_path
+
+    if refresh:
+        db = open_db(db_path, refresh=False)
+        db.import_source(source_path(csv_file), reader_for(csv_file))
+        return DBCityFacilities(db, csv_file)
+
+    facilities_data = {}
+    for record in reader_for(csv_file)(csv_file):
+        facility = row_to_facility(record)
+        key = f"{slugify(facility.region)}/{slugify(facility.city)}"
+        facilities_data.setdefault(key, []).append(facility)
+    return facilities_data
+
+def read_changed_cities(db_path, csv_file):
+    """Return the 'region/city' slug keys touched by edits to the CSV since its last import.
+
+    Returns (changed, emptied), where emptied are the changed cities that
+    have no rows left in the CSV.
+    """
+    from facility_db import FacilityDB, affected_cities, diff_records, reader_for
+
+    records = list(reader_for(csv_file)(csv_file))
+    with FacilityDB(db_path) as db:
+        changeset = diff_records(db.source_records(csv_file), records)
+    print(f"{Fore.CYAN}Changes since last import: {len(changeset['added'])} added, "
+          f"{len(changeset['removed'])} removed, {len(changeset['modified'])} modified{Style.RESET_ALL}")
+    changed = {f"{region}/{city}" for region, city in affected_cities(changeset)}
+    remaining = {f"{record['region_slug']}/{record['city_slug']}" for record in records}
+    return changed, changed - remaining
+
+def commit_snapshot(db_path, csv_file):
+    """Import the CSV into the database as the snapshot for the next --changed-only run."""
+    from facility_db import FacilityDB, reader_for
+
+    with FacilityDB(db_path) as db:
+        db.import_source(csv_file, reader_for(csv_file), force=True)
+
 def find_city_page(region, city):
     """Find the HTML file for a specific city."""
     website_dir = os.path.join(os.getcwd(), "website")
@@ -149,19 +241,28 @@ def create_storage_html(facility):
     
     return html
 
-def update_city_page(file_path, facilities, dry_run=False):
-    """Update a city page with new storage facility data."""
+@PROFILER.page_function
+def update_city_page(file_path, facilities, dry_run=False, allow_empty=False):
+    """Update a city page with new storage facility data.
+    
+    With allow_empty=True an empty list clears the page's listings, for
+    cities whose rows were all deleted from the CSV.
+    """
+    from bs4 import BeautifulSoup
+    
     if not file_path or not os.path.exists(file_path):
         return False, f"File not found: {file_path}", 0
     
-    if not facilities:
+    if not facilities and not allow_empty:
         return False, f"No facility data provided for {file_path}", 0
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with PROFILER.span("read"):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
         
-        soup = BeautifulSoup(content, 'html.parser')
+        with PROFILER.span("parse"):
+            soup = BeautifulSoup(content, 'html.parser')
         
         # Find the storage-list container
         storage_list = soup.find(class_="storage-list")
@@ -193,21 +294,25 @@ def update_city_page(file_path, facilities, dry_run=False):
         
         # Add new storage facilities
         facility_count = 0
-        for facility in facilities:
-            facility_html = create_storage_html(facility)
-            facility_soup = BeautifulSoup(facility_html, 'html.parser')
-            storage_list.append(facility_soup)
-            facility_count += 1
-        
+        with PROFILER.span("render"):
+            for facility in facilities:
+                facility_html = create_storage_html(facility)
+                facility_soup = BeautifulSoup(facility_html, 'html.parser')
+                storage_list.append(facility_soup)
+                facility_count += 1
+        
+        # Write the updated content back to the file; a dry run only writes to the writer's patch
         city_name = os.path.basename(os.path.dirname(file_path))
+        with PROFILER.span("serialize"):
+            html = str(soup)
+        if not dry_run or WRITER.patch:
+            with PROFILER.span("write"):
+                write_if_changed(file_path, html)
+        
         if dry_run:
             print(f"{Fore.YELLOW}Would update {city_name} from {current_count} to {facility_count} facilities{Style.RESET_ALL}")
             return True, f"Dry run: Would update {facility_count} facilities", facility_count
         else:
-            # Write the updated content back to the file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
-            
             print(f"{Fore.GREEN}Updated {city_name} from {current_count} to {facility_count} facilities{Style.RESET_ALL}")
             return True, f"Updated {facility_count} facilities", facility_count
     
@@ -216,81 +321,123 @@ def update_city_page(file_path, facilities, dry_run=False):
 
 def update_region_city_cards(region, city_updates, dry_run=False):
     """Update the storage facility counts on city cards within a region page."""
-    if not city_updates:
-        return False, "No city updates provided"
-    
-    region_path = find_region_page(region)
-    if not region_path:
-        return False, f"Region page not found for: {region}"
+    from bs4 import BeautifulSoup
     
-    try:
-        with open(region_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        city_cards = soup.find_all(class_="city-card")
+    with PROFILER.span("region_cards", region=region):
+        if not city_updates:
+            return False, "No city updates provided"
         
-        updated_count = 0
+        region_path = find_region_page(region)
+        if not region_path:
+            return False, f"Region page not found for: {region}"
         
-        for card in city_cards:
-            # Find the city name and link in this card
-            heading = card.find('h3')
-            if not heading:
-                continue
-            
-            link = card.find('a')
-            if not link or not link.get('href'):
-                continue
+        try:
+            with open(region_path, 'r', encoding='utf-8') as f:
+                content = f.read()
             
-            href = link.get('href')
-            city_match = re.search(r'selfstorage([^/]+)/index\.html', href)
-            if not city_match:
-                continue
+            soup = BeautifulSoup(content, 'html.parser')
+            city_cards = soup.find_all(class_="city-card")
             
-            city_folder = city_match.group(1)
-            # Convert to the format we need for lookup
-            city_name = city_folder.replace('-', ' ')
+            updated_count = 0
             
-            # Find the corresponding city update
-            for city_key, facility_count in city_updates.items():
-                key_parts = city_key.split('/')
-                if len(key_parts) != 2:
+            for card in city_cards:
+                # Find the city name and link in this card
+                heading = card.find('h3')
+                if not heading:
                     continue
                 
-                _, city = key_parts
-                city_slug = city.replace(' ', '-')
+                link = card.find('a')
+                if not link or not link.get('href'):
+                    continue
                 
-                if city_slug == city_name:
-                    # Find the paragraph with the count
-                    p_tag = card.find('p')
-                    if p_tag:
-                        # Update the storage facility count
-                        old_text = p_tag.get_text()
-                        new_text = f"{facility_count} Storage Facilities"
-                        p_tag.string = new_text
-                        
-                        if not dry_run:
-                            print(f"{Fore.CYAN}Updated card for {city} from '{old_text}' to '{new_text}'{Style.RESET_ALL}")
-                        else:
-                            print(f"{Fore.YELLOW}Would update card for {city} from '{old_text}' to '{new_text}'{Style.RESET_ALL}")
-                        
-                        updated_count += 1
-                    break
-        
-        if dry_run:
-            return True, f"Would update {updated_count} city cards in {region}"
-        else:
-            # Write the updated content back to the file
-            with open(region_path, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
+                href = link.get('href')
+                city_match = re.search(r'selfstorage([^/]+)/index\.html', href)
+                if not city_match:
+                    continue
+                
+                city_folder = city_match.group(1)
+                # Convert to the format we need for lookup
+                city_name = city_folder.replace('-', ' ')
+                
+                # Find the corresponding city update
+                for city_key, facility_count in city_updates.items():
+                    key_parts = city_key.split('/')
+                    if len(key_parts) != 2:
+                        continue
+                    
+                    _, city = key_parts
+                    city_slug = city.replace(' ', '-')
+                    
+                    if city_slug == city_name:
+                        # Find the paragraph with the count
+                        p_tag = card.find('p')
+                        if p_tag:
+                            # Update the storage facility count
+                            old_text = p_tag.get_text()
+                            new_text = f"{facility_count} Storage Facilities"
+                            p_tag.string = new_text
+                            
+                            if not dry_run:
+                                print(f"{Fore.CYAN}Updated card for {city} from '{old_text}' to '{new_text}'{Style.RESET_ALL}")
+                            else:
+                                print(f"{Fore.YELLOW}Would update card for {city} from '{old_text}' to '{new_text}'{Style.RESET_ALL}")
+                            
+                            updated_count += 1
+                        break
+            
+            if updated_count == 0:
+                # Nothing matched, so leave the region page and its mtime alone
+                return True, f"No city cards to update in {region}"
+            
+            # Write the updated content back to the file; a dry run only writes to the writer's patch
+            if not dry_run or WRITER.patch:
+                write_if_changed(region_path, str(soup))
             
+            if dry_run:
+                return True, f"Would update {updated_count} city cards in {region}"
             return True, f"Updated {updated_count} city cards in {region}"
-    
-    except Exception as e:
-        return False, f"Error updating region page {region_path}: {str(e)}"
+        
+        except Exception as e:
+            return False, f"Error updating region page {region_path}: {str(e)}"
+
+def iter_city_jobs(cities_to_process, facilities_data, stream_groups=None, emptied=()):
+    """Yield (city_key, file_path, facilities) for every city page to update.
+    
+    Streamed CSV groups are handed out as soon as each one is complete.
+    Cities without CSV rows then get generated data, as without streaming,
+    except emptied cities whose rows were deleted, which get no facilities.
+    """
+    done = set()
+    if stream_groups is not None:
+        for city_key, facilities in stream_groups:
+            file_path = cities_to_process.get(city_key)
+            if not file_path or city_key in done:
+                continue
+            done.add(city_key)
+            print(f"{Fore.CYAN}Using CSV data for {city_key} ({len(facilities)} facilities){Style.RESET_ALL}")
+            yield city_key, file_path, facilities
+    
+    for city_key, file_path in cities_to_process.items():
+        if city_key in done:
+            continue
+        # Get facilities data from CSV or generate random data
+        if city_key in facilities_data:
+            facilities = facilities_data[city_key]
+            print(f"{Fore.CYAN}Using CSV data for {city_key} ({len(facilities)} facilities){Style.RESET_ALL}")
+        elif city_key in emptied:
+            facilities = []
+            print(f"{Fore.YELLOW}Clearing listings for {city_key}: every row was deleted from the CSV{Style.RESET_ALL}")
+        else:
+            # Generate random facilities data (between 3 and 8)
+            count = random.randint(3, 8)
+            facilities = generate_storage_data(city_key, count)
+            print(f"{Fore.YELLOW}Generated random data for {city_key} ({len(facilities)} facilities){Style.RESET_ALL}")
+        yield city_key, file_path, facilities
 
 def verify_city(city_key, file_path):
     """Verify a city page and count its storage facilities."""
+    from bs4 import BeautifulSoup
+    
     if not file_path or not os.path.exists(file_path):
         return {
             "city_key": city_key,
@@ -421,21 +568,24 @@ def generate_storage_data(city_key, count=5):
         feature_count = random.randint(2, 4)
         selected_features = random.sample(features, feature_count)
         
-        facility = {
-            'name': name,
-            'address': address,
-            'phone': phone,
-            'website': website,
-            'description': description,
-            'features': selected_features
-        }
+        facility = Facility(
+            name=name,
+            address=address,
+            phone=phone,
+            website=website,
+            description=description,
+            features=selected_features,
+            region=region,
+            city=city
+        )
         
         facilities.append(facility)
     
     return facilities
 
-def main():
-    args = parse_args()
+def run_update(args):
+    """Update or verify the city pages selected by args."""
+    start_profiling(args)
     start_time = time.time()
     
     # Initialize result data
@@ -448,10 +598,35 @@ def main():
         "city_results": []
     }
     
+    if args.changed_only and not args.db:
+        print(f"{Fore.RED}--changed-only needs --db to compare against the last imported snapshot{Style.RESET_ALL}")
+        return
+    
+    # Work out which cities changed before the database import below advances the snapshot
+    changed_cities = None
+    emptied_cities = set()
+    if args.changed_only and os.path.exists(args.csv):
+        with PROFILER.span("diff_csv"):
+            changed_cities, emptied_cities = read_changed_cities(args.db, args.csv)
+    
     # Process the CSV if provided
-    if os.path.exists(args.csv):
+    if args.stream and not args.verify and os.path.exists(args.csv):
+        # Rows are read in city groups while pages are updated, see iter_city_jobs
+        facilities_data = {}
+        print(f"{Fore.CYAN}Streaming facility data from {args.csv}...{Style.RESET_ALL}")
+        result_data["csv_file"] = args.csv
+    elif os.path.exists(args.csv):
         print(f"{Fore.CYAN}Reading facility data from {args.csv}...{Style.RESET_ALL}")
-        facilities_data = read_csv_data(args.csv)
+        with PROFILER.span("read_csv"):
+            if args.db:
+                facilities_data = read_db_data(args.db, args.csv, refresh=not args.changed_only)
+            else:
+                facilities_data = read_csv_data(args.csv)
+        
+        # An empty result from the database means a bad import, not a city list to fill with generated data
+        if args.db and not facilities_data and not emptied_cities:
+            print(f"{Fore.RED}No facilities for {args.csv} in {args.db}; no pages were changed{Style.RESET_ALL}")
+            sys.exit(1)
         
         if facilities_data:
             print(f"{Fore.GREEN}Found data for {len(facilities_data)} cities in CSV{Style.RESET_ALL}")
@@ -521,6 +696,15 @@ def main():
         
         print(f"{Fore.CYAN}Found {len(cities_to_process)} cities across all regions{Style.RESET_ALL}")
     
+    if changed_cities is not None:
+        missing = changed_cities - emptied_cities - cities_to_process.keys()
+        cities_to_process = {key: path for key, path in cities_to_process.items() if key in changed_cities}
+        print(f"{Fore.CYAN}Rebuilding {len(cities_to_process)} changed cities{Style.RESET_ALL}")
+        if missing:
+            print(f"{Fore.YELLOW}No page yet for {len(missing)} changed cities; run create_storage_directory.py: {', '.join(sorted(missing))}{Style.RESET_ALL}")
+        result_data["changed_cities"] = sorted(changed_cities)
+        result_data["emptied_cities"] = sorted(emptied_cities)
+    
     result_data["cities_found"] = len(cities_to_process)
     
     if args.verify:
@@ -550,65 +734,117 @@ def main():
         result_data["city_results"] = city_results
         result_data["cities_processed"] = len(city_results)
     else:
-        # Update city pages with storage facility data
-        print(f"{Fore.CYAN}Updating {len(cities_to_process)} cities...{Style.RESET_ALL}")
-        
         # Track updates for region pages
         region_updates = {}
         city_results = []
         
-        with ThreadPoolExecutor(max_workers=args.threads) as executor:
-            futures = []
+        # Record every finished city durably so an interrupted run can be resumed
+        journal = None
+        if not args.dry_run:
+            journal = RunJournal(args.journal)
+            csv_stat = os.stat(args.csv) if os.path.exists(args.csv) else None
+            run = {
+                "csv": args.csv,
+                "csv_size": csv_stat.st_size if csv_stat else None,
+                "csv_mtime_ns": csv_stat.st_mtime_ns if csv_stat else None,
+                "region": args.region,
+                "city": args.city,
+                "changed_only": args.changed_only
+            }
+            if journal.start(run, resume=args.resume):
+                # Finished cities still count towards the region cards and saved counts
+                done = {key for key, path in cities_to_process.items() if journal.is_done(key, path)}
+                for city_key in done:
+                    region_updates.setdefault(city_key.split('/')[0], {})[city_key] = journal.entries[city_key]["facility_count"]
+                cities_to_process = {key: path for key, path in cities_to_process.items() if key not in done}
+                result_data["resumed_cities"] = len(done)
+                print(f"{Fore.CYAN}Resuming: {len(done)} cities already done, {len(cities_to_process)} left{Style.RESET_ALL}")
+            elif args.resume:
+                print(f"{Fore.YELLOW}No unfinished run with these options in {args.journal}; starting from scratch{Style.RESET_ALL}")
+        
+        # Update city pages with storage facility data
+        print(f"{Fore.CYAN}Updating {len(cities_to_process)} cities...{Style.RESET_ALL}")
+        
+        def record_result(city_key, file_path, future):
+            success, message, facility_count = future.result()
+            if journal:
+                journal.record(city_key, file_path, "success" if success else "error", facility_count,
+                               page_hash(file_path) if success else None)
             
-            for city_key, file_path in cities_to_process.items():
-                # Get facilities data from CSV or generate random data
-                if city_key in facilities_data:
-                    facilities = facilities_data[city_key]
-                    print(f"{Fore.CYAN}Using CSV data for {city_key} ({len(facilities)} facilities){Style.RESET_ALL}")
-                else:
-                    # Generate random facilities data (between 3 and 8)
-                    count = random.randint(3, 8)
-                    facilities = generate_storage_data(city_key, count)
-                    print(f"{Fore.YELLOW}Generated random data for {city_key} ({len(facilities)} facilities){Style.RESET_ALL}")
-                
-                futures.append(executor.submit(update_city_page, file_path, facilities, args.dry_run))
+            result = {
+                "city_key": city_key,
+                "status": "success" if success else "error",
+                "message": message,
+                "facility_count": facility_count
+            }
+            city_results.append(result)
             
-            idx = 0
-            for city_key in cities_to_process.keys():
-                future = futures[idx]
-                success, message, facility_count = future.result()
-                
-                result = {
-                    "city_key": city_key,
-                    "status": "success" if success else "error",
-                    "message": message,
-                    "facility_count": facility_count
-                }
-                city_results.append(result)
+            # Track for region updates
+            if success:
+                region, city = city_key.split('/')
+                if region not in region_updates:
+                    region_updates[region] = {}
+                region_updates[region][city_key] = facility_count
                 
-                # Track for region updates
-                if success:
-                    region, city = city_key.split('/')
-                    if region not in region_updates:
-                        region_updates[region] = {}
-                    region_updates[region][city_key] = facility_count
-                    
-                    result_data["success_count"] += 1
-                else:
-                    result_data["error_count"] += 1
+                result_data["success_count"] += 1
+            else:
+                result_data["error_count"] += 1
+        
+        stream_groups = None
+        if args.stream and os.path.exists(args.csv):
+            stream_groups = stream_city_groups(args.csv, presorted=args.sorted, max_rows=args.max_rows)
+        
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            pending = deque()
+            
+            for city_key, file_path, facilities in iter_city_jobs(cities_to_process, facilities_data, stream_groups, emptied_cities):
+                pending.append((city_key, file_path, executor.submit(update_city_page, file_path, facilities, args.dry_run, city_key in emptied_cities)))
                 
-                idx += 1
+                # Keep a bounded number of cities in flight so streamed groups do not pile up in memory
+                while len(pending) > args.threads * 4:
+                    record_result(*pending.popleft())
+            
+            while pending:
+                record_result(*pending.popleft())
         
         result_data["city_results"] = city_results
         result_data["cities_processed"] = len(city_results)
         
+        # Keep the saved region and city counts in step with the updated pages
+        if not args.dry_run and region_updates:
+            update_city_counts({
+                tuple(city_key.split('/')): count
+                for city_updates in region_updates.values()
+                for city_key, count in city_updates.items()
+            })
+        
         # Update region pages with city facility counts if requested
-        if args.fix_card_counts and not args.dry_run:
+        if args.fix_card_counts:
             print(f"{Fore.CYAN}Updating city cards in region pages...{Style.RESET_ALL}")
             
             for region, city_updates in region_updates.items():
                 success, message = update_region_city_cards(region, city_updates, args.dry_run)
                 print(f"{Fore.GREEN if success else Fore.RED}{message}{Style.RESET_ALL}")
+        
+        # Region cards and counts are final, so a later --resume has nothing left to do
+        if journal:
+            journal.finish()
+    
+    # The database stayed open while the city pages were rendered, one indexed query per city
+    if isinstance(facilities_data, DBCityFacilities):
+        facilities_data.close()
+    
+    # Advance the snapshot only after every changed page was rebuilt, so failed cities are retried next run
+    if changed_cities is not None and not args.dry_run and not args.verify:
+        if result_data["error_count"] == 0:
+            commit_snapshot(args.db, args.csv)
+        else:
+            print(f"{Fore.YELLOW}{result_data['error_count']} cities failed, so {args.db} keeps the last snapshot; "
+                  f"the next --changed-only run retries every changed city{Style.RESET_ALL}")
+    
+    # Record the content hash of every file for deploy_diff.py
+    if not args.dry_run:
+        update_manifest("website")
     
     elapsed_time = time.time() - start_time
     result_data["elapsed_time"] = f"{elapsed_time:.2f} seconds"
@@ -623,6 +859,19 @@ def main():
     print(f"- Errors: {result_data['error_count']}")
     print(f"- Time taken: {elapsed_time:.2f} seconds")
     print(f"- Detailed report saved to: {args.output}")
+    
+    finish_profiling(args)
+
+def main():
+    args = parse_args()
+    
+    # Render every change as usual, but record it as a unified diff instead of writing it.
+    # The dry run ends with this run, so later jobs in the same process write to disk again.
+    if args.dry_run and not args.verify:
+        with WRITER.dry_run(args.patch):
+            run_update(args)
+    else:
+        run_update(args)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
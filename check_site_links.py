@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import time
+import argparse
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from site_paths import INCLUDES_FOLDER
+
+# Matches every href attribute in a page; one pass per file
+HREF_PATTERN = re.compile(r'''href\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+
+# Matches <meta http-equiv="refresh" content="0;url=..."> redirects
+REFRESH_PATTERN = re.compile(
+    r'''<meta[^>]*http-equiv\s*=\s*["']refresh["'][^>]*content\s*=\s*["'][^"']*url\s*=\s*([^"']+)["']''',
+    re.IGNORECASE
+)
+
+EXTERNAL_PREFIXES = ('http://', 'https://', '//', 'mailto:', 'tel:', 'javascript:', 'data:', '#')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the internal link graph and report broken links")
+    parser.add_argument("--dir", default="website", help="Website directory to check")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--output", default="link_report.json", help="Path to save the report JSON")
+    parser.add_argument("--verbose", action="store_true", help="Print every broken link")
+    return parser.parse_args()
+
+def collect_site_paths(website_dir):
+    """Return the set of every file path in the site, relative and '/'-separated."""
+    paths = set()
+    for root, dirs, files in os.walk(website_dir):
+        rel_root = os.path.relpath(root, website_dir).replace(os.sep, '/')
+        for file in files:
+            paths.add(file if rel_root == '.' else f"{rel_root}/{file}")
+    return paths
+
+def extract_page_links(args):
+    """Read one page and return its relative path, hrefs and meta refresh target."""
+    website_dir, rel_path = args
+    with open(os.path.join(website_dir, rel_path), 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+
+    refresh = REFRESH_PATTERN.search(content)
+    return rel_path, HREF_PATTERN.findall(content), refresh.group(1).strip() if refresh else None
+
+def resolve_link(page_path, href, site_paths):
+    """Resolve an href found on page_path to a site path.
+
+    Returns None for external links and anchors, otherwise the normalized
+    target path (which may not exist).
+    """
+    href = href.strip()
+    if not href or href.lower().startswith(EXTERNAL_PREFIXES):
+        return None
+
+    href = href.split('#', 1)[0].split('?', 1)[0]
+    if not href:
+        return None
+
+    if href.startswith('/'):
+        target = posixpath.normpath(href.lstrip('/') or '.')
+    else:
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(page_path), href))
+
+    if target in ('', '.'):
+        return 'index.html'
+    if href.endswith('/') or (target not in site_paths and f"{target}/index.html" in site_paths):
+        return f"{target}/index.html"
+    return target
+
+def build_link_graph(website_dir, workers=None):
+    """Extract and resolve every internal link in the site.
+
+    Returns (site_paths, graph, broken, redirects) where graph maps each page
+    to the set of pages it links to, broken maps pages to their unresolvable
+    hrefs and redirects maps redirect pages to their target.
+    """
+    site_paths = collect_site_paths(website_dir)
+    # Include fragments are spliced into pages by the server, so their links are checked there
+    pages = sorted(path for path in site_paths if path.endswith('.html') and not path.startswith(INCLUDES_FOLDER + '/'))
+
+    graph = {}
+    broken = {}
+    redirects = {}
+    resolved_cache = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = [(website_dir, page) for page in pages]
+        for page, hrefs, refresh in executor.map(extract_page_links, jobs, chunksize=64):
+            page_dir = posixpath.dirname(page)
+            targets = set()
+
+            if refresh:
+                target = resolve_link(page, refresh, site_paths)
+                if target:
+                    redirects[page] = target
+                    hrefs = hrefs + [refresh]
+
+            for href in hrefs:
+                key = (page_dir, href)
+                if key not in resolved_cache:
+                    resolved_cache[key] = resolve_link(page, href, site_paths)
+                target = resolved_cache[key]
+                if target is None:
+                    continue
+                if target in site_paths:
+                    targets.add(target)
+                else:
+                    broken.setdefault(page, []).append(href)
+
+            graph[page] = targets
+
+    return site_paths, graph, broken, redirects
+
+def find_orphan_pages(graph, root='index.html'):
+    """Return pages that cannot be reached by following links from the homepage."""
+    reachable = {root}
+    stack = [root]
+    while stack:
+        page = stack.pop()
+        for target in graph.get(page, ()):
+            if target not in reachable:
+                reachable.add(target)
+                stack.append(target)
+    return sorted(page for page in graph if page not in reachable)
+
+def find_redirect_chains(graph, redirects):
+    """Return links that land on a redirect page, with the full chain followed."""
+    chains = []
+    for page, targets in graph.items():
+        for target in sorted(targets):
+            if target not in redirects:
+                continue
+
+            chain = [target]
+            seen = {target}
+            while chain[-1] in redirects:
+                next_target = redirects[chain[-1]]
+                chain.append(next_target)
+                if next_target in seen:
+                    break
+                seen.add(next_target)
+
+            chains.append({"page": page, "chain": chain, "loop": len(seen) < len(chain)})
+    return chains
+
+def check_links(website_dir="website", workers=None):
+    """Build the link graph and return a report dictionary."""
+    site_paths, graph, broken, redirects = build_link_graph(website_dir, workers)
+
+    return {
+        "pages": len(graph),
+        "links": sum(len(targets) for targets in graph.values()),
+        "broken": broken,
+        "orphans": find_orphan_pages(graph),
+        "redirects": redirects,
+        "redirect_chains": find_redirect_chains(graph, redirects)
+    }
+
+def main():
+    args = parse_args()
+    start_time = time.time()
+
+    if not os.path.exists(args.dir):
+        print(f"Website directory not found: {args.dir}")
+        return
+
+    report = check_links(args.dir, args.workers)
+    elapsed_time = time.time() - start_time
+    report["elapsed_time"] = f"{elapsed_time:.2f} seconds"
+
+    broken_count = sum(len(hrefs) for hrefs in report["broken"].values())
+
+    print("Link check summary:")
+    print(f"- Pages checked: {report['pages']}")
+    print(f"- Internal links: {report['links']}")
+    print(f"- Broken links: {broken_count} on {len(report['broken'])} pages")
+    print(f"- Orphan pages: {len(report['orphans'])}")
+    print(f"- Links through redirects: {len(report['redirect_chains'])}")
+    print(f"- Time taken: {elapsed_time:.2f} seconds")
+
+    if args.verbose:
+        for page, hrefs in sorted(report["broken"].items()):
+            print(f"\n{page}")
+            for href in hrefs:
+                print(f"  - {href}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nDetailed report saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
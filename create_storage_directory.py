@@ -1,52 +1,29 @@
-import pandas as pd
 import os
-import re
-from collections import defaultdict
-
-# Function to generate facility cards with modern styling
-def generate_facility_card(facility):
-    facility_name = facility['name']
-    location = facility.get('location', 'Address not available').replace('\n', '<br>')
-    phone = facility.get('phone', 'Not available')
-    email = facility.get('email', 'Not available')
-    website = facility.get('website', '')
-    
-    website_display = ''
-    if website and website != 'Not available':
-        website_display = f'<p><strong>Website:</strong> {website}</p>'
-    
-    return f"""
-            <div class="storage-card">
-                <h3>{facility_name}</h3>
-                <div class="storage-info">
-                    <p><strong>Location:</strong> {location}</p>
-                </div>
-                <div class="contact-info">
-                    <p><strong>Phone:</strong> {phone}</p>
-                    <p><strong>Email:</strong> {email}</p>
-                    {website_display}
-                </div>
-            </div>"""
-
-# Create the website directory
+from build_profiler import PROFILER, enable_from_env
+from site_paths import slugify, to_selfstorage_path, region_page_path, city_page_path
+from site_templates import render_page, render_city_page, render_region_page, ensure_fragments
+from site_writer import write_if_changed
+from site_manifest import update_manifest
+from site_aggregates import aggregates_from_groups, save_aggregates, region_counts
+from facility_db import read_sheet, read_sheet_groups
+from site_api import write_api
+
+# Set STORAGE_BUILD_TRACE=trace.json to record where the build time goes
+enable_from_env()
+
+# Folder the website is built in; write_if_changed creates the folders under it,
+# so a dry run (STORAGE_DRY_RUN) leaves the disk untouched
 website_dir = 'website'
-os.makedirs(website_dir, exist_ok=True)
 
 # Read the Excel file
-df = pd.read_excel('self storage facilities uk.xlsx')
+with PROFILER.span("read_excel"):
+    df = read_sheet('self storage facilities uk.xlsx')
 
 # Basic stats
 print(f"Total records: {len(df)}")
 print(f"Unique regions: {df['Region'].nunique()}")
 print(f"Unique cities: {df['CITY'].nunique()}")
 
-# Create directories
-if not os.path.exists('website'):
-    os.makedirs('website')
-    os.makedirs('website/assets')
-    os.makedirs('website/assets/css')
-    os.makedirs('website/assets/js')
-
 # Create CSS file
 css_content = """/* Google Font */
 @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700&display=swap');
@@ -373,271 +350,43 @@ footer {
 }
 """
 
-with open('website/assets/css/style.css', 'w') as f:
-    f.write(css_content)
+write_if_changed('website/assets/css/style.css', css_content)
 
 # Organize data by region and city
-region_data = defaultdict(lambda: defaultdict(list))
+with PROFILER.span("group_rows"):
+    region_data = read_sheet_groups('self storage facilities uk.xlsx')
 
-for _, row in df.iterrows():
-    region = row['Region']
-    city = row['CITY'].strip()
-    
-    if pd.isna(city) or city == '':
-        continue
-        
-    # Clean city name for URL
-    city_clean = re.sub(r'[^\w\s-]', '', city).strip()
-    city_clean = re.sub(r'\s+', '-', city_clean)
-    
-    storage_info = {
-        'name': row['Name of Self Storage'],
-        'website': row['Website'] if not pd.isna(row['Website']) else '',
-        'email': row['Email / Contact'] if not pd.isna(row['Email / Contact']) else '',
-        'phone': row['Telephone Number'] if not pd.isna(row['Telephone Number']) else '',
-        'location': row['Location'] if not pd.isna(row['Location']) else '',
-        'population': row['Town Population'] if not pd.isna(row['Town Population']) else ''
-    }
-    
-    region_data[region][city].append(storage_info)
+# Count facilities per city and region once; every page below reads these
+aggregates = aggregates_from_groups(region_data)
 
-# Create region directories and files
+# Create region and city pages from the shared templates
 for region, cities in region_data.items():
-    # Clean region name for URL
-    region_clean = re.sub(r'[^\w\s-]', '', region).strip()
-    region_clean = re.sub(r'\s+', '-', region_clean)
-    
-    region_dir = f'website/{region_clean}'
-    
-    if not os.path.exists(region_dir):
-        os.makedirs(region_dir)
+    region_dir = f'website/{to_selfstorage_path(region)}'
     
-    # Create region index page
-    region_index = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Self Storage in {region} | Find Local Storage Facilities</title>
-    <meta name="description" content="Find the best self storage facilities in {region}. Compare prices, locations, and services for all your storage needs.">
-    <link rel="stylesheet" href="../assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="../index.html">Home</a></li>
-                    <li><a href="../regions.html">Regions</a></li>
-                    <li><a href="../faq.html">FAQ</a></li>
-                    <li><a href="../about.html">About</a></li>
-                    <li><a href="../contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
-    <div class="container">
-        <h1>Self Storage in {region}</h1>
-        <p>Find and compare {len(cities)} cities with self storage facilities in {region}.</p>
-        
-        <div class="search-form">
-            <input type="text" id="citySearch" placeholder="Search for a city...">
-            <button onclick="searchCity()">Search</button>
-        </div>
-        
-        <h2 id="search-results-heading" style="display: none; margin-top: 30px;">Search Results</h2>
-        
-        <div class="regions-list">
-"""
-    
-    # Create city cards
     for city, storage_facilities in cities.items():
-        city_clean = re.sub(r'[^\w\s-]', '', city).strip()
-        city_clean = re.sub(r'\s+', '-', city_clean)
-        
-        city_dir = f'{region_dir}/{city_clean}'
-        if not os.path.exists(city_dir):
-            os.makedirs(city_dir)
-        
-        region_index += f"""
-            <div class="region-card">
-                <h3>{city}</h3>
-                <p>{len(storage_facilities)} storage facilities</p>
-                <a href="{city_clean}/index.html" class="btn">View Details</a>
-            </div>
-"""
-        
-        # Create city page
-        city_page = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="robots" content="noindex">
-    <title>Self Storage in {city}, {region} | Storage Facilities Near Me</title>
-    <meta name="description" content="Find the best self storage facilities in {city}, {region}. Compare prices and services from {len(storage_facilities)} local storage providers.">
-    <link rel="stylesheet" href="../../assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="../../index.html">Home</a></li>
-                    <li><a href="../../regions.html">Regions</a></li>
-                    <li><a href="../../faq.html">FAQ</a></li>
-                    <li><a href="../../about.html">About</a></li>
-                    <li><a href="../../contact.html">Contact</a></li>
-                    <li><a href="../index.html">{region}</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
-    <div class="container">
-        <h1>Self Storage in {city}, {region}</h1>
-        <p>Compare {len(storage_facilities)} self storage facilities in {city}.</p>
-        
-        <div class="storage-list">
-"""
-        
-        # Add storage facilities to city page
-        for facility in storage_facilities:
-            city_page += generate_facility_card(facility)
-        
-        city_page += """
-        </div>
-    </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="../../privacy.html">Privacy</a></li>
-                        <li><a href="../../terms.html">Terms and Conditions</a></li>
-                        <li><a href="../../membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="../../index.html">Home</a></li>
-                        <li><a href="../../regions.html">Regions</a></li>
-                        <li><a href="../../faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="../../about.html">About Us</a></li>
-                        <li><a href="../../contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-    
-    <script>
-        // Add any JavaScript here
-    </script>
-</body>
-</html>
-"""
+        city_dir = f'website/{os.path.dirname(city_page_path(region, city))}'
         
-        # Write city page to file
-        with open(f'{city_dir}/index.html', 'w', encoding='utf-8') as f:
-            f.write(city_page)
+        # Render and write city page
+        with PROFILER.page(f'{city_dir}/index.html'):
+            with PROFILER.span("render"):
+                city_page = render_city_page(region, city, storage_facilities)
+            write_if_changed(f'{city_dir}/index.html', city_page)
     
-    # Complete region index
-    region_index += """
-        </div>
-    </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="../privacy.html">Privacy</a></li>
-                        <li><a href="../terms.html">Terms and Conditions</a></li>
-                        <li><a href="../membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="../index.html">Home</a></li>
-                        <li><a href="../regions.html">Regions</a></li>
-                        <li><a href="../faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="../about.html">About Us</a></li>
-                        <li><a href="../contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-    
-    <script src="../assets/js/search.js"></script>
-    <script>
-        function searchCity() {
-            const input = document.getElementById('citySearch').value.toLowerCase();
-            const cards = document.querySelectorAll('.region-card');
-            
-            // Show the search results heading
-            document.getElementById('search-results-heading').style.display = 'block';
-            
-            let anyMatch = false;
-            cards.forEach(card => {
-                const cityName = card.querySelector('h3').textContent.toLowerCase();
-                if (cityName.includes(input)) {
-                    card.style.display = 'block';
-                    anyMatch = true;
-                } else {
-                    card.style.display = 'none';
-                }
-            });
-            
-            // If no matches, show a message
-            if (!anyMatch) {
-                alert('No cities found matching your search. Try a different term.');
-            }
-        }
-    </script>
-</body>
-</html>
-"""
-    
-    # Write region index to file
-    with open(f'{region_dir}/index.html', 'w', encoding='utf-8') as f:
-        f.write(region_index)
+    # Render and write region index
+    with PROFILER.page(f'{region_dir}/index.html'):
+        with PROFILER.span("render"):
+            city_counts = aggregates["regions"][slugify(region)]["cities"].values()
+            region_index = render_region_page(region, [(city["name"], city["facilities"]) for city in city_counts])
+        write_if_changed(f'{region_dir}/index.html', region_index)
+
+# Partners read the listings from the JSON API, written from the same facility data as the pages
+with PROFILER.span("api"):
+    api_endpoints = write_api(website_dir, region_data, aggregates)
+
+ensure_fragments(website_dir)
 
 # Create regions list page
-regions_page = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Self Storage Regions | Find Storage Facilities Near You</title>
-    <meta name="description" content="Browse self storage facilities by region across the UK. Find the perfect storage solution in your area.">
-    <link rel="stylesheet" href="assets/css/style.css">
-    <style>
+regions_style = """    <style>
         .search-container {
             margin-bottom: 30px;
         }
@@ -651,23 +400,9 @@ regions_page = """<!DOCTYPE html>
             margin-top: 30px;
         }
     </style>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
+"""
+
+regions_content = """
     <div class="container">
         <h1>Self Storage Regions</h1>
         <p>Browse self storage facilities by region to find the perfect storage solution near you.</p>
@@ -690,21 +425,18 @@ regions_page = """<!DOCTYPE html>
 """
 
 # Add region cards
-for region, cities in sorted(region_data.items()):
-    region_clean = re.sub(r'[^\w\s-]', '', region).strip()
-    region_clean = re.sub(r'\s+', '-', region_clean)
+for region in sorted(region_data):
+    city_count, total_facilities = region_counts(aggregates, slugify(region))
     
-    total_facilities = sum(len(facilities) for facilities in cities.values())
-    
-    regions_page += f"""
+    regions_content += f"""
             <div class="region-card">
                 <h3>{region}</h3>
-                <p>{len(cities)} cities, {total_facilities} facilities</p>
-                <a href="{region_clean}/index.html" class="btn">View Region</a>
+                <p>{city_count} cities, {total_facilities} facilities</p>
+                <a href="{region_page_path(region)}" class="btn">View Region</a>
             </div>
 """
 
-regions_page += """
+regions_content += """
             </div>
         </div>
         
@@ -714,41 +446,9 @@ regions_page += """
             </div>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-    
-    <script src="assets/js/search.js"></script>
+"""
+
+regions_scripts = """    <script src="assets/js/search.js"></script>
     <script>
         // All cities with their regions and URLs
         const allCities = [
@@ -756,13 +456,11 @@ regions_page += """
 
 # Create a list of all cities with their regions and URLs
 for region, cities in region_data.items():
-    region_dir_name = region.replace(' ', '-').replace(',', '')
     for city in cities:
-        city_dir_name = city.replace(' ', '-').replace(',', '')
-        city_url = f"{region_dir_name}/{city_dir_name}/index.html"
-        regions_page += f'            {{name: "{city}", region: "{region}", url: "{city_url}"}},\n'
+        city_url = city_page_path(region, city)
+        regions_scripts += f'            {{name: "{city}", region: "{region}", url: "{city_url}"}},\n'
 
-regions_page += """
+regions_scripts += """
         ];
         
         // Function to search regions
@@ -846,41 +544,20 @@ regions_page += """
             }
         });
     </script>
-</body>
-</html>
 """
 
 # Write regions page to file
-with open('website/regions.html', 'w', encoding='utf-8') as f:
-    f.write(regions_page)
+write_if_changed('website/regions.html', render_page(
+    "Self Storage Regions | Find Storage Facilities Near You",
+    "Browse self storage facilities by region across the UK. Find the perfect storage solution in your area.",
+    regions_content,
+    depth=0,
+    extra_head=regions_style,
+    scripts=regions_scripts
+))
 
 # Create homepage
-homepage = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Self Storage Near Me | Find Local Storage Facilities</title>
-    <meta name="description" content="Find the best self storage facilities near you. Compare prices, locations, and services for all your storage needs.">
-    <link rel="stylesheet" href="assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
-    <section class="hero">
+homepage_content = """    <section class="hero">
         <div class="container">
             <h1>Find Self Storage Near Me</h1>
             <p>Compare the best self storage facilities in your area. Find secure, affordable storage solutions for your belongings.</p>
@@ -904,23 +581,19 @@ homepage = """<!DOCTYPE html>
 """
 
 # Add top regions to homepage
-top_regions = sorted(region_data.items(), key=lambda x: sum(len(facilities) for facilities in x[1].values()), reverse=True)[:12]
-
-for region, cities in top_regions:
-    region_clean = re.sub(r'[^\w\s-]', '', region).strip()
-    region_clean = re.sub(r'\s+', '-', region_clean)
+for region_slug in aggregates["top_regions"]:
+    top_region = aggregates["regions"][region_slug]
+    region = top_region["name"]
     
-    total_facilities = sum(len(facilities) for facilities in cities.values())
-    
-    homepage += f"""
+    homepage_content += f"""
             <div class="region-card">
                 <h3>{region}</h3>
-                <p>{len(cities)} cities, {total_facilities} facilities</p>
-                <a href="{region_clean}/index.html" class="btn">View Region</a>
+                <p>{top_region["city_count"]} cities, {top_region["facility_count"]} facilities</p>
+                <a href="{region_page_path(region)}" class="btn">View Region</a>
             </div>
 """
 
-homepage += """
+homepage_content += """
         </div>
         
         <h2>Why Choose Self Storage?</h2>
@@ -945,41 +618,9 @@ homepage += """
             </div>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-    
-    <script src="assets/js/search.js"></script>
+"""
+
+homepage_scripts = """    <script src="assets/js/search.js"></script>
     <script>
         function searchLocation() {
             const input = document.getElementById('locationSearch').value.toLowerCase();
@@ -994,13 +635,16 @@ homepage += """
             window.location.href = 'regions.html?search=' + encodeURIComponent(input) + '&radius=' + radius;
         }
     </script>
-</body>
-</html>
 """
 
 # Write homepage to file
-with open('website/index.html', 'w', encoding='utf-8') as f:
-    f.write(homepage)
+write_if_changed('website/index.html', render_page(
+    "Self Storage Near Me | Find Local Storage Facilities",
+    "Find the best self storage facilities near you. Compare prices, locations, and services for all your storage needs.",
+    homepage_content,
+    depth=0,
+    scripts=homepage_scripts
+))
 
 # Create JavaScript file for advanced search that will work with direct city searches
 search_js = """
@@ -1099,24 +743,11 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 """
 
-# Create JS directory if it doesn't exist
-if not os.path.exists('website/assets/js'):
-    os.makedirs('website/assets/js')
-
 # Write search.js to file
-with open('website/assets/js/search.js', 'w', encoding='utf-8') as f:
-    f.write(search_js)
+write_if_changed('website/assets/js/search.js', search_js)
 
 # Create FAQ page
-faq_page = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Frequently Asked Questions About Self Storage | Storage Finder</title>
-    <meta name="description" content="Find answers to common questions about self storage including costs, security, access, and more.">
-    <link rel="stylesheet" href="assets/css/style.css">
-    <style>
+faq_style = """    <style>
         .faq-item {
             background-color: white;
             border-radius: 5px;
@@ -1134,23 +765,9 @@ faq_page = """<!DOCTYPE html>
             margin-bottom: 0;
         }
     </style>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
+"""
+
+faq_content = """
     <div class="container">
         <h1>Frequently Asked Questions About Self Storage</h1>
         <p>Find answers to common questions about self storage facilities and services.</p>
@@ -1227,73 +844,19 @@ faq_page = """<!DOCTYPE html>
             </div>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-</body>
-</html>
 """
 
 # Write FAQ page to file
-with open('website/faq.html', 'w', encoding='utf-8') as f:
-    f.write(faq_page)
+write_if_changed('website/faq.html', render_page(
+    "Frequently Asked Questions About Self Storage | Storage Finder",
+    "Find answers to common questions about self storage including costs, security, access, and more.",
+    faq_content,
+    depth=0,
+    extra_head=faq_style
+))
 
 # Create About page
-about_page = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>About Storage Finder | UK Self Storage Directory</title>
-    <meta name="description" content="Learn about Storage Finder, the UK's comprehensive directory of self storage facilities helping you find the perfect storage solution.">
-    <link rel="stylesheet" href="assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
+about_content = """
     <div class="container">
         <h1>About Storage Finder</h1>
         
@@ -1323,57 +886,18 @@ about_page = """<!DOCTYPE html>
             <p>We maintain an up-to-date database of self storage facilities across the UK. Our information is regularly reviewed to ensure accuracy and completeness. If you're a storage facility owner and would like to update your information or add your facility to our directory, please <a href="contact.html" style="color: #0d6efd;">contact us</a>.</p>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-</body>
-</html>
 """
 
 # Write About page to file
-with open('website/about.html', 'w', encoding='utf-8') as f:
-    f.write(about_page)
+write_if_changed('website/about.html', render_page(
+    "About Storage Finder | UK Self Storage Directory",
+    "Learn about Storage Finder, the UK's comprehensive directory of self storage facilities helping you find the perfect storage solution.",
+    about_content,
+    depth=0
+))
 
 # Create Contact Us page
-contact_page = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Contact Storage Finder | UK Self Storage Directory</title>
-    <meta name="description" content="Get in touch with Storage Finder for questions, feedback, or to update your storage facility information in our directory.">
-    <link rel="stylesheet" href="assets/css/style.css">
-    <style>
+contact_style = """    <style>
         .contact-form {
             background-color: white;
             padding: 30px;
@@ -1434,23 +958,9 @@ contact_page = """<!DOCTYPE html>
             }
         }
     </style>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
+"""
+
+contact_content = """
     <div class="container">
         <h1>Contact Us</h1>
         <p>Have questions, feedback, or need to update information about your storage facility? We'd love to hear from you!</p>
@@ -1510,41 +1020,9 @@ contact_page = """<!DOCTYPE html>
             </div>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-    
-    <script>
+"""
+
+contact_scripts = """    <script>
         function showThankYou() {
             // Basic form validation
             const name = document.getElementById('name').value;
@@ -1559,40 +1037,20 @@ contact_page = """<!DOCTYPE html>
             }
         }
     </script>
-</body>
-</html>
 """
 
 # Write Contact Us page to file
-with open('website/contact.html', 'w', encoding='utf-8') as f:
-    f.write(contact_page)
+write_if_changed('website/contact.html', render_page(
+    "Contact Storage Finder | UK Self Storage Directory",
+    "Get in touch with Storage Finder for questions, feedback, or to update your storage facility information in our directory.",
+    contact_content,
+    depth=0,
+    extra_head=contact_style,
+    scripts=contact_scripts
+))
 
 # Create Privacy Policy page
-privacy_page = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Privacy Policy | Storage Finder</title>
-    <meta name="description" content="Storage Finder's privacy policy explains how we collect, use, and protect your personal information.">
-    <link rel="stylesheet" href="assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
+privacy_content = """
     <div class="container">
         <h1>Privacy Policy</h1>
         
@@ -1653,73 +1111,18 @@ privacy_page = """<!DOCTYPE html>
             <p style="margin-top: 30px;"><strong>Last Updated:</strong> April 2024</p>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-</body>
-</html>
 """
 
 # Write Privacy Policy page to file
-with open('website/privacy.html', 'w', encoding='utf-8') as f:
-    f.write(privacy_page)
+write_if_changed('website/privacy.html', render_page(
+    "Privacy Policy | Storage Finder",
+    "Storage Finder's privacy policy explains how we collect, use, and protect your personal information.",
+    privacy_content,
+    depth=0
+))
 
 # Create Terms and Conditions page
-terms_page = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Terms and Conditions | Storage Finder</title>
-    <meta name="description" content="The terms and conditions for using Storage Finder's services and website.">
-    <link rel="stylesheet" href="assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
+terms_content = """
     <div class="container">
         <h1>Terms and Conditions</h1>
         
@@ -1775,73 +1178,18 @@ terms_page = """<!DOCTYPE html>
             <p style="margin-top: 30px;"><strong>Last Updated:</strong> April 2024</p>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-</body>
-</html>
 """
 
 # Write Terms and Conditions page to file
-with open('website/terms.html', 'w', encoding='utf-8') as f:
-    f.write(terms_page)
+write_if_changed('website/terms.html', render_page(
+    "Terms and Conditions | Storage Finder",
+    "The terms and conditions for using Storage Finder's services and website.",
+    terms_content,
+    depth=0
+))
 
 # Create Membership Terms page
-membership_page = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Membership Terms | Storage Finder</title>
-    <meta name="description" content="Terms and conditions for Storage Finder membership and facility listings.">
-    <link rel="stylesheet" href="assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="logo">Storage Finder</div>
-            <nav>
-                <ul>
-                    <li><a href="index.html">Home</a></li>
-                    <li><a href="regions.html">Regions</a></li>
-                    <li><a href="faq.html">FAQ</a></li>
-                    <li><a href="about.html">About</a></li>
-                    <li><a href="contact.html">Contact</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
+membership_content = """
     <div class="container">
         <h1>Membership Terms</h1>
         
@@ -1905,50 +1253,23 @@ membership_page = """<!DOCTYPE html>
             <p style="margin-top: 30px;"><strong>Last Updated:</strong> April 2024</p>
         </div>
     </div>
-    
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Legal</h3>
-                    <ul>
-                        <li><a href="privacy.html">Privacy</a></li>
-                        <li><a href="terms.html">Terms and Conditions</a></li>
-                        <li><a href="membership.html">Membership Terms</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Navigate</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="regions.html">Regions</a></li>
-                        <li><a href="faq.html">FAQ</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Company</h3>
-                    <ul>
-                        <li><a href="about.html">About Us</a></li>
-                        <li><a href="contact.html">Contact</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Storage Finder. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-</body>
-</html>
 """
 
 # Write Membership Terms page to file
-with open('website/membership.html', 'w', encoding='utf-8') as f:
-    f.write(membership_page)
+write_if_changed('website/membership.html', render_page(
+    "Membership Terms | Storage Finder",
+    "Terms and conditions for Storage Finder membership and facility listings.",
+    membership_content,
+    depth=0
+))
+
+# Save the counts for scripts that update single cities, then record the
+# content hash of every file for deploy_diff.py
+save_aggregates(aggregates)
+update_manifest(website_dir)
 
 print("Website generation complete!")
-print(f"Total regions: {len(region_data)}")
-total_cities = sum(len(cities) for cities in region_data.values())
-print(f"Total cities: {total_cities}")
-total_facilities = sum(sum(len(facilities) for facilities in cities.values()) for cities in region_data.values())
-print(f"Total facilities: {total_facilities}") 
\ No newline at end of file
+print(f"Total regions: {aggregates['totals']['regions']}")
+print(f"Total cities: {aggregates['totals']['cities']}")
+print(f"Total facilities: {aggregates['totals']['facilities']}")
+print(f"API endpoints: {api_endpoints}") 
\ No newline at end of file
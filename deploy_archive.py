@@ -0,0 +1,184 @@
+import io
+import os
+import json
+import time
+import zlib
+import struct
+import hashlib
+import tarfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Formats that are already compressed and gain nothing from deflate
+STORED_EXTENSIONS = (
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico',
+    '.gz', '.br', '.zst', '.zip', '.woff', '.woff2', '.pdf', '.mp4'
+)
+
+# Files compressed together per batch, so memory stays bounded on large sites
+BATCH_SIZE = 256
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Package the generated website into a deployment archive")
+    parser.add_argument("--dir", default="website", help="Website directory to package")
+    parser.add_argument("--output", default="website.zip", help="Archive path; use a .tar.zst name for zstandard")
+    parser.add_argument("--manifest", help="JSON manifest of {path: hash} listing the files to package")
+    parser.add_argument("--level", type=int, default=6, help="Compression level")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of compression threads")
+    return parser.parse_args()
+
+def list_site_files(website_dir, manifest_path=None):
+    """Return the relative paths to package, from a manifest or by walking the site."""
+    if manifest_path:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return sorted(manifest.get("files", manifest))
+
+    paths = []
+    for root, dirs, files in os.walk(website_dir):
+        for file in files:
+            paths.append(os.path.relpath(os.path.join(root, file), website_dir).replace(os.sep, '/'))
+    return sorted(paths)
+
+def should_store(path):
+    return path.lower().endswith(STORED_EXTENSIONS)
+
+def compress_entry(website_dir, path, level):
+    """Read one file and return everything the zip writer needs for it."""
+    full_path = os.path.join(website_dir, path)
+    with open(full_path, 'rb') as f:
+        data = f.read()
+
+    method = 0
+    payload = data
+    if data and not should_store(path):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        deflated = compressor.compress(data) + compressor.flush()
+        if len(deflated) < len(data):
+            method = 8
+            payload = deflated
+
+    return {
+        "path": path,
+        "method": method,
+        "crc": zlib.crc32(data),
+        "size": len(data),
+        "payload": payload,
+        "mtime": os.path.getmtime(full_path),
+        "hash": hashlib.blake2b(data, digest_size=16).hexdigest()
+    }
+
+def dos_datetime(timestamp):
+    t = time.localtime(max(timestamp, 315532800))
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+def write_zip(website_dir, paths, output_path, level=6, workers=None):
+    """Write a zip archive, deflating files on a thread pool.
+
+    zlib releases the GIL while compressing, so entries are deflated in
+    parallel and written in order. Images and precompressed .gz/.br files
+    are stored as-is. Returns (stats, {path: hash}).
+    """
+    if len(paths) >= 0xFFFF:
+        raise ValueError("Too many files for a zip archive without zip64; use a .tar.zst output")
+
+    central = []
+    hashes = {}
+    stats = {"files": 0, "stored": 0, "deflated": 0, "bytes_in": 0, "bytes_out": 0}
+
+    with open(output_path, 'wb') as out, ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(paths), BATCH_SIZE):
+            batch = paths[start:start + BATCH_SIZE]
+            for entry in executor.map(lambda path: compress_entry(website_dir, path, level), batch):
+                name = entry["path"].encode('utf-8')
+                dos_time, dos_date = dos_datetime(entry["mtime"])
+                offset = out.tell()
+                if offset >= 0xFFFFFFFF or len(entry["payload"]) >= 0xFFFFFFFF:
+                    raise ValueError("Archive too large for a zip without zip64; use a .tar.zst output")
+
+                out.write(struct.pack(
+                    '<IHHHHHIIIHH', 0x04034b50, 20, 0x0800, entry["method"], dos_time, dos_date,
+                    entry["crc"], len(entry["payload"]), entry["size"], len(name), 0
+                ))
+                out.write(name)
+                out.write(entry["payload"])
+
+                central.append(struct.pack(
+                    '<IHHHHHHIIIHHHHHII', 0x02014b50, 20, 20, 0x0800, entry["method"], dos_time, dos_date,
+                    entry["crc"], len(entry["payload"]), entry["size"], len(name), 0, 0, 0, 0,
+                    0o100644 << 16, offset
+                ) + name)
+
+                hashes[entry["path"]] = entry["hash"]
+                stats["files"] += 1
+                stats["stored" if entry["method"] == 0 else "deflated"] += 1
+                stats["bytes_in"] += entry["size"]
+                stats["bytes_out"] += len(entry["payload"])
+
+        directory_offset = out.tell()
+        directory = b''.join(central)
+        out.write(directory)
+        out.write(struct.pack(
+            '<IHHHHIIH', 0x06054b50, 0, 0, len(central), len(central), len(directory), directory_offset, 0
+        ))
+
+    return stats, hashes
+
+def write_tar_zst(website_dir, paths, output_path, level=6, workers=None):
+    """Stream the files into a tar archive compressed with multi-threaded zstandard."""
+    try:
+        import zstandard
+    except ImportError:
+        raise SystemExit("The zstandard package is required for .tar.zst output (pip install zstandard)")
+
+    hashes = {}
+    stats = {"files": 0, "stored": 0, "deflated": 0, "bytes_in": 0, "bytes_out": 0}
+    compressor = zstandard.ZstdCompressor(level=level, threads=workers or -1)
+
+    with open(output_path, 'wb') as out:
+        with compressor.stream_writer(out, closefd=False) as stream:
+            with tarfile.open(fileobj=stream, mode='w|') as tar:
+                for path in paths:
+                    full_path = os.path.join(website_dir, path)
+                    with open(full_path, 'rb') as f:
+                        data = f.read()
+                    info = tar.gettarinfo(full_path, arcname=path)
+                    tar.addfile(info, io.BytesIO(data))
+
+                    hashes[path] = hashlib.blake2b(data, digest_size=16).hexdigest()
+                    stats["files"] += 1
+                    stats["bytes_in"] += len(data)
+        stats["bytes_out"] = out.tell()
+
+    return stats, hashes
+
+def build_archive(website_dir="website", output_path="website.zip", manifest_path=None, level=6, workers=None, paths=None):
+    """Package the site without touching the working tree. Returns (stats, {path: hash}).
+
+    Pass paths to package only those files, e.g. the changes from deploy_diff.py.
+    """
+    if paths is None:
+        paths = list_site_files(website_dir, manifest_path)
+    if output_path.endswith(('.tar.zst', '.tzst')):
+        return write_tar_zst(website_dir, paths, output_path, level, workers)
+    return write_zip(website_dir, paths, output_path, level, workers)
+
+def main():
+    args = parse_args()
+    start_time = time.time()
+
+    if not os.path.exists(args.dir):
+        print(f"Website directory not found: {args.dir}")
+        return
+
+    stats, hashes = build_archive(args.dir, args.output, args.manifest, args.level, args.workers)
+    elapsed_time = time.time() - start_time
+
+    print("Deployment archive summary:")
+    print(f"- Archive: {args.output}")
+    print(f"- Files: {stats['files']} ({stats['deflated']} compressed, {stats['stored']} stored as-is)")
+    print(f"- Size: {stats['bytes_in']:,} bytes -> {stats['bytes_out']:,} bytes")
+    print(f"- Time taken: {elapsed_time:.2f} seconds")
+
+if __name__ == "__main__":
+    main()
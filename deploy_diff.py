@@ -0,0 +1,83 @@
+import time
+import shutil
+import argparse
+from deploy_archive import build_archive
+from site_manifest import MANIFEST_PATH, load_manifest, update_manifest, diff_manifests
+
+# Manifest of the files currently on the server, updated with --mark-deployed
+DEPLOYED_MANIFEST_PATH = 'deployed_manifest.json'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="List or package only the files that changed since the last deploy")
+    parser.add_argument("--dir", default="website", help="Website directory")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="Manifest of the current build")
+    parser.add_argument("--deployed", default=DEPLOYED_MANIFEST_PATH, help="Manifest of the last deploy")
+    parser.add_argument("--no-refresh", action="store_true", help="Use the build manifest as written instead of refreshing it")
+    parser.add_argument("--list", help="Write the added and changed paths to this file, one per line")
+    parser.add_argument("--removed", help="Write the removed paths to this file, one per line")
+    parser.add_argument("--archive", help="Write a delta archive (.zip or .tar.zst) of the added and changed files")
+    parser.add_argument("--mark-deployed", action="store_true", help="Record the current manifest as deployed")
+    parser.add_argument("--verbose", action="store_true", help="Print every added, changed and removed path")
+    return parser.parse_args()
+
+def write_path_list(path, paths):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"{item}\n" for item in paths))
+
+def main():
+    args = parse_args()
+    start_time = time.time()
+
+    if args.no_refresh:
+        current = load_manifest(args.manifest)
+    else:
+        current = update_manifest(args.dir, args.manifest)
+    deployed = load_manifest(args.deployed)
+
+    added, changed, removed = diff_manifests(current, deployed)
+    upload = sorted(added + changed)
+
+    if args.verbose:
+        for path in added:
+            print(f"+ {path}")
+        for path in changed:
+            print(f"~ {path}")
+        for path in removed:
+            print(f"- {path}")
+
+    if args.list:
+        write_path_list(args.list, upload)
+    if args.removed:
+        write_path_list(args.removed, removed)
+
+    archive_stats = None
+    if args.archive:
+        archive_stats, hashes = build_archive(args.dir, args.archive, paths=upload)
+
+    if args.mark_deployed:
+        shutil.copyfile(args.manifest, args.deployed)
+
+    elapsed_time = time.time() - start_time
+    upload_bytes = sum(current[path]["size"] for path in upload)
+    total_bytes = sum(entry["size"] for entry in current.values())
+
+    print("Deploy diff summary:")
+    if not deployed:
+        print(f"- No deployed manifest at {args.deployed}; every file counts as added")
+    print(f"- Added: {len(added)}")
+    print(f"- Changed: {len(changed)}")
+    print(f"- Removed: {len(removed)}")
+    print(f"- Unchanged: {len(current) - len(added) - len(changed)}")
+    print(f"- To upload: {upload_bytes:,} of {total_bytes:,} bytes")
+    if args.list:
+        print(f"- Upload list saved to: {args.list}")
+    if args.removed:
+        print(f"- Removed list saved to: {args.removed}")
+    if archive_stats:
+        print(f"- Delta archive saved to: {args.archive} ({archive_stats['bytes_out']:,} bytes)")
+    if args.mark_deployed:
+        print(f"- Recorded {args.manifest} as deployed in {args.deployed}")
+    print(f"- Time taken: {elapsed_time:.2f} seconds")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
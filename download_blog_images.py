@@ -1,6 +1,7 @@
 import os
 import requests
 from urllib.parse import urljoin
+from site_writer import write_if_changed
 
 # Create the blog images directory if it doesn't exist
 os.makedirs('website/assets/img/blog', exist_ok=True)
@@ -17,8 +18,7 @@ images = {
 for filename, url in images.items():
     response = requests.get(url)
     if response.status_code == 200:
-        with open(os.path.join('website/assets/img/blog', filename), 'wb') as f:
-            f.write(response.content)
+        write_if_changed(os.path.join('website/assets/img/blog', filename), response.content)
         print(f'Downloaded {filename}')
     else:
         print(f'Failed to download {filename}') 
\ No newline at end of file
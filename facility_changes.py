@@ -0,0 +1,47 @@
+import json
+import time
+import argparse
+from facility_db import DB_PATH, FacilityDB, reader_for, affected_cities
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare a facility sheet with its last imported snapshot")
+    parser.add_argument("--source", default="master_storage_facilities.csv", help="CSV, xlsx or txt facility file")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database holding the last imported snapshot")
+    parser.add_argument("--output", default="facility_changes.json", help="Path to save the changeset JSON")
+    parser.add_argument("--commit", action="store_true", help="Import the new sheet as the snapshot after diffing")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    start_time = time.time()
+
+    with FacilityDB(args.db) as db:
+        changeset = db.diff_source(args.source)
+        cities = affected_cities(changeset)
+        if args.commit:
+            db.import_source(args.source, reader_for(args.source), force=True)
+
+    report = {
+        "source": args.source,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "affected_cities": [f"{region}/{city}" for region, city in cities],
+        "affected_regions": sorted({region for region, city in cities}),
+        **changeset
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    elapsed_time = time.time() - start_time
+    print("Facility changes summary:")
+    print(f"- Source: {args.source}")
+    print(f"- Added: {len(changeset['added'])}")
+    print(f"- Removed: {len(changeset['removed'])}")
+    print(f"- Modified: {len(changeset['modified'])}")
+    print(f"- Affected cities: {len(report['affected_cities'])} in {len(report['affected_regions'])} regions")
+    print(f"- Changeset saved to: {args.output}")
+    if args.commit:
+        print(f"- Snapshot updated in: {args.db}")
+    print(f"- Time taken: {elapsed_time:.2f} seconds")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,424 @@
+import os
+import re
+import csv
+import time
+import sqlite3
+import argparse
+from site_paths import clean_name, slugify
+from facility_record import Facility
+
+# Default database file, rebuilt from the sources below by this script
+DB_PATH = 'storage_facilities.db'
+
+EXCEL_FILE = 'self storage facilities uk.xlsx'
+CSV_FILES = ['master_storage_facilities.csv', 'correct_storage_facilities.csv', 'storage_facilities.csv']
+TEXT_FILE = 'storage_facilities_data.txt'
+
+# Parsed spreadsheets of this process by path, with the size and mtime they were read at
+SHEET_CACHE = {}
+
+# Full UK postcode, e.g. GU34 1BD; the outward code is the part before the space
+POSTCODE_PATTERN = re.compile(r'\b([A-Z]{1,2}[0-9][A-Z0-9]?)\s*([0-9][A-Z]{2})\b')
+
+# Bumped when the stored names or slugs change, so older databases are re-imported
+DATA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    imported TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS facilities (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    region TEXT NOT NULL,
+    region_slug TEXT NOT NULL,
+    city TEXT NOT NULL,
+    city_slug TEXT NOT NULL,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL DEFAULT '',
+    postcode TEXT NOT NULL DEFAULT '',
+    outcode TEXT NOT NULL DEFAULT '',
+    phone TEXT NOT NULL DEFAULT '',
+    website TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    features TEXT NOT NULL DEFAULT '',
+    population TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_facilities_region_city ON facilities (region_slug, city_slug);
+CREATE INDEX IF NOT EXISTS idx_facilities_city ON facilities (city_slug);
+CREATE INDEX IF NOT EXISTS idx_facilities_postcode ON facilities (postcode);
+CREATE INDEX IF NOT EXISTS idx_facilities_outcode ON facilities (outcode);
+CREATE INDEX IF NOT EXISTS idx_facilities_source ON facilities (source);
+"""
+
+COLUMNS = ['source', 'region', 'region_slug', 'city', 'city_slug', 'name', 'address', 'postcode',
+           'outcode', 'phone', 'website', 'email', 'description', 'features', 'population']
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import all facility data into one indexed SQLite database")
+    parser.add_argument("--db", default=DB_PATH, help="Path of the SQLite database")
+    parser.add_argument("--force", action="store_true", help="Re-import every source even if it has not changed")
+    parser.add_argument("--region", help="Print the cities of this region after importing")
+    parser.add_argument("--city", help="Print the facilities of a city in format 'region/city'")
+    parser.add_argument("--postcode", help="Print the facilities with this postcode or outward code")
+    return parser.parse_args()
+
+def clean(value):
+    """Return a stripped string for a cell, treating NaN and None as empty."""
+    if value is None or value != value:
+        return ''
+    return str(value).strip()
+
+def find_postcode(address):
+    """Return (postcode, outcode) found in an address, or empty strings."""
+    match = POSTCODE_PATTERN.search(address.upper())
+    if not match:
+        return '', ''
+    return f"{match.group(1)} {match.group(2)}", match.group(1)
+
+def make_record(source, region, city, name, **fields):
+    """Build one facilities row; region and city keep the spelling the generators use."""
+    record = {column: '' for column in COLUMNS}
+    record.update({key: clean(value) for key, value in fields.items()})
+    record.update({
+        "source": source,
+        "region": clean_name(clean(region)),
+        "city": clean_name(clean(city)),
+        "name": clean(name)
+    })
+    record["region_slug"] = slugify(record["region"])
+    record["city_slug"] = slugify(record["city"])
+    record["postcode"], record["outcode"] = find_postcode(record["address"])
+    return record
+
+def read_sheet(path):
+    """Return the DataFrame of a spreadsheet, parsed once per process while the file is unchanged.
+
+    One-off scripts pay for one read as before; the build daemon keeps the
+    parsed frame between jobs. Callers must not modify the frame.
+    """
+    import pandas as pd
+
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    cached = SHEET_CACHE.get(key)
+    if cached and cached[0] == (stat.st_size, stat.st_mtime_ns):
+        return cached[1]
+    df = pd.read_excel(path)
+    SHEET_CACHE[key] = ((stat.st_size, stat.st_mtime_ns), df)
+    return df
+
+def read_sheet_groups(path, db_path=DB_PATH):
+    """Group the spreadsheet's facilities into {region: {city: [Facility]}}.
+
+    This is the data every region and city page is rendered from. The full
+    build and watch mode both read it here, so an incremental rebuild
+    renders exactly what a full build would. The sheet is imported into the
+    facility database when it changed, and each city is then fetched with
+    the indexed city query, in the order the sheet lists them.
+    """
+    with FacilityDB(db_path) as db:
+        db.import_source(path, reader_for(path))
+        region_data = {}
+        for region, city in db.city_names(path):
+            region_data.setdefault(region, {})[city] = db.city_facilities(region, city, path)
+    return region_data
+
+def read_excel_source(path):
+    df = read_sheet(path)
+    for row in df.to_dict('records'):
+        city = clean(row.get('CITY'))
+        if not city:
+            continue
+        yield make_record(
+            path, row.get('Region'), city, row.get('Name of Self Storage'),
+            address=row.get('Location'),
+            phone=row.get('Telephone Number'),
+            website=row.get('Website'),
+            email=row.get('Email / Contact'),
+            population=row.get('Town Population')
+        )
+
+def read_csv_source(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            if not clean(row.get('Region')) or not clean(row.get('City')) or not clean(row.get('Name')):
+                continue
+            # Unquoted feature lists spill into extra columns, which DictReader keeps under None
+            features = [clean(row.get('Features'))] + [clean(extra) for extra in row.get(None) or []]
+            yield make_record(
+                path, row['Region'], row['City'], row['Name'],
+                address=row.get('Address'),
+                phone=row.get('Phone'),
+                website=row.get('Website'),
+                description=row.get('Description'),
+                features=','.join(feature for feature in features if feature)
+            )
+
+def read_text_source(path):
+    """Read the tab-separated export: 'City, Region', name, website, email, phone, address."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = [clean(part) for part in line.rstrip('\n').split('\t')]
+            if len(parts) < 6 or not parts[1]:
+                continue
+            place = parts[0].replace('‎', '')
+            city, _, region = place.rpartition(',')
+            yield make_record(
+                path, region, city or place, parts[1],
+                website=parts[2],
+                email=parts[3],
+                phone=parts[4],
+                address=parts[5]
+            )
+
+def source_readers():
+    """Return (path, reader) for every known facility data file."""
+    readers = [(EXCEL_FILE, read_excel_source)]
+    readers += [(path, read_csv_source) for path in CSV_FILES]
+    readers.append((TEXT_FILE, read_text_source))
+    return readers
+
+def source_path(path):
+    """Return a source file path the way it is stored, so './feed.csv' and 'feed.csv' are one source."""
+    return os.path.relpath(path)
+
+def reader_for(path):
+    """Return the reader for a facility data file, chosen by its extension."""
+    if path.lower().endswith(('.xlsx', '.xls')):
+        return read_excel_source
+    if path.lower().endswith('.txt'):
+        return read_text_source
+    return read_csv_source
+
+def record_key(record):
+    """Identify a facility by (region, city, name, address) for change capture."""
+    return (record["region_slug"], record["city_slug"], record["name"].lower(), ' '.join(record["address"].lower().split()))
+
+def diff_records(old_records, new_records):
+    """Compare two snapshots of one source and return a changeset dict.
+
+    The changeset lists added and removed facility records, and modified
+    ones as {"old": ..., "new": ...} pairs. Facilities are matched by
+    record_key, so a changed name or address counts as a removal plus an
+    addition.
+    """
+    old = {record_key(record): record for record in old_records}
+    new = {record_key(record): record for record in new_records}
+    compared = [column for column in COLUMNS if column != 'source']
+
+    modified = []
+    for key in sorted(old.keys() & new.keys()):
+        if any(old[key][column] != new[key][column] for column in compared):
+            modified.append({"old": old[key], "new": new[key]})
+
+    return {
+        "added": [new[key] for key in sorted(new.keys() - old.keys())],
+        "removed": [old[key] for key in sorted(old.keys() - new.keys())],
+        "modified": modified
+    }
+
+def affected_cities(changeset):
+    """Return the sorted (region slug, city slug) pairs whose pages a changeset touches."""
+    records = changeset["added"] + changeset["removed"] + [change["new"] for change in changeset["modified"]]
+    return sorted({(record["region_slug"], record["city_slug"]) for record in records})
+
+def row_to_facility(row):
+    """Convert a database row or record to the Facility used by the page generators."""
+    return Facility(
+        name=row["name"],
+        address=row["address"],
+        phone=row["phone"],
+        website=row["website"],
+        email=row["email"],
+        description=row["description"],
+        features=row["features"],
+        region=row["region"],
+        city=row["city"],
+        population=row["population"],
+        postcode=row["postcode"]
+    )
+
+class FacilityDB:
+    """SQLite store of every facility, indexed by region, city and postcode.
+
+    Each source file is re-imported only when its size or mtime changes,
+    so opening the database after a data fix costs one small import.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != DATA_VERSION:
+            with self.conn:
+                self.conn.execute("DELETE FROM facilities")
+                self.conn.execute("DELETE FROM sources")
+            self.conn.execute(f"PRAGMA user_version = {DATA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def import_source(self, path, reader, force=False):
+        """Replace the rows of one source file. Returns the row count, or None if unchanged."""
+        path = source_path(path)
+        stat = os.stat(path)
+        known = self.conn.execute("SELECT size, mtime_ns FROM sources WHERE path = ?", (path,)).fetchone()
+        if not force and known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return None
+
+        records = list(reader(path))
+        placeholders = ', '.join('?' for _ in COLUMNS)
+        with self.conn:
+            self.conn.execute("DELETE FROM facilities WHERE source = ?", (path,))
+            self.conn.executemany(
+                f"INSERT INTO facilities ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [[record[column] for column in COLUMNS] for record in records]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, len(records), time.strftime("%Y-%m-%d %H:%M:%S"))
+            )
+        return len(records)
+
+    def source_records(self, path):
+        """Return the last imported snapshot of one source as records."""
+        path = source_path(path)
+        rows = self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM facilities WHERE source = ?", (path,))
+        return [dict(row) for row in rows]
+
+    def records(self, source=None):
+        """Return every imported row as a record dict, optionally from one source."""
+        if source:
+            rows = self.conn.execute("SELECT * FROM facilities WHERE source = ? ORDER BY id", (source_path(source),))
+        else:
+            rows = self.conn.execute("SELECT * FROM facilities ORDER BY id")
+        return [dict(row) for row in rows]
+
+    def diff_source(self, path, reader=None):
+        """Compare a source file with its last imported snapshot without importing it."""
+        path = source_path(path)
+        reader = reader or reader_for(path)
+        return diff_records(self.source_records(path), reader(path))
+
+    def refresh(self, force=False):
+        """Import every source file that exists and has changed. Returns {path: rows}."""
+        imported = {}
+        for path, reader in source_readers():
+            if os.path.exists(path):
+                count = self.import_source(path, reader, force)
+                if count is not None:
+                    imported[path] = count
+        return imported
+
+    def query(self, where='', params=(), source=None):
+        sql = "SELECT * FROM facilities"
+        clauses = [where] if where else []
+        if source:
+            clauses.append("source = ?")
+            params = tuple(params) + (source_path(source),)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return [row_to_facility(row) for row in self.conn.execute(sql + " ORDER BY id", params)]
+
+    def city_facilities(self, region, city, source=None):
+        """Return the facilities of one city; names and slugs are both accepted."""
+        return self.query("region_slug = ? AND city_slug = ?", (slugify(region), slugify(city)), source)
+
+    def city_names(self, source=None):
+        """Return (region, city) for every city, in the order the sources first list them."""
+        sql = "SELECT MIN(region) AS region, MIN(city) AS city FROM facilities"
+        params = ()
+        if source:
+            sql += " WHERE source = ?"
+            params = (source_path(source),)
+        sql += " GROUP BY region_slug, city_slug ORDER BY MIN(id)"
+        return [(row["region"], row["city"]) for row in self.conn.execute(sql, params)]
+
+    def by_postcode(self, postcode, source=None):
+        """Return facilities with a full postcode, or with an outward code such as GU34."""
+        postcode = clean(postcode).upper()
+        full, outcode = find_postcode(postcode)
+        if full:
+            return self.query("postcode = ?", (full,), source)
+        return self.query("outcode = ?", (postcode,), source)
+
+    def regions(self, source=None):
+        """Return (region, facility count) for every region, sorted by name."""
+        sql = "SELECT MIN(region) AS region, COUNT(*) AS count FROM facilities"
+        params = ()
+        if source:
+            sql += " WHERE source = ?"
+            params = (source_path(source),)
+        sql += " GROUP BY region_slug ORDER BY region_slug"
+        return [(row["region"], row["count"]) for row in self.conn.execute(sql, params)]
+
+    def cities(self, region, source=None):
+        """Return (city, facility count) for every city in a region, sorted by name."""
+        sql = "SELECT MIN(city) AS city, COUNT(*) AS count FROM facilities WHERE region_slug = ?"
+        params = (slugify(region),)
+        if source:
+            sql += " AND source = ?"
+            params += (source_path(source),)
+        sql += " GROUP BY city_slug ORDER BY city_slug"
+        return [(row["city"], row["count"]) for row in self.conn.execute(sql, params)]
+
+    def grouped(self, source=None):
+        """Return {region: {city: [facilities]}} in the shape the generators build from Excel."""
+        regions = {}
+        for facility in self.query(source=source):
+            regions.setdefault(facility.region, {}).setdefault(facility.city, []).append(facility)
+        return regions
+
+def open_db(path=DB_PATH, refresh=True):
+    """Open the facility database, importing any source that changed since the last run."""
+    db = FacilityDB(path)
+    if refresh:
+        db.refresh()
+    return db
+
+def print_facilities(facilities):
+    for facility in facilities:
+        print(f"- {facility.name} ({facility.city}, {facility.region}) {facility.postcode}")
+    print(f"{len(facilities)} facilities")
+
+def main():
+    args = parse_args()
+    start_time = time.time()
+
+    with FacilityDB(args.db) as db:
+        imported = db.refresh(force=args.force)
+        elapsed_time = time.time() - start_time
+
+        print("Facility database summary:")
+        print(f"- Database: {args.db}")
+        for path, count in imported.items():
+            print(f"- Imported {count} rows from {path}")
+        if not imported:
+            print("- All sources unchanged since the last import")
+        print(f"- Regions: {len(db.regions())}")
+        print(f"- Time taken: {elapsed_time:.2f} seconds")
+
+        if args.region:
+            for city, count in db.cities(args.region):
+                print(f"{city}: {count}")
+        if args.city:
+            region, _, city = args.city.partition('/')
+            print_facilities(db.city_facilities(region, city))
+        if args.postcode:
+            print_facilities(db.by_postcode(args.postcode))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import re
+import json
+import time
+import struct
+import hashlib
+import argparse
+from facility_db import DB_PATH, open_db
+
+# MinHash signature length, split into LSH bands of BAND_ROWS values each
+NUM_HASHES = 48
+BAND_ROWS = 3
+
+# Words too common in facility names and addresses to tell two facilities apart
+STOP_WORDS = {
+    'self', 'storage', 'store', 'stores', 'the', 'and', 'of', 'ltd', 'limited', 'uk',
+    'united', 'kingdom', 'england', 'unit', 'units', 'road', 'rd', 'street', 'st', 'lane', 'ln'
+}
+
+# LSH buckets larger than this compare members with the first one only, not with each other
+MAX_BUCKET_PAIRS = 50
+
+HASH_FORMAT = struct.Struct(f'<{NUM_HASHES}Q')
+
+# MinHash values of each distinct token, computed once per run
+TOKEN_HASHES = {}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find duplicate facilities across all data sources")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite facility database (see facility_db.py)")
+    parser.add_argument("--source", help="Only look for duplicates within this source file")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Token Jaccard similarity that counts as a duplicate")
+    parser.add_argument("--output", default="duplicate_facilities.json", help="Path to save the cluster report JSON")
+    return parser.parse_args()
+
+def tokenize(text):
+    """Return the normalized tokens of a name or address."""
+    text = str(text).lower().replace('&', ' and ')
+    return frozenset(token for token in re.findall(r'[a-z0-9]+', text) if token not in STOP_WORDS)
+
+def token_hashes(token):
+    """Return NUM_HASHES independent 64-bit hashes of a token from one SHAKE digest."""
+    hashes = TOKEN_HASHES.get(token)
+    if hashes is None:
+        digest = hashlib.shake_128(token.encode('utf-8')).digest(NUM_HASHES * 8)
+        hashes = TOKEN_HASHES[token] = HASH_FORMAT.unpack(digest)
+    return hashes
+
+def minhash(tokens):
+    """Return the MinHash signature of a token set, one minimum per hash function."""
+    return tuple(map(min, zip(*map(token_hashes, tokens))))
+
+def blocking_key(record):
+    """The block a record is compared within: its postcode outward code, else its city."""
+    if record['outcode']:
+        return f"outcode:{record['outcode']}"
+    return f"city:{record['region_slug']}/{record['city_slug']}"
+
+def distinctive_name(record, name_tokens):
+    """Name tokens without the town and region, which many unrelated facilities share."""
+    return name_tokens - tokenize(record['city']) - tokenize(record['region'])
+
+def names_match(first, second):
+    """Names agree when they share a distinctive word, or are both only generic words."""
+    return bool(first & second) or (not first and not second)
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def find_root(parents, item):
+    while parents[item] != item:
+        parents[item] = parents[parents[item]]
+        item = parents[item]
+    return item
+
+def find_duplicates(records, threshold=0.5):
+    """Cluster records that describe the same facility.
+
+    Records are only compared within a block (same outward code, or same
+    city when there is no postcode), and within a block only when their MinHash signatures share an
+    LSH band. Candidate pairs are then confirmed with the exact Jaccard
+    similarity of name and address tokens and by names_match, so the
+    cost grows with the number of likely duplicates rather than with n
+    squared. Returns (clusters, stats) where
+    each cluster is a list of (record index, best similarity) pairs.
+    """
+    name_tokens = [tokenize(record['name']) for record in records]
+    # The outward code is shared by the whole block, so it says nothing about a pair
+    tokens = [(name_tokens[index] | tokenize(record['address'])) - {record['outcode'].lower()}
+              for index, record in enumerate(records)]
+    names = [distinctive_name(record, name_tokens[index]) for index, record in enumerate(records)]
+
+    buckets = {}
+    for index, record in enumerate(records):
+        if not tokens[index]:
+            continue
+        signature = minhash(tokens[index])
+        block = blocking_key(record)
+        for start in range(0, NUM_HASHES, BAND_ROWS):
+            buckets.setdefault((block, start, signature[start:start + BAND_ROWS]), []).append(index)
+
+    candidates = set()
+    for members in buckets.values():
+        # Very large buckets are near-identical rows, so linking each to the first is enough
+        anchors = members if len(members) <= MAX_BUCKET_PAIRS else members[:1]
+        for i, first in enumerate(anchors):
+            for second in members[i + 1:]:
+                candidates.add((first, second) if first < second else (second, first))
+
+    parents = list(range(len(records)))
+    best = {}
+    matches = 0
+    for first, second in candidates:
+        # Different businesses often share a business park address, so names must overlap too
+        similarity = jaccard(tokens[first], tokens[second])
+        if similarity < threshold or not names_match(names[first], names[second]):
+            continue
+        matches += 1
+        parents[find_root(parents, first)] = find_root(parents, second)
+        for index in (first, second):
+            best[index] = max(best.get(index, 0.0), similarity)
+
+    groups = {}
+    for index in best:
+        groups.setdefault(find_root(parents, index), []).append((index, best[index]))
+    clusters = sorted((sorted(group) for group in groups.values()), key=lambda group: group[0][0])
+
+    stats = {"records": len(records), "candidate_pairs": len(candidates), "matched_pairs": matches}
+    return clusters, stats
+
+def cluster_report(records, clusters):
+    report = []
+    for cluster in clusters:
+        members = [dict(
+            source=records[index]['source'],
+            name=records[index]['name'],
+            address=records[index]['address'],
+            postcode=records[index]['postcode'],
+            city=records[index]['city'],
+            region=records[index]['region'],
+            similarity=round(similarity, 3)
+        ) for index, similarity in cluster]
+        report.append({"keep": members[0], "duplicates": members[1:]})
+    return report
+
+def main():
+    args = parse_args()
+    start_time = time.time()
+
+    with open_db(args.db) as db:
+        records = db.records(source=args.source)
+
+    clusters, stats = find_duplicates(records, args.threshold)
+    elapsed_time = time.time() - start_time
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "threshold": args.threshold,
+        **stats,
+        "clusters": cluster_report(records, clusters)
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print("Duplicate facility summary:")
+    print(f"- Facilities checked: {stats['records']}")
+    print(f"- Candidate pairs compared: {stats['candidate_pairs']}")
+    print(f"- Duplicate clusters: {len(clusters)} ({sum(len(cluster) - 1 for cluster in clusters)} duplicate rows)")
+    print(f"- Report saved to: {args.output}")
+    print(f"- Time taken: {elapsed_time:.2f} seconds")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import sys
+
+# Shared feature tuples, so facilities with the same features point at one tuple
+FEATURE_TUPLES = {}
+
+# Older dict keys that name a Facility field
+FIELD_ALIASES = {'location': 'address'}
+
+def intern_features(features):
+    """Return features as a shared tuple of interned strings.
+
+    Accepts a list, a tuple or a comma-separated string. Each feature name
+    is stored once, and so is each distinct combination of features.
+    """
+    if isinstance(features, str):
+        features = features.split(',')
+    key = tuple(sys.intern(feature.strip()) for feature in features or () if feature and feature.strip())
+    return FEATURE_TUPLES.setdefault(key, key)
+
+def intern_name(value):
+    """Intern a region or city name; spreadsheet cells that are not text are kept as-is."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Facility:
+    """One storage facility, the record every reader and page generator shares.
+
+    __slots__ keeps each record to a fixed set of fields without a
+    per-instance dict. Region and city names are interned, and features are
+    shared tuples from intern_features. Item access and get() are kept so
+    code written for the old facility dicts reads a Facility unchanged,
+    including the 'location' key used for Excel rows. Records are not
+    changed after they are built (use replace()), so they can be hashed,
+    e.g. to deduplicate them in a set.
+    """
+
+    __slots__ = ('name', 'address', 'phone', 'website', 'email', 'description',
+                 'features', 'region', 'city', 'population', 'postcode')
+
+    def __init__(self, name='', address='', phone='', website='', email='', description='',
+                 features=(), region='', city='', population='', postcode=''):
+        self.name = name
+        self.address = address
+        self.phone = phone
+        self.website = website
+        self.email = email
+        self.description = description
+        self.features = intern_features(features)
+        self.region = intern_name(region)
+        self.city = intern_name(city)
+        self.population = population
+        self.postcode = postcode
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, FIELD_ALIASES.get(key, key))
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        """Like the old dicts, a key is only present when its field was given a value."""
+        field = FIELD_ALIASES.get(key, key)
+        return field in self.__slots__ and getattr(self, field) not in ('', ())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        return isinstance(other, Facility) and self.to_list() == other.to_list()
+
+    def __hash__(self):
+        return hash(tuple(self.to_list()))
+
+    def __repr__(self):
+        return f"Facility({self.name!r}, {self.city!r}, {self.region!r})"
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed."""
+        values = self.to_dict()
+        values.update(changes)
+        return Facility(**values)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def to_list(self):
+        """Return the fields in slot order, e.g. for JSON spill files."""
+        return [getattr(self, field) for field in self.__slots__]
+
+    @classmethod
+    def from_list(cls, values):
+        return cls(*values)
\ No newline at end of file
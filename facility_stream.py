@@ -0,0 +1,154 @@
+import os
+import csv
+import json
+import zlib
+import shutil
+import tempfile
+from facility_record import Facility
+
+# Rows held in memory while grouping before the rest spill to disk partitions
+MAX_BUFFERED_ROWS = 100000
+
+# Number of on-disk partitions; each one is grouped in memory on its own
+SPILL_PARTITIONS = 64
+
+def iter_csv_facilities(csv_file):
+    """Yield one Facility per CSV row without loading the file.
+
+    Rows use the Region, City, Name, Address, Phone, Website, Description,
+    Features columns. Unquoted feature lists that spill into extra columns
+    are kept. Rows without a region, city or name are skipped.
+    """
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            region = (row.get('Region') or '').strip()
+            city = (row.get('City') or '').strip()
+            name = (row.get('Name') or '').strip()
+            if not region or not city or not name:
+                continue
+
+            features = (row.get('Features') or '').split(',') + (row.get(None) or [])
+            yield Facility(
+                name=name,
+                address=(row.get('Address') or '').strip(),
+                phone=(row.get('Phone') or '').strip(),
+                website=(row.get('Website') or '').strip(),
+                description=(row.get('Description') or '').strip(),
+                features=features,
+                region=region,
+                city=city
+            )
+
+class SpillPartitions:
+    """Hash-partition rows into JSON-lines files so each group can be rebuilt alone.
+
+    Every row of a key lands in the same partition, so reading one
+    partition back yields complete groups while memory holds only that
+    partition.
+    """
+
+    def __init__(self, spill_dir=None, partitions=SPILL_PARTITIONS, encode=None, decode=None):
+        self.encode = encode or (lambda row: row)
+        self.decode = decode or (lambda row: row)
+        self.folder = tempfile.mkdtemp(prefix="facility-spill-", dir=spill_dir)
+        self.files = [None] * partitions
+        self.rows = 0
+
+    def path(self, index):
+        return os.path.join(self.folder, f"part-{index:03d}.jsonl")
+
+    def add(self, key, row):
+        index = zlib.crc32(json.dumps(key).encode('utf-8')) % len(self.files)
+        if self.files[index] is None:
+            self.files[index] = open(self.path(index), 'w', encoding='utf-8')
+        self.files[index].write(json.dumps([key, self.encode(row)]) + '\n')
+        self.rows += 1
+
+    def groups(self):
+        """Yield (key, rows) for every group, one partition at a time."""
+        for index, f in enumerate(self.files):
+            if f is None:
+                continue
+            f.close()
+            self.files[index] = None
+
+            grouped = {}
+            with open(self.path(index), 'r', encoding='utf-8') as part:
+                for line in part:
+                    key, row = json.loads(line)
+                    grouped.setdefault(tuple(key) if isinstance(key, list) else key, []).append(self.decode(row))
+            os.remove(self.path(index))
+            yield from grouped.items()
+
+    def close(self):
+        for f in self.files:
+            if f is not None:
+                f.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+def group_sorted(rows, key):
+    """Yield (key, rows) from input already ordered by key, one group in memory at a time."""
+    finished = set()
+    current_key = None
+    current_rows = []
+    for row in rows:
+        row_key = key(row)
+        if row_key != current_key:
+            if current_rows:
+                finished.add(current_key)
+                yield current_key, current_rows
+            if row_key in finished:
+                raise ValueError(f"Input is not sorted: {row_key} appears again after its group ended")
+            current_key = row_key
+            current_rows = []
+        current_rows.append(row)
+    if current_rows:
+        yield current_key, current_rows
+
+def group_rows(rows, key, presorted=False, max_rows=MAX_BUFFERED_ROWS, spill_dir=None, encode=None, decode=None):
+    """Group a stream of rows by key and yield (key, rows) per group.
+
+    Sorted input is grouped as it streams past. Otherwise rows are grouped
+    in memory up to max_rows; past that everything is spilled to
+    hash partitions on disk and the groups are rebuilt one partition at a
+    time, so memory stays bounded whatever the size of the feed. encode and
+    decode convert rows to and from JSON values for the spill files.
+    """
+    if presorted:
+        yield from group_sorted(rows, key)
+        return
+
+    buffered = {}
+    buffered_rows = 0
+    partitions = None
+    try:
+        for row in rows:
+            row_key = key(row)
+            if partitions is not None:
+                partitions.add(row_key, row)
+                continue
+
+            buffered.setdefault(row_key, []).append(row)
+            buffered_rows += 1
+            if buffered_rows > max_rows:
+                partitions = SpillPartitions(spill_dir, encode=encode, decode=decode)
+                for buffered_key, group in buffered.items():
+                    for buffered_row in group:
+                        partitions.add(buffered_key, buffered_row)
+                buffered = {}
+
+        if partitions is None:
+            yield from buffered.items()
+        else:
+            yield from partitions.groups()
+    finally:
+        if partitions is not None:
+            partitions.close()
+
+def stream_city_groups(csv_file, presorted=False, max_rows=MAX_BUFFERED_ROWS, spill_dir=None):
+    """Yield ('region/city', facilities) groups from a facility CSV of any size."""
+    def city_key(facility):
+        return f"{facility.region.lower()}/{facility.city.lower()}"
+
+    yield from group_rows(iter_csv_facilities(csv_file), city_key, presorted, max_rows, spill_dir,
+                          encode=Facility.to_list, decode=Facility.from_list)
\ No newline at end of file
@@ -2,7 +2,9 @@ import os
 import shutil
 import re
 from bs4 import BeautifulSoup
+from site_paths import relink_page
 import glob
+from site_writer import write_if_changed
 
 def normalize_path(path):
     """Normalize a path to be used in URLs"""
@@ -86,12 +88,11 @@ def process_html_file(file_path, new_path=None, depth=0):
         content = file.read()
     
     # Update the content
-    updated_content = update_html_content(content, depth)
+    updated_content = relink_page(content, depth, update_html_content)
     
     # Save to new location
     target_path = new_path if new_path else file_path
-    with open(target_path, 'w', encoding='utf-8') as file:
-        file.write(updated_content)
+    write_if_changed(target_path, updated_content)
     
     print(f"Processed {file_path} -> {target_path}")
 
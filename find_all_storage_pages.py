@@ -2,22 +2,10 @@ import os
 import re
 import json
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
-def find_all_storage_pages():
-    """
-    Explicitly analyze the website directory structure and create a comprehensive
-    list of all region and city pages for better search functionality.
-    """
-    print("Starting to analyze website directory structure...")
-    
-    # Path to the website directory
-    website_dir = 'website'
-    
-    # Ensure the website directory exists
-    if not os.path.exists(website_dir):
-        print(f"Error: Website directory not found at {website_dir}")
-        return
-    
+def collect_storage_pages(website_dir, verbose=False):
+    """Return the lists of region and city pages found in the website directory."""
     # Lists to store region and city paths
     regions = []
     cities = []
@@ -38,7 +26,8 @@ def find_all_storage_pages():
                     'name': region_name,
                     'path': region_path
                 })
-                print(f"Found region: {region_name} - {region_path}")
+                if verbose:
+                    print(f"Found region: {region_name} - {region_path}")
                 
                 # Look for cities within this region
                 for city_item in os.listdir(item_path):
@@ -57,7 +46,27 @@ def find_all_storage_pages():
                                 'path': full_city_path,
                                 'region': region_name
                             })
-                            print(f"Found city: {city_name} in {region_name} - {full_city_path}")
+                            if verbose:
+                                print(f"Found city: {city_name} in {region_name} - {full_city_path}")
+    
+    return regions, cities
+
+def find_all_storage_pages():
+    """
+    Explicitly analyze the website directory structure and create a comprehensive
+    list of all region and city pages for better search functionality.
+    """
+    print("Starting to analyze website directory structure...")
+    
+    # Path to the website directory
+    website_dir = 'website'
+    
+    # Ensure the website directory exists
+    if not os.path.exists(website_dir):
+        print(f"Error: Website directory not found at {website_dir}")
+        return
+    
+    regions, cities = collect_storage_pages(website_dir, verbose=True)
     
     print(f"Analysis complete. Found {len(regions)} regions and {len(cities)} cities.")
     
@@ -230,17 +239,14 @@ def find_all_storage_pages():
     
     # Save the modified homepage
     try:
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(homepage_path, str(soup))
         print(f"Successfully updated the search functionality on the homepage")
     except Exception as e:
         print(f"Error saving homepage: {e}")
     
     # Update the search.js file for the regions page
     try:
-        os.makedirs(os.path.join(website_dir, 'js'), exist_ok=True)
-        with open(os.path.join(website_dir, 'js', 'search.js'), 'w', encoding='utf-8') as f:
-            f.write("""
+        write_if_changed(os.path.join(website_dir, 'js', 'search.js'), """
             document.addEventListener('DOMContentLoaded', function() {
                 // Check if there's a search parameter in the URL
                 const urlParams = new URLSearchParams(window.location.search);
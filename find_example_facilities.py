@@ -1,15 +1,11 @@
 import os
 from bs4 import BeautifulSoup
 import re
+from placeholder_scanner import EXAMPLE_FACILITY_SCANNER
 
 def find_placeholder_facilities():
     """Find city pages that contain example/placeholder storage facilities."""
     placeholder_cities = []
-    placeholder_patterns = [
-        "example.com", "example.org", "123-456-7890", "987-654-3210",
-        "abc storage", "xyz storage", "123 main st", "456 oak ave"
-    ]
-    
     for root, dirs, files in os.walk("website"):
         for file in files:
             if file == "index.html" and "selfstorage" in root and "selfstorageregions" not in root:
@@ -20,22 +16,17 @@ def find_placeholder_facilities():
                     
                     try:
                         with open(filepath, 'r', encoding='utf-8') as f:
-                            content = f.read().lower()  # Convert to lowercase for case-insensitive matching
-                        
-                        has_placeholder = False
-                        for pattern in placeholder_patterns:
-                            if pattern in content:
-                                has_placeholder = True
-                                break
+                            content = f.read()
                         
-                        if has_placeholder:
+                        hit = EXAMPLE_FACILITY_SCANNER.search(content)
+                        if hit:
                             city_path = root
                             region_path = os.path.dirname(city_path)
                             region_name = os.path.basename(region_path).replace('selfstorage', '')
                             city_name = os.path.basename(city_path).replace('selfstorage', '')
                             
                             placeholder_cities.append((region_name, city_name, filepath))
-                            print(f"Found placeholder in {region_name}/{city_name}")
+                            print(f"Found placeholder in {region_name}/{city_name} ('{hit[2]}' at offset {hit[1]})")
                     
                     except Exception as e:
                         print(f"Error checking {filepath}: {e}")
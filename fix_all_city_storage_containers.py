@@ -3,6 +3,7 @@ import re
 from bs4 import BeautifulSoup
 import time
 from concurrent.futures import ThreadPoolExecutor
+from site_writer import write_if_changed
 
 def find_city_pages():
     """Find all city pages that might need storage-list containers."""
@@ -176,8 +177,7 @@ def add_storage_list(filepath):
         # Add the storage-list to the main content
         main_content.append(storage_list)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(filepath, str(soup))
         
         return True
     
@@ -1,5 +1,6 @@
 import os
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def fix_bedford_duplicate():
     # Path to the Bedford page
@@ -35,8 +36,7 @@ def fix_bedford_duplicate():
             section.decompose()
         
         # Save the modified content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(file_path, str(soup))
         
         print("Successfully removed duplicate 'About Storage in Bedford' sections")
     else:
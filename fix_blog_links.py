@@ -1,6 +1,7 @@
 import os
 import re
 from pathlib import Path
+from site_writer import write_if_changed
 
 def fix_blog_links():
     """
@@ -44,8 +45,7 @@ def fix_blog_links():
                         new_content = new_content.replace(nav_match.group(0), replacement)
                     
                     # Write the modified content back to the file
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
+                    write_if_changed(file_path, new_content)
                     fixed_pages += 1
     
     print(f"Fixed blog links on {fixed_pages} pages")
@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 import os
 import re
 import shutil
+from site_writer import write_if_changed
 
 def normalize_name(name):
     """Normalize a name by converting to lowercase, removing special characters, and replacing spaces with hyphens."""
@@ -254,8 +255,7 @@ def update_bradford():
         storage_list.append(card)
     
     # Update the Bradford HTML file
-    with open(bradford_html_path, 'w', encoding='utf-8') as f:
-        f.write(str(soup))
+    write_if_changed(bradford_html_path, str(soup))
     
     print(f"Successfully updated Bradford page with {len(bradford_facilities)} facilities")
     
@@ -285,8 +285,7 @@ def update_bradford():
             break
     
     # Save the region page
-    with open(region_html, 'w', encoding='utf-8') as f:
-        f.write(str(region_soup))
+    write_if_changed(region_html, str(region_soup))
 
 if __name__ == "__main__":
     update_bradford() 
\ No newline at end of file
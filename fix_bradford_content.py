@@ -1,5 +1,6 @@
 import os
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def fix_bradford_content():
     """Fix remaining issues in Bradford page content."""
@@ -30,8 +31,7 @@ def fix_bradford_content():
             span.string = 'Bradford'
     
     # Save the updated file
-    with open(bradford_html_path, 'w', encoding='utf-8') as f:
-        f.write(str(soup))
+    write_if_changed(bradford_html_path, str(soup))
     
     print("Successfully fixed remaining Leeds references in Bradford page")
 
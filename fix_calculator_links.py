@@ -1,5 +1,6 @@
 import os
 import re
+from site_writer import write_if_changed
 
 def fix_calculator_links():
     """
@@ -77,8 +78,7 @@ def fix_calculator_links():
                 
                 # Write the updated content back to the file if modified
                 if modified:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    write_if_changed(file_path, content)
     
     print(f"Fixed calculator links on {fixed_links} pages")
     print(f"Removed duplicate calculator links on {removed_duplicates} pages")
@@ -3,6 +3,8 @@ import re
 from bs4 import BeautifulSoup
 import time
 from concurrent.futures import ThreadPoolExecutor
+from site_writer import write_if_changed
+from site_aggregates import load_aggregates, city_facility_count
 
 def find_region_pages():
     """Find all region index.html files in the website directory."""
@@ -28,8 +30,20 @@ def clean_name(name):
     
     return name
 
-def get_facility_count(city_path):
-    """Get the number of storage facilities on a city page."""
+def get_facility_count(city_path, aggregates=None):
+    """Get the number of storage facilities on a city page.
+    
+    The counts saved by the last build are used when available, so the
+    city page is only parsed for cities the build did not record or whose
+    page another script has changed since.
+    """
+    if aggregates:
+        region_slug = os.path.basename(os.path.dirname(city_path))[len('selfstorage'):]
+        city_slug = os.path.basename(city_path)[len('selfstorage'):]
+        count = city_facility_count(aggregates, region_slug, city_slug, os.path.dirname(os.path.dirname(city_path)))
+        if count is not None:
+            return count
+    
     try:
         city_index = os.path.join(city_path, "index.html")
         if not os.path.exists(city_index):
@@ -51,7 +65,7 @@ def get_facility_count(city_path):
         print(f"Error counting facilities in {city_path}: {str(e)}")
         return 0
 
-def fix_city_counts(region_file):
+def fix_city_counts(region_file, aggregates=None):
     """Fix the storage facility counts in city boxes on a region page."""
     try:
         with open(region_file, 'r', encoding='utf-8') as f:
@@ -92,7 +106,7 @@ def fix_city_counts(region_file):
                 continue
             
             # Get the actual facility count
-            actual_count = get_facility_count(city_dir)
+            actual_count = get_facility_count(city_dir, aggregates)
             
             if actual_count == 0:
                 # If no facilities found, default to 2-3 facilities
@@ -118,8 +132,7 @@ def fix_city_counts(region_file):
         
         if updates_made > 0:
             # Write the updated HTML back to the file
-            with open(region_file, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
+            write_if_changed(region_file, str(soup))
             
             return updates_made
         
@@ -138,9 +151,10 @@ def main():
     
     total_updates = 0
     error_count = 0
+    aggregates = load_aggregates()
     
     with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_file = {executor.submit(fix_city_counts, file): file for file in region_files}
+        future_to_file = {executor.submit(fix_city_counts, file, aggregates): file for file in region_files}
         
         for future in future_to_file:
             file = future_to_file[future]
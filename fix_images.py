@@ -1,4 +1,5 @@
 import os
+from site_writer import write_if_changed
 
 def create_simple_placeholder():
     """Create simple binary placeholder images for the website"""
@@ -21,16 +22,14 @@ def create_simple_placeholder():
     
     # Create main placeholder
     placeholder_path = 'website/assets/images/placeholder.jpg'
-    with open(placeholder_path, 'wb') as f:
-        f.write(minimal_gif)
+    write_if_changed(placeholder_path, minimal_gif)
     print(f"Created valid placeholder image at {placeholder_path}")
     
     # Create region-specific placeholders
     regions = ['devon', 'greater-manchester', 'west-yorkshire', 'north-yorkshire', 'lincolnshire', 'kent']
     for region in regions:
         region_path = f'website/assets/images/regions/{region}.jpg'
-        with open(region_path, 'wb') as f:
-            f.write(minimal_gif)
+        write_if_changed(region_path, minimal_gif)
         print(f"Created placeholder image for {region}")
     
     # Remove the HTML placeholder generator as it's no longer needed
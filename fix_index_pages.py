@@ -4,6 +4,7 @@ from bs4 import BeautifulSoup
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor
+from site_writer import write_if_changed
 
 def find_index_pages():
     """Find all index.html files at the region level"""
@@ -164,8 +165,7 @@ def update_main_homepage(filepath):
         main_content.append(features)
     
     # Write the updated content back to the file
-    with open(filepath, "w", encoding="utf-8") as file:
-        file.write(str(soup))
+    write_if_changed(filepath, str(soup))
     
     return True
 
@@ -292,8 +292,7 @@ def update_region_page(filepath):
         main_content.append(info_section)
     
     # Write the updated content back to the file
-    with open(filepath, "w", encoding="utf-8") as file:
-        file.write(str(soup))
+    write_if_changed(filepath, str(soup))
     
     return True
 
@@ -3,6 +3,7 @@ import os
 import re
 from bs4 import BeautifulSoup
 import random
+from site_writer import write_if_changed
 
 # This script handles specific cities that have path issues
 CITY_PATH_MAPPINGS = {
@@ -190,8 +191,7 @@ def update_specific_city_page(file_path, city, facilities_data):
             storage_list.append(card)
         
         # Save the updated file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(file_path, str(soup))
         
         print(f"Updated {file_path} with {facility_count} facilities")
         return True
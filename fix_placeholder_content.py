@@ -3,13 +3,9 @@ import re
 from bs4 import BeautifulSoup
 import time
 from concurrent.futures import ThreadPoolExecutor
-
-# Placeholder patterns that need to be removed or replaced
-PLACEHOLDER_PATTERNS = [
-    "example.com", "example.org", "123-456-7890", "987-654-3210",
-    "abc storage", "xyz storage", "123 main st", "456 oak ave",
-    "lorem ipsum", "placeholder", "coming soon"
-]
+from placeholder_scanner import PLACEHOLDER_PATTERNS, PLACEHOLDER_SCANNER
+from build_profiler import PROFILER, enable_from_env
+from site_writer import write_if_changed
 
 def find_files_with_placeholders():
     """Find all HTML files that contain placeholder content."""
@@ -29,17 +25,14 @@ def has_placeholder_content(filepath):
     """Check if a file has placeholder content."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read().lower()
-            
-        for pattern in PLACEHOLDER_PATTERNS:
-            if pattern in content:
-                return True
+            content = f.read()
         
-        return False
+        return PLACEHOLDER_SCANNER.contains(content)
     except Exception as e:
         print(f"Error checking {filepath}: {str(e)}")
         return False
 
+@PROFILER.page_function
 def fix_storage_list(filepath):
     """Make sure city pages have proper storage-list containers."""
     try:
@@ -156,8 +149,7 @@ def fix_storage_list(filepath):
                 
                 storage_list.append(storage_grid)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(filepath, str(soup))
         
         return True
     
@@ -165,26 +157,15 @@ def fix_storage_list(filepath):
         print(f"Error fixing storage list in {filepath}: {str(e)}")
         return False
 
+@PROFILER.page_function
 def fix_placeholder_content(filepath):
     """Fix placeholder content in an HTML file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Use BeautifulSoup to parse the content
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Convert soup object back to string for pattern searching
-        content_str = str(soup).lower()
-        
         # Check if any placeholders are still in the content
-        has_placeholders = False
-        for pattern in PLACEHOLDER_PATTERNS:
-            if pattern in content_str:
-                has_placeholders = True
-                break
-        
-        if has_placeholders:
+        if PLACEHOLDER_SCANNER.contains(content):
             # Also fix storage-list while we're at it
             fix_storage_list(filepath)
             
@@ -192,8 +173,14 @@ def fix_placeholder_content(filepath):
             with open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
             
+            # Only replace the patterns that actually occur in the page
+            found_patterns = {pattern for pattern, _, _ in PLACEHOLDER_SCANNER.scan(content)}
+            
             # Replace any remaining placeholder patterns with appropriate content
             for pattern in PLACEHOLDER_PATTERNS:
+                if pattern not in found_patterns:
+                    continue
+                
                 # Create replacements based on the pattern
                 if pattern == "example.com":
                     content = content.replace(pattern, "storagecompany.co.uk")
@@ -229,8 +216,7 @@ def fix_placeholder_content(filepath):
                     content = content.replace("Coming Soon", "Available Now")
             
             # Write the updated content back to the file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            write_if_changed(filepath, content)
             
             return True
         
@@ -241,10 +227,13 @@ def fix_placeholder_content(filepath):
         return False
 
 def main():
+    # Set STORAGE_BUILD_TRACE=trace.json to record per-page timings
+    enable_from_env()
     start_time = time.time()
     
     print("Finding files with placeholder content...")
-    files_with_placeholders = find_files_with_placeholders()
+    with PROFILER.span("find_files"):
+        files_with_placeholders = find_files_with_placeholders()
     print(f"Found {len(files_with_placeholders)} files with placeholder content.")
     
     fixed_count = 0
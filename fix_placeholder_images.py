@@ -1,5 +1,6 @@
 import os
 import base64
+from site_writer import write_if_changed
 
 def fix_placeholder_image():
     """Create a valid placeholder image file using base64 encoding"""
@@ -17,8 +18,7 @@ def fix_placeholder_image():
     
     # Save as a real JPEG file
     placeholder_path = 'website/assets/images/placeholder.jpg'
-    with open(placeholder_path, 'wb') as f:
-        f.write(jpeg_data)
+    write_if_changed(placeholder_path, jpeg_data)
     
     print(f"Created valid placeholder image at {placeholder_path}")
     
@@ -27,8 +27,7 @@ def fix_placeholder_image():
     
     for region in regions:
         region_placeholder = f'website/assets/images/regions/{region}.jpg'
-        with open(region_placeholder, 'wb') as f:
-            f.write(jpeg_data)
+        write_if_changed(region_placeholder, jpeg_data)
         print(f"Created placeholder image for {region}")
     
     # Remove the HTML placeholder generator as it's no longer needed
@@ -54,8 +53,7 @@ def fix_homepage_image_paths():
     
     # Save the updated homepage if changes were made
     if updated_content != content:
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        write_if_changed(homepage_path, updated_content)
         print(f"Updated homepage with correct image paths")
     else:
         print(f"No changes needed to homepage image paths")
@@ -3,6 +3,8 @@ import re
 from bs4 import BeautifulSoup
 import time
 from concurrent.futures import ThreadPoolExecutor
+from site_writer import write_if_changed
+from site_aggregates import load_aggregates, region_counts
 
 def find_regions_page():
     """Find the regions index.html file."""
@@ -11,8 +13,18 @@ def find_regions_page():
         return regions_file
     return None
 
-def count_cities_in_region(region_dir):
-    """Count the number of cities in a region."""
+def count_cities_in_region(region_dir, aggregates=None):
+    """Count the number of cities in a region.
+    
+    The counts saved by the last build are used when available, so the
+    region folder is only listed for regions the build did not record or
+    whose cities changed since.
+    """
+    if aggregates:
+        counts = region_counts(aggregates, os.path.basename(region_dir)[len('selfstorage'):], os.path.dirname(region_dir))
+        if counts:
+            return counts[0]
+    
     try:
         # Count folders that start with 'selfstorage' (city folders)
         city_count = 0
@@ -47,6 +59,7 @@ def fix_region_city_counts(regions_file):
         
         soup = BeautifulSoup(content, 'html.parser')
         website_dir = os.path.join(os.getcwd(), "website")
+        aggregates = load_aggregates()
         
         # Find all region cards - the regions page is using city-card class
         region_cards = soup.find_all(class_="city-card")
@@ -86,7 +99,7 @@ def fix_region_city_counts(regions_file):
                 continue
             
             # Count the cities in the region
-            city_count = count_cities_in_region(region_path)
+            city_count = count_cities_in_region(region_path, aggregates)
             
             if city_count == 0:
                 print(f"Warning: No cities found in {region_name}")
@@ -107,8 +120,7 @@ def fix_region_city_counts(regions_file):
         
         if updates_made > 0:
             # Write the updated HTML back to the file
-            with open(regions_file, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
+            write_if_changed(regions_file, str(soup))
             
             return updates_made
         
@@ -2,6 +2,7 @@ import os
 import json
 import re
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def improve_region_search():
     """
@@ -252,8 +253,7 @@ def improve_region_search():
     
     # Save the modified homepage
     try:
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(homepage_path, str(soup))
         print(f"Successfully updated the search functionality on the homepage")
     except Exception as e:
         print(f"Error saving homepage: {e}")
@@ -1,9 +1,27 @@
 import os
 import pandas as pd
-import re
 import shutil
 from pathlib import Path
-import unicodedata
+from site_paths import clean_name, to_selfstorage_path
+from site_templates import render_page, render_city_page, render_region_page, render_regions_index, ensure_fragments
+from site_writer import write_if_changed
+from facility_record import Facility
+
+# Example facilities written to new city pages
+EXAMPLE_FACILITIES = [
+    Facility(
+        name='ABC Storage',
+        address='123 Main St, {city}, {region}',
+        phone='123-456-7890',
+        website='www.example.com'
+    ),
+    Facility(
+        name='XYZ Storage Solutions',
+        address='456 Oak Ave, {city}, {region}',
+        phone='987-654-3210',
+        website='www.example.org'
+    )
+]
 
 def create_basic_structure():
     """Create the basic website structure with necessary folders"""
@@ -21,41 +39,12 @@ def create_basic_structure():
         
         # Create index.html file
         index_path = os.path.join(folder_path, 'index.html')
-        with open(index_path, 'w') as f:
-            f.write(f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{folder.capitalize()} - Self Storage Near Me</title>
-    <link rel="stylesheet" href="../assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="logo">Storage Finder</div>
-        <nav>
-            <ul>
-                <li><a href="../index.html">Home</a></li>
-                <li><a href="../selfstorageregions/index.html">Regions</a></li>
-                <li><a href="../faq/index.html">FAQ</a></li>
-                <li><a href="../about/index.html">About</a></li>
-                <li><a href="../contact/index.html">Contact</a></li>
-            </ul>
-        </nav>
-    </header>
-    <main>
-        <h1>{folder.capitalize()} Page</h1>
-        <p>This is the {folder} page content.</p>
-    </main>
-    <footer>
-        <p>&copy; 2023 Self Storage Finder. All rights reserved.</p>
-        <ul>
-            <li><a href="../privacy/index.html">Privacy Policy</a></li>
-            <li><a href="../terms/index.html">Terms of Use</a></li>
-        </ul>
-    </footer>
-</body>
-</html>""")
+        content = f"""<div class="container">
+<h1>{folder.capitalize()} Page</h1>
+<p>This is the {folder} page content.</p>
+</div>
+"""
+        write_if_changed(index_path, render_page(f"{folder.capitalize()} - Self Storage Near Me", f"{folder.capitalize()} - Self Storage Near Me", content, depth=1))
     
     # Create assets directory and subdirectories
     assets_path = os.path.join(root_path, 'assets')
@@ -68,8 +57,7 @@ def create_basic_structure():
     
     # Create a basic CSS file
     css_file = os.path.join(css_path, 'style.css')
-    with open(css_file, 'w') as f:
-        f.write("""body {
+    write_if_changed(css_file, """body {
     font-family: Arial, sans-serif;
     margin: 0;
     padding: 0;
@@ -130,86 +118,36 @@ footer ul li a {
     
     # Create a basic homepage
     homepage_path = os.path.join(root_path, 'index.html')
-    with open(homepage_path, 'w') as f:
-        f.write("""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Self Storage Near Me | Find Local Storage Facilities</title>
-    <meta name="description" content="Find the best self storage facilities near you. Compare prices, amenities, and book online.">
-    <link rel="stylesheet" href="assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="logo">Storage Finder</div>
-        <nav>
-            <ul>
-                <li><a href="index.html">Home</a></li>
-                <li><a href="selfstorageregions/index.html">Regions</a></li>
-                <li><a href="faq/index.html">FAQ</a></li>
-                <li><a href="about/index.html">About</a></li>
-                <li><a href="contact/index.html">Contact</a></li>
-            </ul>
-        </nav>
-    </header>
-    <main>
-        <section class="hero">
-            <h1>Find Self Storage Near You</h1>
-            <p>Compare storage facilities and find the best deal for your needs.</p>
-            <form action="results.html" method="get">
-                <input type="text" name="location" placeholder="Enter your location">
-                <button type="submit">Search</button>
-            </form>
-        </section>
-        
-        <section class="popular-regions">
-            <h2>Popular Storage Regions</h2>
-            <div class="regions-grid">
-                <div class="region-card">
-                    <h3>Devon</h3>
-                    <p>23 cities, 45 facilities</p>
-                    <a href="selfstoragedevon/index.html" class="btn">View Region</a>
-                </div>
-                <!-- More region cards would go here -->
-            </div>
-        </section>
-    </main>
-    <footer>
-        <p>&copy; 2023 Self Storage Finder. All rights reserved.</p>
-        <ul>
-            <li><a href="privacy/index.html">Privacy Policy</a></li>
-            <li><a href="terms/index.html">Terms of Use</a></li>
-        </ul>
-    </footer>
-</body>
-</html>""")
+    content = """<div class="container">
+<section class="hero">
+<h1>Find Self Storage Near You</h1>
+<p>Compare storage facilities and find the best deal for your needs.</p>
+<form action="results.html" method="get">
+<input type="text" name="location" placeholder="Enter your location">
+<button type="submit">Search</button>
+</form>
+</section>
+<section class="popular-regions">
+<h2>Popular Storage Regions</h2>
+<div class="regions-grid">
+<div class="region-card">
+<h3>Devon</h3>
+<p>23 cities, 45 facilities</p>
+<a href="selfstoragedevon/index.html" class="btn">View Region</a>
+</div>
+</div>
+</section>
+</div>
+"""
+    write_if_changed(homepage_path, render_page(
+        "Self Storage Near Me | Find Local Storage Facilities",
+        "Find the best self storage facilities near you. Compare prices, amenities, and book online.",
+        content,
+        depth=0
+    ))
     
     print("Basic website structure created successfully!")
 
-def clean_text(text):
-    """Clean text by removing Unicode characters and trimming whitespace"""
-    # Convert to string if not already
-    text = str(text)
-    
-    # Normalize Unicode characters
-    text = unicodedata.normalize('NFKD', text)
-    
-    # Replace any remaining problematic characters with ordinary ASCII equivalents
-    text = re.sub(r'[^\x00-\x7F]+', '', text)
-    
-    # Remove any special characters like ‎ (left-to-right mark)
-    text = re.sub(r'[\u200e\u200f\u202a-\u202e]', '', text)
-    
-    # Remove common suffixes like "‎" that might appear in Excel data
-    text = re.sub(r'[,\s]+$', '', text)
-    
-    # Remove commas and any text after them (like "Sandy, Bedfordshire‎" → "Sandy")
-    if ',' in text:
-        text = text.split(',')[0].strip()
-    
-    return text.strip()
-
 def create_regions_from_excel():
     """Create region and city folders based on the Excel file data"""
     print("Creating regions and cities from Excel data...")
@@ -233,17 +171,17 @@ def create_regions_from_excel():
     
     for _, row in df.iterrows():
         # Use the correct column names from the Excel file and clean the text
-        region = clean_text(row['Region'])
-        city = clean_text(row['CITY'])
+        region = clean_name(row['Region'])
+        city = clean_name(row['CITY'])
         
         if not region or not city:
             continue  # Skip empty values
         
+        # Count facilities per city for the region page cards
         if region not in regions:
-            regions[region] = []
+            regions[region] = {}
         
-        if city not in regions[region]:
-            regions[region].append(city)
+        regions[region][city] = regions[region].get(city, 0) + 1
     
     print(f"Found {len(regions)} unique regions")
     
@@ -272,187 +210,33 @@ def create_regions_from_excel():
     # Create regions index page
     create_regions_index(root_path, regions)
     
-    print("Regions and cities created successfully!")
-
-def to_selfstorage_path(name):
-    """Convert a name to a valid folder name with selfstorage prefix"""
-    # Skip if already has prefix
-    if str(name).startswith('selfstorage'):
-        return str(name)
+    ensure_fragments(root_path)
     
-    # Convert name to lowercase with dashes
-    name = re.sub(r'[^a-zA-Z0-9]', '-', str(name)).lower()
-    return 'selfstorage' + name
+    print("Regions and cities created successfully!")
 
 def create_region_page(region_path, region_name, cities):
     """Create an index.html file for a region"""
     index_path = os.path.join(region_path, 'index.html')
     
-    with open(index_path, 'w') as f:
-        f.write(f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Self Storage in {region_name} | Find Local Storage Facilities</title>
-    <link rel="stylesheet" href="../assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="logo">Storage Finder</div>
-        <nav>
-            <ul>
-                <li><a href="../index.html">Home</a></li>
-                <li><a href="../selfstorageregions/index.html">Regions</a></li>
-                <li><a href="../faq/index.html">FAQ</a></li>
-                <li><a href="../about/index.html">About</a></li>
-                <li><a href="../contact/index.html">Contact</a></li>
-            </ul>
-        </nav>
-    </header>
-    <main>
-        <h1>Self Storage in {region_name}</h1>
-        <p>Find the best self storage facilities in {region_name}. We have {len(cities)} locations available.</p>
-        
-        <h2>Cities in {region_name}</h2>
-        <ul>
-""")
-        
-        # Add links to each city
-        for city in cities:
-            city_folder = to_selfstorage_path(city)
-            f.write(f'            <li><a href="{city_folder}/index.html">{city}</a></li>\n')
-        
-        f.write("""        </ul>
-    </main>
-    <footer>
-        <p>&copy; 2023 Self Storage Finder. All rights reserved.</p>
-        <ul>
-            <li><a href="../privacy/index.html">Privacy Policy</a></li>
-            <li><a href="../terms/index.html">Terms of Use</a></li>
-        </ul>
-    </footer>
-</body>
-</html>""")
+    write_if_changed(index_path, render_region_page(region_name, list(cities.items())))
 
 def create_city_page(city_path, region_name, city_name):
     """Create an index.html file for a city"""
     index_path = os.path.join(city_path, 'index.html')
-    region_folder = to_selfstorage_path(region_name)
     
-    with open(index_path, 'w') as f:
-        f.write(f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Self Storage in {city_name}, {region_name} | Find Local Facilities</title>
-    <link rel="stylesheet" href="../../assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="logo">Storage Finder</div>
-        <nav>
-            <ul>
-                <li><a href="../../index.html">Home</a></li>
-                <li><a href="../../selfstorageregions/index.html">Regions</a></li>
-                <li><a href="../../faq/index.html">FAQ</a></li>
-                <li><a href="../../about/index.html">About</a></li>
-                <li><a href="../../contact/index.html">Contact</a></li>
-            </ul>
-        </nav>
-    </header>
-    <main>
-        <h1>Self Storage in {city_name}, {region_name}</h1>
-        <p>Find the best self storage facilities in {city_name}, {region_name}.</p>
-        
-        <div class="breadcrumbs">
-            <a href="../../index.html">Home</a> &gt;
-            <a href="../../selfstorageregions/index.html">Regions</a> &gt;
-            <a href="../index.html">{region_name}</a> &gt;
-            <span>{city_name}</span>
-        </div>
-        
-        <h2>Storage Providers in {city_name}</h2>
-        <div class="provider-list">
-            <div class="provider">
-                <h3>ABC Storage</h3>
-                <p>123 Main St, {city_name}, {region_name}</p>
-                <p>Phone: 123-456-7890</p>
-                <p>Website: <a href="https://example.com">www.example.com</a></p>
-            </div>
-            <div class="provider">
-                <h3>XYZ Storage Solutions</h3>
-                <p>456 Oak Ave, {city_name}, {region_name}</p>
-                <p>Phone: 987-654-3210</p>
-                <p>Website: <a href="https://example.org">www.example.org</a></p>
-            </div>
-        </div>
-    </main>
-    <footer>
-        <p>&copy; 2023 Self Storage Finder. All rights reserved.</p>
-        <ul>
-            <li><a href="../../privacy/index.html">Privacy Policy</a></li>
-            <li><a href="../../terms/index.html">Terms of Use</a></li>
-        </ul>
-    </footer>
-</body>
-</html>""")
+    # Example facilities stand in until update_missing_cities.py fills in real data
+    facilities = [
+        facility.replace(address=facility.address.format(city=city_name, region=region_name), region=region_name, city=city_name)
+        for facility in EXAMPLE_FACILITIES
+    ]
+    
+    write_if_changed(index_path, render_city_page(region_name, city_name, facilities))
 
 def create_regions_index(root_path, regions):
     """Create the main regions index page"""
     regions_path = os.path.join(root_path, 'selfstorageregions', 'index.html')
     
-    with open(regions_path, 'w') as f:
-        f.write("""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Self Storage Regions | Find Local Storage Facilities</title>
-    <link rel="stylesheet" href="../assets/css/style.css">
-</head>
-<body>
-    <header>
-        <div class="logo">Storage Finder</div>
-        <nav>
-            <ul>
-                <li><a href="../index.html">Home</a></li>
-                <li><a href="../selfstorageregions/index.html">Regions</a></li>
-                <li><a href="../faq/index.html">FAQ</a></li>
-                <li><a href="../about/index.html">About</a></li>
-                <li><a href="../contact/index.html">Contact</a></li>
-            </ul>
-        </nav>
-    </header>
-    <main>
-        <h1>Self Storage Regions</h1>
-        <p>Browse self storage facilities by region.</p>
-        
-        <div class="regions-list">
-""")
-        
-        # Add links to each region
-        for region, cities in regions.items():
-            region_folder = to_selfstorage_path(region)
-            f.write(f"""            <div class="region-card">
-                <h2>{region}</h2>
-                <p>{len(cities)} cities available</p>
-                <a href="../{region_folder}/index.html" class="btn">View Region</a>
-            </div>
-""")
-        
-        f.write("""        </div>
-    </main>
-    <footer>
-        <p>&copy; 2023 Self Storage Finder. All rights reserved.</p>
-        <ul>
-            <li><a href="../privacy/index.html">Privacy Policy</a></li>
-            <li><a href="../terms/index.html">Terms of Use</a></li>
-        </ul>
-    </footer>
-</body>
-</html>""")
+    write_if_changed(regions_path, render_regions_index([(region, len(cities)) for region, cities in regions.items()]))
 
 def main():
     """Main function to execute the script"""
@@ -1,28 +1,18 @@
 import os
 import pandas as pd
-import zipfile
-import shutil
 from datetime import datetime
+from deploy_archive import build_archive
+from site_manifest import MANIFEST_PATH, update_manifest
 
 def generate_site():
     # ... existing code ...
     
-    # Create website.zip
-    with zipfile.ZipFile('website.zip', 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk('website'):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, 'website')
-                zipf.write(file_path, arcname)
-    
-    # Unzip website.zip into website/ folder
-    if os.path.exists('website'):
-        shutil.rmtree('website')  # Remove existing website folder if it exists
-    
-    with zipfile.ZipFile('website.zip', 'r') as zipf:
-        zipf.extractall('website')
+    # Create website.zip straight from the website/ folder. The folder is
+    # left in place, so there is no delete-and-extract round trip.
+    update_manifest('website')
+    build_archive('website', 'website.zip', MANIFEST_PATH)
     
     print("Site generation completed. Files are available in website.zip and website/ folder.")
 
 if __name__ == "__main__":
-    generate_site() 
\ No newline at end of file
+    generate_site()
\ No newline at end of file
@@ -3,6 +3,8 @@ import re
 from pathlib import Path
 from datetime import datetime
 import xml.dom.minidom as md
+from site_paths import INCLUDES_FOLDER
+from site_writer import write_if_changed
 
 def generate_sitemap():
     """Generate an XML sitemap for search engines by crawling through the website directory."""
@@ -50,7 +52,9 @@ def generate_sitemap():
             return "weekly"
     
     # Process all HTML files
-    for root_dir, _, files in os.walk(website_dir):
+    for root_dir, dirs, files in os.walk(website_dir):
+        # Header and footer fragments are not pages
+        dirs[:] = [d for d in dirs if d != INCLUDES_FOLDER]
         for file in files:
             if file.endswith(".html"):
                 # Get relative path
@@ -107,8 +111,7 @@ def generate_sitemap():
     # Clean up extra whitespace
     xml_str = re.sub(r'\n\s*\n', '\n', xml_str)
     
-    with open("website/sitemap.xml", "w", encoding="utf-8") as f:
-        f.write(xml_str)
+    write_if_changed("website/sitemap.xml", xml_str)
     
     print(f"XML sitemap generated with {len(processed_urls)} URLs")
     print("Sitemap saved to: website/sitemap.xml")
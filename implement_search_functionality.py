@@ -1,6 +1,7 @@
 import os
 import re
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def implement_search_functionality():
     """
@@ -175,8 +176,7 @@ def implement_search_functionality():
     # Create the JavaScript file for the regions page
     try:
         os.makedirs('website/js', exist_ok=True)
-        with open('website/js/search.js', 'w', encoding='utf-8') as f:
-            f.write(regions_script)
+        write_if_changed('website/js/search.js', regions_script)
         print("Created search.js file for regions page")
     except Exception as e:
         print(f"Error creating search.js file: {e}")
@@ -195,8 +195,7 @@ def implement_search_functionality():
             regions_script_tag = regions_soup.new_tag('script', attrs={'src': '../js/search.js'})
             regions_soup.body.append(regions_script_tag)
             
-            with open(regions_page_path, 'w', encoding='utf-8') as f:
-                f.write(str(regions_soup))
+            write_if_changed(regions_page_path, str(regions_soup))
             
             print(f"Updated regions page with search script")
         except Exception as e:
@@ -206,8 +205,7 @@ def implement_search_functionality():
     
     # Save the modified homepage
     try:
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(homepage_path, str(soup))
         print(f"Successfully implemented search functionality on the homepage")
     except Exception as e:
         print(f"Error saving homepage: {e}")
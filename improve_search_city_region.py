@@ -2,6 +2,7 @@ import os
 import re
 import glob
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def improve_search_city_region():
     """
@@ -181,17 +182,14 @@ def improve_search_city_region():
     
     # Save the modified homepage
     try:
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(homepage_path, str(soup))
         print(f"Successfully updated the search functionality on the homepage")
     except Exception as e:
         print(f"Error saving homepage: {e}")
     
     # Update the search.js file for the regions page
     try:
-        os.makedirs('website/js', exist_ok=True)
-        with open('website/js/search.js', 'w', encoding='utf-8') as f:
-            f.write("""
+        write_if_changed('website/js/search.js', """
             document.addEventListener('DOMContentLoaded', function() {
                 // Check if there's a search parameter in the URL
                 const urlParams = new URLSearchParams(window.location.search);
@@ -0,0 +1,250 @@
+import os
+import gzip
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+import multiprocessing
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# File types worth compressing ahead of time
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.xml', '.txt', '.json', '.svg')
+
+# Default share of traffic for each kind of page
+DEFAULT_MIX = {
+    "homepage": 10,
+    "regions": 10,
+    "region": 20,
+    "city": 50,
+    "asset": 10
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the generated website with a local static server")
+    parser.add_argument("--dir", default="website", help="Website directory to serve")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=5000, help="Total number of requests per run")
+    parser.add_argument("--mode", choices=["plain", "precompressed", "both"], default="both", help="Serve files as-is, precompressed, or run both")
+    parser.add_argument("--mix", help="Request mix as JSON, e.g. '{\"city\": 70, \"region\": 30}'")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request mix")
+    parser.add_argument("--output", help="Path to save the results JSON")
+    return parser.parse_args()
+
+class StaticSiteHandler(SimpleHTTPRequestHandler):
+    """Static file handler that can serve gzip bodies from an in-memory cache."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, precompressed=None, **kwargs):
+        self.precompressed = precompressed
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.precompressed and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            url_path = self.path.split('?', 1)[0].split('#', 1)[0]
+            if url_path.endswith('/'):
+                url_path += 'index.html'
+            body = self.precompressed.get(url_path)
+            if body is not None:
+                self.send_response(200)
+                self.send_header("Content-Type", self.guess_type(url_path))
+                self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+def precompress_site(website_dir):
+    """Gzip every compressible file, reusing .gz siblings that already exist."""
+    compressed = {}
+    for root, dirs, files in os.walk(website_dir):
+        for file in files:
+            if not file.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+
+            file_path = os.path.join(root, file)
+            url_path = '/' + os.path.relpath(file_path, website_dir).replace(os.sep, '/')
+
+            if os.path.exists(file_path + '.gz'):
+                with open(file_path + '.gz', 'rb') as f:
+                    compressed[url_path] = f.read()
+            else:
+                with open(file_path, 'rb') as f:
+                    compressed[url_path] = gzip.compress(f.read(), compresslevel=9)
+    return compressed
+
+def run_server(website_dir, precompressed, port_queue):
+    """Serve the website until the process is terminated."""
+    cache = precompress_site(website_dir) if precompressed else None
+    handler = partial(StaticSiteHandler, directory=website_dir, precompressed=cache)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def collect_urls(website_dir):
+    """Group the site's URLs by the kind of page they are."""
+    urls = {kind: [] for kind in DEFAULT_MIX}
+
+    for root, dirs, files in os.walk(website_dir):
+        for file in files:
+            rel_path = os.path.relpath(os.path.join(root, file), website_dir).replace(os.sep, '/')
+            parts = rel_path.split('/')
+
+            if rel_path == 'index.html':
+                urls["homepage"].append('/' + rel_path)
+            elif rel_path == 'selfstorageregions/index.html':
+                urls["regions"].append('/' + rel_path)
+            elif parts[0].startswith('selfstorage') and file == 'index.html' and len(parts) == 2:
+                urls["region"].append('/' + rel_path)
+            elif parts[0].startswith('selfstorage') and file == 'index.html' and len(parts) == 3:
+                urls["city"].append('/' + rel_path)
+            elif parts[0] == 'assets' or parts[0] == 'js':
+                if not file.endswith('.gz') and not file.endswith('.br'):
+                    urls["asset"].append('/' + rel_path)
+
+    return urls
+
+def build_request_plan(urls, mix, total, seed):
+    """Return a shuffled list of URLs matching the requested traffic mix."""
+    rng = random.Random(seed)
+    kinds = [kind for kind in mix if urls.get(kind) and mix[kind] > 0]
+    weights = [mix[kind] for kind in kinds]
+    return [rng.choice(urls[kind]) for kind in rng.choices(kinds, weights=weights, k=total)]
+
+def run_client(port, plan, results, lock):
+    """Replay requests from the shared plan over one keep-alive connection."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies = []
+    bytes_received = 0
+    errors = 0
+
+    while True:
+        with lock:
+            if not plan:
+                break
+            url = plan.pop()
+
+        start = time.perf_counter()
+        try:
+            conn.request("GET", url, headers={"Accept-Encoding": "gzip"})
+            response = conn.getresponse()
+            body = response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+        bytes_received += len(body)
+
+    conn.close()
+    with lock:
+        results["latencies"].extend(latencies)
+        results["bytes"] += bytes_received
+        results["errors"] += errors
+
+def percentile(sorted_values, pct):
+    """Return the pct percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_load_test(website_dir, plan, concurrency, precompressed):
+    """Start a server, replay the plan against it and return the measurements."""
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=run_server, args=(website_dir, precompressed, port_queue), daemon=True)
+    server.start()
+    port = port_queue.get(timeout=120)
+
+    results = {"latencies": [], "bytes": 0, "errors": 0}
+    lock = threading.Lock()
+    pending = list(plan)
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=run_client, args=(port, pending, results, lock)) for _ in range(concurrency)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    server.terminate()
+    server.join()
+
+    latencies = sorted(results["latencies"])
+    return {
+        "mode": "precompressed" if precompressed else "plain",
+        "requests": len(latencies),
+        "errors": results["errors"],
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "bytes_transferred": results["bytes"],
+        "megabytes_per_second": round(results["bytes"] / elapsed / 1024 / 1024, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p90": round(percentile(latencies, 90) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0
+        }
+    }
+
+def print_result(result):
+    latency = result["latency_ms"]
+    print(f"\n{result['mode'].title()} assets:")
+    print(f"- Requests: {result['requests']} ({result['errors']} errors)")
+    print(f"- Throughput: {result['requests_per_second']} req/s, {result['megabytes_per_second']} MB/s")
+    print(f"- Bytes transferred: {result['bytes_transferred']:,}")
+    print(f"- Latency: p50 {latency['p50']} ms, p90 {latency['p90']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, max {latency['max']} ms")
+
+def main():
+    args = parse_args()
+
+    if not os.path.exists(args.dir):
+        print(f"Website directory not found: {args.dir}")
+        return
+
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix = json.loads(args.mix)
+
+    urls = collect_urls(args.dir)
+    print("URLs found: " + ", ".join(f"{kind} {len(paths)}" for kind, paths in urls.items()))
+
+    plan = build_request_plan(urls, mix, args.requests, args.seed)
+    modes = [False, True] if args.mode == "both" else [args.mode == "precompressed"]
+
+    results = []
+    for precompressed in modes:
+        result = run_load_test(args.dir, plan, args.concurrency, precompressed)
+        print_result(result)
+        results.append(result)
+
+    if len(results) == 2 and results[0]["bytes_transferred"]:
+        saving = 1 - results[1]["bytes_transferred"] / results[0]["bytes_transferred"]
+        print(f"\nPrecompression saves {saving:.1%} of bytes transferred")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "concurrency": args.concurrency,
+                "mix": mix,
+                "results": results
+            }, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 import os
 from bs4 import BeautifulSoup
 import re
+from build_profiler import PROFILER, enable_from_env
+from site_writer import write_if_changed
+from page_index import load_page_index
 
+@PROFILER.page_function
 def make_links_nofollow(file_path):
     """Make website links nofollow and non-clickable in a single HTML file."""
     # Check if file exists
@@ -13,7 +17,8 @@ def make_links_nofollow(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    soup = BeautifulSoup(content, 'html.parser')
+    with PROFILER.span("parse"):
+        soup = BeautifulSoup(content, 'html.parser')
     
     # Find all website links (but not email or phone links)
     links = soup.find_all('a')
@@ -40,8 +45,9 @@ def make_links_nofollow(file_path):
     
     if modified:
         # Save the modified content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        with PROFILER.span("serialize"):
+            html = str(soup)
+        write_if_changed(file_path, html)
         return True
     
     return False
@@ -50,17 +56,18 @@ def process_directory(directory_path):
     """Process all HTML files in a directory and its subdirectories."""
     count = 0
     
-    for root, dirs, files in os.walk(directory_path):
-        for file in files:
-            if file.endswith('.html'):
-                file_path = os.path.join(root, file)
-                if make_links_nofollow(file_path):
-                    count += 1
-                    print(f"Updated links in {file_path}")
+    # Only pages the index says have external links can need a change
+    for file_path in load_page_index(directory_path).pages_with('external_links'):
+        if make_links_nofollow(file_path):
+            count += 1
+            print(f"Updated links in {file_path}")
     
     return count
 
 if __name__ == "__main__":
+    # Set STORAGE_BUILD_TRACE=trace.json to record per-page timings
+    enable_from_env()
+    
     # Process the entire website directory
     website_dir = 'website'
     
@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+
+# Feature index of every page, saved next to the website folder so it is never deployed
+INDEX_PATH = 'website_page_index.json'
+
+# Bump when FEATURES changes so old indexes are rescanned
+INDEX_VERSION = 1
+
+# Cheap byte-level tests for what each mutation script looks for. Each test
+# is a superset of its script's own check, so skipping unmatched pages is safe.
+FEATURES = {
+    "external_links": re.compile(rb'(?i)href\s*=\s*["\']?https?://'),
+    "tel_links": re.compile(rb'(?i)href\s*=\s*["\']?tel:'),
+    "mailto_links": re.compile(rb'(?i)href\s*=\s*["\']?mailto:'),
+    "phone_label": re.compile(rb'<strong[^>]*>Phone: </strong>'),
+    "favicon": re.compile(rb'rel="icon"'),
+    "calculator_link": re.compile(rb'(?i)href\s*=\s*["\']?[^"\'>]*calculator(?:/index)?\.html'),
+}
+
+# Features recorded as the values found rather than as present or absent
+VALUE_FEATURES = {
+    "copyright_year": re.compile(rb'(?:\xc2\xa9|&copy;)\s*(\d{4})'),
+    "search_script": re.compile(rb'<script[^>]*src=["\']([^"\']*search\.js[^"\']*)["\']'),
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Index which pages contain links, favicons and other features")
+    parser.add_argument("--dir", default="website", help="Website directory to index")
+    parser.add_argument("--index", default=INDEX_PATH, help="Path of the index JSON")
+    parser.add_argument("--with", dest="with_feature", help="List pages that have this feature")
+    parser.add_argument("--without", help="List pages that lack this feature")
+    return parser.parse_args()
+
+def scan_features(content):
+    """Return the feature record of one page's bytes."""
+    features = {name: bool(pattern.search(content)) for name, pattern in FEATURES.items()}
+    for name, pattern in VALUE_FEATURES.items():
+        features[name] = sorted({match.decode('utf-8', 'replace') for match in pattern.findall(content)})
+    return features
+
+class PageIndex:
+    """Per-page feature flags, kept up to date incrementally.
+
+    A page is re-read only when its size or mtime changed since the last
+    refresh, and rescanned only when its content hash changed too. Mutation
+    scripts query the index and open only the pages that can need a change.
+    """
+
+    def __init__(self, website_dir='website', path=INDEX_PATH):
+        self.website_dir = website_dir
+        self.path = path
+        self.pages = {}
+        self.scanned = 0
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get("version") == INDEX_VERSION and saved.get("website_dir") == website_dir:
+                self.pages = saved["pages"]
+
+    def refresh(self):
+        """Bring the index in line with the pages on disk. Returns the number rescanned."""
+        pages = {}
+        self.scanned = 0
+        for root, dirs, files in os.walk(self.website_dir):
+            for file in files:
+                if not file.endswith('.html'):
+                    continue
+                full_path = os.path.join(root, file)
+                rel_path = os.path.relpath(full_path, self.website_dir).replace(os.sep, '/')
+                stat = os.stat(full_path)
+
+                entry = self.pages.get(rel_path)
+                if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    pages[rel_path] = entry
+                    continue
+
+                with open(full_path, 'rb') as f:
+                    content = f.read()
+                digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+                if entry and entry["hash"] == digest:
+                    features = entry["features"]
+                else:
+                    features = scan_features(content)
+                    self.scanned += 1
+                pages[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest, "features": features}
+
+        self.pages = dict(sorted(pages.items()))
+        return self.scanned
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "website_dir": self.website_dir, "pages": self.pages}, f)
+
+    def file_path(self, rel_path):
+        return os.path.join(self.website_dir, *rel_path.split('/'))
+
+    def pages_where(self, feature, predicate):
+        """Return the file paths of pages whose feature value passes predicate."""
+        return [self.file_path(rel_path) for rel_path, entry in self.pages.items() if predicate(entry["features"][feature])]
+
+    def pages_with(self, feature):
+        return self.pages_where(feature, bool)
+
+    def pages_without(self, feature):
+        return self.pages_where(feature, lambda value: not value)
+
+def load_page_index(website_dir='website', path=INDEX_PATH):
+    """Return the refreshed and saved feature index of a website folder."""
+    index = PageIndex(website_dir, path)
+    index.refresh()
+    index.save()
+    return index
+
+def main():
+    args = parse_args()
+    start_time = time.time()
+
+    index = PageIndex(args.dir, args.index)
+    scanned = index.refresh()
+    index.save()
+
+    if args.with_feature:
+        for path in index.pages_with(args.with_feature):
+            print(path)
+    if args.without:
+        for path in index.pages_without(args.without):
+            print(path)
+
+    elapsed_time = time.time() - start_time
+    print("Page index summary:")
+    print(f"- Pages indexed: {len(index.pages)} ({scanned} rescanned)")
+    for feature in FEATURES:
+        print(f"- With {feature}: {len(index.pages_with(feature))}")
+    print(f"- Index saved to: {args.index}")
+    print(f"- Time taken: {elapsed_time:.2f} seconds")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import os
+import re
+import argparse
+
+# Placeholder text left behind by the early generators and fix-up scripts
+PLACEHOLDER_PATTERNS = [
+    "example.com", "example.org", "123-456-7890", "987-654-3210",
+    "abc storage", "xyz storage", "123 main st", "456 oak ave",
+    "lorem ipsum", "placeholder", "coming soon"
+]
+
+# Example facilities written by fix_structure.create_city_page
+EXAMPLE_FACILITY_PATTERNS = [
+    "example.com", "example.org", "123-456-7890", "987-654-3210",
+    "abc storage", "xyz storage", "123 main st", "456 oak ave"
+]
+
+# Regular expressions used by verify_website_structure.py
+VERIFY_PATTERNS = [
+    r'example storage', r'sample facility', r'placeholder',
+    r'john doe', r'jane smith', r'test storage',
+    r'demo storage', r'123-?456-?7890', r'www\.example\.com'
+]
+
+class PlaceholderScanner:
+    """Find placeholder patterns in a document with a single precompiled regex.
+
+    All patterns are compiled into one case-insensitive alternation with a
+    named group per pattern, so each document is scanned once no matter how
+    many patterns there are.
+    """
+
+    def __init__(self, patterns, literal=True):
+        self.patterns = list(patterns)
+        alternatives = []
+        for i, pattern in enumerate(self.patterns):
+            body = re.escape(pattern) if literal else pattern
+            alternatives.append(f"(?P<p{i}>{body})")
+        self.regex = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def scan(self, content):
+        """Return every hit as a (pattern, offset, matched text) tuple."""
+        hits = []
+        for match in self.regex.finditer(content):
+            pattern = self.patterns[int(match.lastgroup[1:])]
+            hits.append((pattern, match.start(), match.group()))
+        return hits
+
+    def search(self, content):
+        """Return the first hit in the document, or None."""
+        match = self.regex.search(content)
+        if not match:
+            return None
+        pattern = self.patterns[int(match.lastgroup[1:])]
+        return pattern, match.start(), match.group()
+
+    def contains(self, content):
+        """Check whether the document contains any of the patterns."""
+        return self.regex.search(content) is not None
+
+PLACEHOLDER_SCANNER = PlaceholderScanner(PLACEHOLDER_PATTERNS)
+EXAMPLE_FACILITY_SCANNER = PlaceholderScanner(EXAMPLE_FACILITY_PATTERNS)
+VERIFY_SCANNER = PlaceholderScanner(VERIFY_PATTERNS, literal=False)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report placeholder content in the generated website")
+    parser.add_argument("--dir", default="website", help="Website directory to scan")
+    parser.add_argument("--examples-only", action="store_true", help="Only look for the example facilities")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    scanner = EXAMPLE_FACILITY_SCANNER if args.examples_only else PLACEHOLDER_SCANNER
+
+    file_count = 0
+    hit_count = 0
+
+    for root, dirs, files in os.walk(args.dir):
+        for file in files:
+            if not file.endswith('.html'):
+                continue
+
+            filepath = os.path.join(root, file)
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+
+            hits = scanner.scan(content)
+            if hits:
+                file_count += 1
+                hit_count += len(hits)
+                print(filepath)
+                for pattern, offset, text in hits:
+                    print(f"  {offset}: {text} ({pattern})")
+
+    print(f"\nFound {hit_count} placeholder hits in {file_count} files")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import os
 import re
+from site_writer import write_if_changed
 
 def remove_ontoplist_badge(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -14,8 +15,7 @@ def remove_ontoplist_badge(file_path):
     pattern = r'\s*<div class="ontoplist-badge"[^>]*>.*?</div>'
     new_content = re.sub(pattern, '', content, flags=re.DOTALL)
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    write_if_changed(file_path, new_content)
     
     print(f"Removed badge from {file_path}")
 
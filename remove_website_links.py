@@ -1,6 +1,7 @@
 import os
 import re
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def convert_website_links_to_text():
     """
@@ -49,8 +50,7 @@ def convert_website_links_to_text():
                 if modified:
                     # Save the modified content
                     try:
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(str(soup))
+                        write_if_changed(file_path, str(soup))
                         modified_count += 1
                         print(f"Converted website links to text in {file_path}")
                     except Exception as e:
@@ -3,7 +3,9 @@ import re
 import shutil
 from pathlib import Path
 from bs4 import BeautifulSoup
+from site_paths import relink_page
 import glob
+from site_writer import write_if_changed
 
 # Base directory for the website
 website_dir = 'website'
@@ -149,7 +151,7 @@ def process_html_file(file_path, new_path=None, depth=0):
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    updated_content = update_html_content(content, depth)
+    updated_content = relink_page(content, depth, update_html_content)
     
     # If no new path is provided, update in place
     save_path = new_path if new_path else file_path
@@ -157,8 +159,7 @@ def process_html_file(file_path, new_path=None, depth=0):
     # Create the directory if it doesn't exist
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
     
-    with open(save_path, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+    write_if_changed(save_path, updated_content)
 
 def restructure_website():
     """Main function to restructure the website."""
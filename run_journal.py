@@ -0,0 +1,104 @@
+import os
+import json
+import hashlib
+import threading
+
+# Journal of the last bulk update run; kept after the run as a record of what was rewritten
+JOURNAL_PATH = 'bulk_update_journal.jsonl'
+
+def page_hash(path):
+    """BLAKE2 hash of a page, the same digest site_writer records for written files."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+class RunJournal:
+    """Append-only log of the cities a run has finished, one JSON line each.
+
+    The first line describes the run (input file, size, mtime and filters).
+    Every completed city is appended with the hash of the page it produced
+    and flushed to disk with fsync before the next result is recorded, so a
+    run that dies part-way leaves an exact list of finished pages. A torn
+    last line from a crash is ignored when the journal is read back.
+    """
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.run = None
+        self.entries = {}
+        self.finished = False
+        self.file = None
+        self.valid_size = 0
+
+    def load(self):
+        """Read an existing journal. Returns False if there is none."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                self.valid_size += len(line)
+                if "run" in record:
+                    self.run = record["run"]
+                elif record.get("finished"):
+                    self.finished = True
+                else:
+                    self.entries[record["city_key"]] = record
+        return self.run is not None
+
+    def start(self, run, resume=False):
+        """Open the journal for this run, keeping earlier entries only when resuming the same run."""
+        if resume and self.load() and self.run == run and not self.finished:
+            # Drop a line torn by the crash so new entries start on a line of their own
+            self.file = open(self.path, 'a', encoding='utf-8')
+            self.file.truncate(self.valid_size)
+            return True
+
+        self.run = run
+        self.entries = {}
+        self.finished = False
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self.append({"run": run})
+        return False
+
+    def append(self, record):
+        with self.lock:
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def record(self, city_key, file_path, status, facility_count, output_hash):
+        entry = {
+            "city_key": city_key,
+            "file_path": file_path,
+            "status": status,
+            "facility_count": facility_count,
+            "hash": output_hash
+        }
+        self.append(entry)
+        self.entries[city_key] = entry
+
+    def is_done(self, city_key, file_path):
+        """A city is done if it succeeded and its page still holds what the run wrote."""
+        entry = self.entries.get(city_key)
+        return bool(entry and entry["status"] == "success" and page_hash(file_path) == entry["hash"])
+
+    def completed(self):
+        return [entry for entry in self.entries.values() if entry["status"] == "success"]
+
+    def finish(self):
+        self.append({"finished": True})
+        self.close()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,147 @@
+import os
+import json
+from collections import Counter
+from datetime import datetime
+from site_paths import slugify
+from site_writer import WRITER, write_if_changed
+
+# Facility and city counts of the last build, saved next to the website folder
+AGGREGATES_PATH = 'website_aggregates.json'
+
+# Number of regions listed on the homepage
+TOP_REGION_COUNT = 12
+
+def aggregate_counts(city_counts):
+    """Build every count the pages show from {(region, city): facility count}.
+
+    Returns a dict with per-region city and facility counts, per-city
+    facility counts, site totals and the top regions by facilities. Regions
+    and cities are keyed by slug, the same as their folder names.
+    """
+    regions = {}
+    for (region, city), count in city_counts.items():
+        entry = regions.setdefault(slugify(region), {"name": region, "cities": {}, "city_count": 0, "facility_count": 0})
+        entry["cities"][slugify(city)] = {"name": city, "facilities": count}
+        entry["city_count"] += 1
+        entry["facility_count"] += count
+
+    ranked = sorted(regions, key=lambda slug: regions[slug]["facility_count"], reverse=True)
+    return {
+        "totals": {
+            "regions": len(regions),
+            "cities": sum(entry["city_count"] for entry in regions.values()),
+            "facilities": sum(entry["facility_count"] for entry in regions.values())
+        },
+        "top_regions": ranked[:TOP_REGION_COUNT],
+        "regions": dict(sorted(regions.items()))
+    }
+
+def aggregates_from_facilities(facilities):
+    """Compute the aggregates with one group-by over Facility records."""
+    return aggregate_counts(Counter((facility.region, facility.city) for facility in facilities))
+
+def aggregates_from_groups(region_data):
+    """Compute the aggregates from {region: {city: [facilities]}} already grouped for rendering."""
+    return aggregate_counts({
+        (region, city): len(facilities)
+        for region, cities in region_data.items()
+        for city, facilities in cities.items()
+    })
+
+def page_state(website_dir, region_slug, city_slug):
+    """Return [size, mtime_ns] of a city page, or None if it does not exist."""
+    try:
+        stat = os.stat(os.path.join(website_dir, f"selfstorage{region_slug}", f"selfstorage{city_slug}", "index.html"))
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def folder_state(website_dir, region_slug):
+    """Return the mtime_ns of a region folder, which changes when a city folder is added or removed."""
+    try:
+        return os.stat(os.path.join(website_dir, f"selfstorage{region_slug}")).st_mtime_ns
+    except OSError:
+        return None
+
+def save_aggregates(aggregates, path=AGGREGATES_PATH, website_dir='website'):
+    """Save the aggregates with the state of the pages they were counted from.
+
+    Every city records the size and mtime of its page, and every region the
+    mtime of its folder. Scripts that edit pages without updating the counts
+    change those, so readers can tell which saved counts are out of date.
+    Entries that already carry a state keep it.
+    """
+    # A dry run leaves the saved counts of the last real build alone
+    if WRITER.patch:
+        return
+    for region_slug, region in aggregates["regions"].items():
+        region.setdefault("folder_mtime_ns", folder_state(website_dir, region_slug))
+        for city_slug, city in region["cities"].items():
+            city.setdefault("page", page_state(website_dir, region_slug, city_slug))
+    data = {"generated": datetime.now().isoformat(timespec='seconds'), **aggregates}
+    write_if_changed(path, json.dumps(data, indent=1))
+
+def load_aggregates(path=AGGREGATES_PATH):
+    """Return the saved aggregates, or None if no build has written them yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def update_city_counts(city_counts, path=AGGREGATES_PATH):
+    """Merge new {(region slug, city slug): count} values into the saved aggregates.
+
+    Used by scripts that update a few city pages, so the region and
+    homepage counts stay in step without rescanning the site. Only the
+    updated cities get their page state refreshed; every other city and
+    region keeps the state it was counted at.
+    """
+    previous = load_aggregates(path)
+    if previous is None:
+        return None
+    aggregates = previous
+
+    merged = {}
+    for region_slug, region in aggregates["regions"].items():
+        for city_slug, city in region["cities"].items():
+            merged[(region_slug, city_slug)] = (region["name"], city["name"], city["facilities"])
+    for (region_slug, city_slug), count in city_counts.items():
+        region_name, city_name, _ = merged.get((region_slug, city_slug), (region_slug, city_slug, 0))
+        merged[(region_slug, city_slug)] = (region_name, city_name, count)
+
+    aggregates = aggregate_counts({(region, city): count for region, city, count in merged.values()})
+    for region_slug, region in aggregates["regions"].items():
+        old_region = previous["regions"].get(region_slug, {})
+        region["folder_mtime_ns"] = old_region.get("folder_mtime_ns")
+        for city_slug, city in region["cities"].items():
+            if (region_slug, city_slug) not in city_counts:
+                city["page"] = old_region.get("cities", {}).get(city_slug, {}).get("page")
+    save_aggregates(aggregates, path)
+    return aggregates
+
+def region_counts(aggregates, region_slug, website_dir=None):
+    """Return (city count, facility count) of a region, or None if it is unknown.
+
+    With website_dir, saved counts are only returned while the region
+    folder is unchanged since they were saved.
+    """
+    region = aggregates["regions"].get(region_slug)
+    if not region:
+        return None
+    if website_dir and region.get("folder_mtime_ns") != folder_state(website_dir, region_slug):
+        return None
+    return region["city_count"], region["facility_count"]
+
+def city_facility_count(aggregates, region_slug, city_slug, website_dir=None):
+    """Return the facility count of a city, or None if it is unknown.
+
+    With website_dir, saved counts are only returned while the city page
+    is unchanged since they were saved.
+    """
+    region = aggregates["regions"].get(region_slug)
+    if not region or city_slug not in region["cities"]:
+        return None
+    city = region["cities"][city_slug]
+    if website_dir and city.get("page") != page_state(website_dir, region_slug, city_slug):
+        return None
+    return city["facilities"]
\ No newline at end of file
@@ -0,0 +1,129 @@
+import os
+import json
+import gzip
+import hashlib
+from site_paths import slugify, city_page_path, region_page_path
+from site_writer import write_if_changed
+from facility_db import clean, find_postcode
+
+# Folder of the JSON API inside the website; bump the version when the document shape changes
+API_VERSION = 1
+API_FOLDER = f'api/v{API_VERSION}'
+
+# Set STORAGE_API_COMPRESS=gzip or gzip,br to write precompressed siblings of every endpoint
+COMPRESS_ENV_VAR = "STORAGE_API_COMPRESS"
+COMPRESS_FORMATS = [fmt.strip() for fmt in os.environ.get(COMPRESS_ENV_VAR, "").split(',') if fmt.strip()]
+
+def facility_id(facility):
+    """Stable ID of a facility, from the same region, city, name and address key as facility_db.
+
+    It stays the same across builds while those fields do, whatever order
+    the rows are in.
+    """
+    key = '\x1f'.join((
+        slugify(facility.region),
+        slugify(facility.city),
+        clean(facility.name).lower(),
+        ' '.join(clean(facility.address).lower().split())
+    ))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+def facility_document(facility):
+    address = clean(facility.address)
+    return {
+        "name": clean(facility.name),
+        "address": address,
+        "postcode": clean(facility.postcode) or find_postcode(address)[0],
+        "phone": clean(facility.phone),
+        "website": clean(facility.website),
+        "email": clean(facility.email),
+        "description": clean(facility.description),
+        "features": list(facility.features)
+    }
+
+def city_document(region, city, facilities):
+    """The /api/v1/<region>/<city>.json document of one city."""
+    entries = []
+    seen = {}
+    for facility in facilities:
+        # Identical rows in one city get numbered IDs so every entry stays addressable
+        base_id = facility_id(facility)
+        seen[base_id] = seen.get(base_id, 0) + 1
+        entry_id = base_id if seen[base_id] == 1 else f"{base_id}-{seen[base_id]}"
+        entries.append({"id": entry_id, **facility_document(facility)})
+
+    return {
+        "version": API_VERSION,
+        "region": {"id": slugify(region), "name": region, "url": f"/{region_page_path(region)}"},
+        "city": {"id": slugify(city), "name": city, "url": f"/{city_page_path(region, city)}"},
+        "facility_count": len(entries),
+        "facilities": entries
+    }
+
+def encode_document(document):
+    """Serialize a document the same way every build, so unchanged data keeps its bytes and hash."""
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+def write_endpoint(website_dir, api_path, body, compress=None):
+    """Write one endpoint and its precompressed siblings; returns the body's content hash."""
+    file_path = os.path.join(website_dir, *api_path.split('/'))
+    write_if_changed(file_path, body)
+
+    for fmt in COMPRESS_FORMATS if compress is None else compress:
+        if fmt == "gzip":
+            # mtime=0 keeps the gzip bytes identical while the body is
+            write_if_changed(file_path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+        elif fmt == "br":
+            try:
+                import brotli
+            except ImportError:
+                raise ImportError("Brotli siblings need the brotli package: pip install brotli")
+            write_if_changed(file_path + '.br', brotli.compress(body))
+        else:
+            raise ValueError(f"Unknown API compression format: {fmt}")
+
+    return content_hash(body)
+
+def write_api(website_dir, region_data, aggregates, compress=None):
+    """Write the JSON API from the facility data the HTML pages were rendered from.
+
+    Emits one document per city at api/v1/<region>/<city>.json and an
+    api/v1/regions.json index listing every region and city with its
+    counts, endpoint and content hash. The hashes are also written to
+    api/v1/hashes.json, so clients and servers can use them as ETags and
+    fetch only the cities that changed. Returns the number of endpoints.
+    """
+    hashes = {}
+    regions = []
+    for region_slug, region in aggregates["regions"].items():
+        region_name = region["name"]
+        cities = []
+        for city_slug, city in region["cities"].items():
+            api_path = f"{API_FOLDER}/{region_slug}/{city_slug}.json"
+            body = encode_document(city_document(region_name, city["name"], region_data[region_name][city["name"]]))
+            hashes[f"/{api_path}"] = write_endpoint(website_dir, api_path, body, compress)
+            cities.append({
+                "id": city_slug,
+                "name": city["name"],
+                "facility_count": city["facilities"],
+                "url": f"/{city_page_path(region_name, city['name'])}",
+                "api": f"/{api_path}",
+                "hash": hashes[f"/{api_path}"]
+            })
+        regions.append({
+            "id": region_slug,
+            "name": region_name,
+            "city_count": region["city_count"],
+            "facility_count": region["facility_count"],
+            "url": f"/{region_page_path(region_name)}",
+            "cities": cities
+        })
+
+    index = {"version": API_VERSION, "totals": aggregates["totals"], "regions": regions}
+    hashes[f"/{API_FOLDER}/regions.json"] = write_endpoint(website_dir, f"{API_FOLDER}/regions.json", encode_document(index), compress)
+    write_if_changed(os.path.join(website_dir, *API_FOLDER.split('/'), 'hashes.json'),
+                     encode_document({"version": API_VERSION, "hashes": hashes}))
+    return len(hashes)
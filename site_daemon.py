@@ -0,0 +1,321 @@
+import io
+import os
+import sys
+import hmac
+import json
+import time
+import runpy
+import socket
+import secrets
+import argparse
+import importlib
+import traceback
+import socketserver
+from contextlib import redirect_stdout, redirect_stderr
+
+# Unix socket the daemon listens on, readable and writable by its owner only
+DAEMON_SOCKET = '.site_daemon.sock'
+
+# Where Unix sockets are unavailable (Windows), a local TCP port plus a
+# per-start token that clients read from a file only the owner can read
+DAEMON_HOST = '127.0.0.1'
+DAEMON_PORT = 8767
+DAEMON_TOKEN_FILE = '.site_daemon.token'
+USE_UNIX_SOCKET = hasattr(socket, 'AF_UNIX')
+
+# Jobs the daemon runs, as (module, function). Modules with a function are
+# imported once and the function is called per job; the build script has
+# no main(), so it is re-run from source each time.
+DAEMON_JOBS = {
+    "build": ("create_storage_directory", None),
+    "verify": ("check_site_links", "main"),
+    "verify-structure": ("verify_website_structure", "main"),
+    "sitemap": ("generate_sitemap", "generate_sitemap"),
+    "bulk-update": ("bulk_update_storage_facilities", "main"),
+}
+
+# Modules imported when the daemon starts, so the first job is warm too
+PRELOAD_MODULES = ("pandas", "bs4", "site_paths", "site_templates", "facility_db", "site_aggregates")
+
+# Spreadsheet parsed when the daemon starts
+EXCEL_FILE = 'self storage facilities uk.xlsx'
+
+# Modules loaded from this folder are re-imported when their source changes
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run build and verify jobs in a long-running process with warm caches")
+    parser.add_argument("command", help=f"start, status, stop, or a job: {', '.join(DAEMON_JOBS)}")
+    parser.add_argument("job_args", nargs=argparse.REMAINDER, help="Arguments passed on to the job's script")
+    parser.add_argument("--socket", default=DAEMON_SOCKET, help="Unix socket the daemon listens on")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help="Port the daemon listens on where Unix sockets are unavailable")
+    return parser.parse_args()
+
+class BuildDaemon:
+    """Runs jobs one at a time inside a single warm process.
+
+    Imported modules stay loaded, so pandas, bs4 and the compiled page
+    templates are set up once. The parsed spreadsheet (facility_db.read_sheet),
+    the slug cache (site_paths.slugify) and the written-page hash cache
+    (site_writer.WRITER) all live for the life of the process, so a
+    repeated build neither re-reads the data nor re-reads unchanged pages.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.jobs_run = 0
+        self.module_mtimes = {}
+        self.reloads = 0
+
+    def preload(self):
+        from facility_db import read_sheet
+
+        for module in PRELOAD_MODULES:
+            importlib.import_module(module)
+        read_sheet(EXCEL_FILE)
+        self.record_modules()
+
+    def project_modules(self):
+        """Return {name: source path} for the loaded modules that live in this folder."""
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, '__file__', None)
+            if name != '__main__' and path and os.path.dirname(os.path.abspath(path)) == PROJECT_DIR:
+                modules[name] = path
+        return modules
+
+    def record_modules(self):
+        """Remember the source mtime of every project module not seen before."""
+        for name, path in self.project_modules().items():
+            if name not in self.module_mtimes and os.path.exists(path):
+                self.module_mtimes[name] = os.stat(path).st_mtime_ns
+
+    def changed_modules(self):
+        """Return the names of loaded project modules whose source changed since they were imported."""
+        changed = []
+        for name, path in self.project_modules().items():
+            if name in self.module_mtimes and (not os.path.exists(path) or os.stat(path).st_mtime_ns != self.module_mtimes[name]):
+                changed.append(name)
+        return sorted(changed)
+
+    def reload_changed(self):
+        """Re-import the project if any of its modules changed. Returns the changed names.
+
+        Modules bind each other's functions with from-imports, so reloading
+        only the edited file would leave stale references behind. Every
+        project module is dropped instead and imported fresh, as after a
+        restart; pandas and bs4 stay loaded.
+        """
+        changed = self.changed_modules()
+        if not changed:
+            return changed
+        for name in self.project_modules():
+            del sys.modules[name]
+        importlib.invalidate_caches()
+        self.module_mtimes = {}
+        for module in PRELOAD_MODULES:
+            importlib.import_module(module)
+        self.record_modules()
+        self.reloads += 1
+        return changed
+
+    def run(self, job, args):
+        """Run one job and return its result as a dict."""
+        from site_writer import WRITER
+
+        if job not in DAEMON_JOBS:
+            return {"ok": False, "exit_code": 2, "output": f"Unknown job: {job}\n"}
+        module_name, function = DAEMON_JOBS[job]
+
+        output = io.StringIO()
+        reloaded = self.reload_changed()
+        if reloaded:
+            output.write(f"Reloaded after source changes: {', '.join(reloaded)}\n")
+        # The shared header and footer carry the year, so they are rendered afresh for every job
+        importlib.import_module("site_templates").shared_fragments.cache_clear()
+        saved_argv = sys.argv
+        sys.argv = [f"{module_name}.py", *args]
+        WRITER.reset_stats()
+        exit_code = 0
+        start_time = time.time()
+        try:
+            with redirect_stdout(output), redirect_stderr(output):
+                if function is None:
+                    runpy.run_path(f"{module_name}.py", run_name="__main__")
+                else:
+                    getattr(importlib.import_module(module_name), function)()
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            output.write(traceback.format_exc())
+            exit_code = 1
+        finally:
+            sys.argv = saved_argv
+        self.jobs_run += 1
+        self.record_modules()
+
+        return {
+            "ok": exit_code == 0,
+            "exit_code": exit_code,
+            "output": output.getvalue(),
+            "elapsed": round(time.time() - start_time, 3),
+            "files": WRITER.stats()
+        }
+
+    def status(self):
+        from facility_db import SHEET_CACHE
+        from site_writer import WRITER
+
+        return {
+            "ok": True,
+            "uptime": round(time.time() - self.started, 1),
+            "jobs_run": self.jobs_run,
+            "reloads": self.reloads,
+            "changed_modules": ', '.join(self.changed_modules()) or 'none',
+            "cached_sheets": len(SHEET_CACHE),
+            "cached_page_hashes": len(WRITER.files)
+        }
+
+def bad_request(message):
+    return {"ok": False, "exit_code": 2, "output": f"Bad request: {message}\n"}
+
+def check_request(request, token=None):
+    """Return an error reply for a malformed or unauthorized request, or None if it can run."""
+    if not isinstance(request, dict):
+        return bad_request("expected a JSON object")
+    if token is not None and not hmac.compare_digest(str(request.get("token", "")), token):
+        return bad_request("missing or wrong token")
+    if not isinstance(request.get("command"), str):
+        return bad_request("'command' must be a string")
+    args = request.get("args", [])
+    if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+        return bad_request("'args' must be a list of strings")
+    return None
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON reply line out."""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            request = None
+            reply = bad_request("not a JSON line")
+        else:
+            reply = check_request(request, self.server.token)
+        if reply:
+            self.reply(reply)
+            return
+
+        command = request["command"]
+        if command == "status":
+            reply = self.server.daemon.status()
+        elif command == "stop":
+            reply = {"ok": True, "output": "Daemon stopping\n"}
+            self.server.stopping = True
+        else:
+            reply = self.server.daemon.run(command, request.get("args", []))
+        self.reply(reply)
+
+    def reply(self, reply):
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+def write_private(path, data):
+    """Create a file only its owner can read and write."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(data)
+
+def open_server(socket_path, port):
+    """Return (server, address) listening on a private Unix socket, or on local TCP with a token."""
+    if USE_UNIX_SOCKET:
+        if os.path.exists(socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX) as probe:
+                    probe.connect(socket_path)
+                raise SystemExit(f"A build daemon is already listening on {socket_path}")
+            except ConnectionRefusedError:
+                # Left behind by a daemon that did not shut down cleanly
+                os.remove(socket_path)
+        # The socket file is created with the umask, so no other user can connect even briefly
+        old_umask = os.umask(0o177)
+        try:
+            server = socketserver.UnixStreamServer(socket_path, DaemonHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(socket_path, 0o600)
+        server.token = None
+        return server, socket_path
+
+    socketserver.TCPServer.allow_reuse_address = True
+    server = socketserver.TCPServer((DAEMON_HOST, port), DaemonHandler)
+    server.token = secrets.token_hex(16)
+    write_private(DAEMON_TOKEN_FILE, server.token)
+    return server, f"{DAEMON_HOST}:{port}"
+
+def serve(socket_path, port):
+    daemon = BuildDaemon()
+    start_time = time.time()
+    daemon.preload()
+
+    # The server handles one connection at a time, so jobs never overlap
+    server, address = open_server(socket_path, port)
+    try:
+        with server:
+            server.daemon = daemon
+            server.stopping = False
+            print("Build daemon summary:")
+            print(f"- Listening on: {address}")
+            print(f"- Jobs: {', '.join(DAEMON_JOBS)}")
+            print(f"- Warm-up time: {time.time() - start_time:.2f} seconds")
+            while not server.stopping:
+                server.handle_request()
+    finally:
+        # The socket or token file is only valid while this daemon runs
+        leftover = socket_path if USE_UNIX_SOCKET else DAEMON_TOKEN_FILE
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+def send_request(request, socket_path=DAEMON_SOCKET, port=DAEMON_PORT):
+    """Send one request to a running daemon and return its reply."""
+    if USE_UNIX_SOCKET:
+        conn = socket.socket(socket.AF_UNIX)
+        conn.connect(socket_path)
+    else:
+        with open(DAEMON_TOKEN_FILE, 'r', encoding='utf-8') as f:
+            request = {**request, "token": f.read().strip()}
+        conn = socket.create_connection((DAEMON_HOST, port))
+    with conn:
+        conn.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with conn.makefile('rb') as reply:
+            return json.loads(reply.readline())
+
+def main():
+    args = parse_args()
+    if args.command == "start":
+        serve(args.socket, args.port)
+        return
+
+    start_time = time.time()
+    try:
+        reply = send_request({"command": args.command, "args": args.job_args}, args.socket, args.port)
+    except (ConnectionRefusedError, FileNotFoundError):
+        print("No build daemon is running; start one with: python site_daemon.py start")
+        sys.exit(1)
+
+    if args.command == "status":
+        for key, value in reply.items():
+            if key != "ok":
+                print(f"- {key.replace('_', ' ').capitalize()}: {value}")
+        return
+
+    print(reply.get("output", ""), end="")
+    if "files" in reply:
+        files = reply["files"]
+        print(f"Files written: {files['written']} ({files['bytes_written']:,} bytes), "
+              f"unchanged and skipped: {files['skipped']} ({files['bytes_skipped']:,} bytes)")
+        print(f"- Job time: {reply['elapsed']:.2f} seconds (round trip {time.time() - start_time:.2f} seconds)")
+    sys.exit(reply.get("exit_code", 0))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import time
+import hashlib
+from contextlib import contextmanager
+from site_writer import WRITER, PageChangedError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Lock files live next to the website folder so they are never deployed
+LOCK_DIR = '.site_locks'
+
+# Pages share this many lock files; two pages rarely share one, and the folder stays small
+LOCK_STRIPES = 256
+
+# Attempts at a read-modify-write when another writer changed the page in between
+EDIT_ATTEMPTS = 3
+
+class FileLock:
+    """Exclusive advisory lock on a file, held across processes.
+
+    Uses flock where available and msvcrt byte locks on Windows. Waiting
+    processes block until the holder releases the lock or exits.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            return
+        while True:
+            try:
+                msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK gives up after about ten seconds; keep waiting
+                time.sleep(0.1)
+
+    def release(self):
+        if self.fd is None:
+            return
+        if fcntl:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        os.close(self.fd)
+        self.fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+def page_lock(path, lock_dir=LOCK_DIR):
+    """Return the lock guarding one page. Every process maps a page to the same lock file."""
+    stripe = int(hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=4).hexdigest(), 16) % LOCK_STRIPES
+    return FileLock(os.path.join(lock_dir, f"page-{stripe:03d}.lock"))
+
+@contextmanager
+def locked_page(path):
+    """Hold a page's lock for a read-modify-write: read with WRITER.read, write with write_if_changed."""
+    with page_lock(path):
+        yield
+
+def edit_page(path, transform, attempts=EDIT_ATTEMPTS):
+    """Apply transform(content) to a page under its lock. Returns True if the page changed.
+
+    transform returns the new content, or None to leave the page alone.
+    Scripts that take the lock never overlap on a page; if something that
+    does not take it (an editor, an older script) changes the page between
+    the read and the write, the write is refused and the edit is redone on
+    the new content.
+    """
+    for attempt in range(attempts):
+        with locked_page(path):
+            content = WRITER.read(path)
+            updated = transform(content)
+            if updated is None or updated == content:
+                WRITER.forget_read(path)
+                return False
+            try:
+                return WRITER.write(path, updated)
+            except PageChangedError:
+                if attempt == attempts - 1:
+                    raise
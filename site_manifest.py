@@ -0,0 +1,84 @@
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+from site_writer import WRITER
+
+# Manifest of the current build, written next to the website folder so it is never deployed
+MANIFEST_PATH = 'website_manifest.json'
+
+# Temporary files of site_writer's atomic writes: .<file name>.<random>.tmp
+TEMP_FILE_PATTERN = re.compile(r'^\..+\.[^.]+\.tmp$')
+
+def file_digest(path):
+    """Return the BLAKE2 content hash used by site_writer.py and the manifest."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def load_manifest(path):
+    """Return the {path: entry} files of a manifest, or {} if it does not exist."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("files", {})
+
+def build_manifest(website_dir='website', previous=None):
+    """Hash every file under website_dir and return {relative path: entry}.
+
+    Files written in this run already have their hash in site_writer.WRITER.
+    Other files keep their previous hash when size and mtime are unchanged,
+    so refreshing the manifest only reads files that were touched.
+    """
+    previous = previous or {}
+    files = {}
+    for root, dirs, names in os.walk(website_dir):
+        for name in names:
+            # Skip temporary files left by interrupted atomic writes; other dotfiles such as .htaccess are deployed
+            if TEMP_FILE_PATTERN.match(name):
+                continue
+            full_path = os.path.join(root, name)
+            rel_path = os.path.relpath(full_path, website_dir).replace(os.sep, '/')
+            stat = os.stat(full_path)
+
+            digest = WRITER.files.get(os.path.abspath(full_path))
+            old = previous.get(rel_path)
+            if not digest and old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                digest = old["hash"]
+            if not digest:
+                digest = file_digest(full_path)
+
+            files[rel_path] = {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return dict(sorted(files.items()))
+
+def save_manifest(files, path=MANIFEST_PATH):
+    manifest = {
+        "generated": datetime.now().isoformat(timespec='seconds'),
+        "file_count": len(files),
+        "total_bytes": sum(entry["size"] for entry in files.values()),
+        "files": files
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+
+def update_manifest(website_dir='website', path=MANIFEST_PATH):
+    """Refresh the build manifest after a generator run and return its files.
+
+    A dry run changed nothing on disk, so the saved manifest is left alone.
+    """
+    if WRITER.patch:
+        return load_manifest(path)
+    files = build_manifest(website_dir, load_manifest(path))
+    save_manifest(files, path)
+    print(f"Manifest of {len(files)} files saved to: {path}")
+    return files
+
+def diff_manifests(current, deployed):
+    """Return (added, changed, removed) path lists between two manifests."""
+    added = [path for path in current if path not in deployed]
+    changed = [path for path in current if path in deployed and current[path]["hash"] != deployed[path]["hash"]]
+    removed = [path for path in deployed if path not in current]
+    return added, changed, removed
+
+if __name__ == "__main__":
+    update_manifest()
\ No newline at end of file
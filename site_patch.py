@@ -0,0 +1,75 @@
+import os
+import difflib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+def diff_page(path, old, new):
+    """Return (unified diff, lines added, lines removed) between two versions of a page."""
+    name = os.path.relpath(path).replace(os.sep, '/')
+    old_lines = old.decode('utf-8', 'replace').splitlines(keepends=True)
+    new_lines = new.decode('utf-8', 'replace').splitlines(keepends=True)
+
+    diff = []
+    added = removed = 0
+    for line in difflib.unified_diff(old_lines, new_lines, f"a/{name}", f"b/{name}"):
+        if not line.endswith('\n'):
+            line += '\n\\ No newline at end of file\n'
+        if line.startswith('+') and not line.startswith('+++'):
+            added += 1
+        elif line.startswith('-') and not line.startswith('---'):
+            removed += 1
+        diff.append(line)
+    return ''.join(diff), added, removed
+
+class PatchWriter:
+    """Streams the changes a run would make into one unified diff file.
+
+    Each page is diffed on a worker thread while the run carries on
+    rendering, and diffs are appended to the patch in the order the pages
+    were written. A bounded number of diffs are in flight, so memory stays
+    flat on site-wide runs. Threads rather than processes, because pages
+    are written from the callers' own thread pools and forking a
+    multithreaded process can deadlock.
+    """
+
+    def __init__(self, path, workers=None):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.file = open(path, 'w', encoding='utf-8')
+        self.lock = threading.Lock()
+        self.pending = deque()
+        self.executor = None
+        self.files = 0
+        self.added = 0
+        self.removed = 0
+
+    def add(self, path, old, new):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers)
+            self.pending.append(self.executor.submit(diff_page, path, old, new))
+            while len(self.pending) > self.workers * 4:
+                self.write_next()
+
+    def write_next(self):
+        diff, added, removed = self.pending.popleft().result()
+        self.file.write(diff)
+        self.files += 1
+        self.added += added
+        self.removed += removed
+
+    def close(self):
+        with self.lock:
+            while self.pending:
+                self.write_next()
+            self.file.close()
+            if self.executor:
+                self.executor.shutdown()
+                self.executor = None
+
+    def print_summary(self):
+        print("Dry run summary:")
+        print(f"- Files that would change: {self.files}")
+        print(f"- Lines added: {self.added}, removed: {self.removed}")
+        print(f"- Patch saved to: {self.path}")
@@ -0,0 +1,113 @@
+import re
+import functools
+import unicodedata
+
+# Folder used for the list of all regions
+REGIONS_FOLDER = 'selfstorageregions'
+
+# Folder in the website root that holds the shared header and footer fragments
+INCLUDES_FOLDER = '_includes'
+
+# Marker written into the head of every page rendered by site_templates.py
+GENERATOR_META = '<meta content="storage-finder-templates" name="generator"/>'
+
+# Shared assets and nav targets, relative to the site root
+SITE_TARGETS = {
+    "home": "index.html",
+    "regions": f"{REGIONS_FOLDER}/index.html",
+    "faq": "faq/index.html",
+    "about": "about/index.html",
+    "contact": "contact/index.html",
+    "calculator": "calculator/index.html",
+    "blog": "blog/index.html",
+    "privacy": "privacy/index.html",
+    "terms": "terms/index.html",
+    "membership": "membership/index.html",
+    "sitemap": "sitemap/index.html",
+    "stylesheet": "assets/css/style.css",
+    "favicon_32": "assets/img/favicon-32x32.png",
+    "favicon_16": "assets/img/favicon-16x16.png",
+    "search_js": "js/search.js"
+}
+
+@functools.lru_cache(maxsize=None)
+def clean_name(name):
+    """Return a region or city name as the site shows it.
+
+    Spreadsheet names can end in an invisible left-to-right mark (U+200E) or
+    carry a county after a comma, e.g. 'Olney, Buckinghamshire\u200e '.
+    Non-ASCII characters and everything from the first comma are dropped.
+    """
+    text = unicodedata.normalize('NFKD', str(name))
+    text = re.sub(r'[^\x00-\x7F]+', '', text)
+    text = re.sub(r'[,\s]+$', '', text)
+    return text.split(',')[0].strip()
+
+@functools.lru_cache(maxsize=None)
+def slugify(name):
+    """Convert a name to the lowercase, dash-separated form used in folder names."""
+    return re.sub(r'[^a-z0-9]+', '-', clean_name(name).lower()).strip('-')
+
+def to_selfstorage_path(name):
+    """Convert a name to a valid folder name with selfstorage prefix"""
+    # Skip if already has prefix
+    if str(name).startswith('selfstorage'):
+        return str(name)
+    return 'selfstorage' + slugify(name)
+
+def region_page_path(region):
+    """Return the site path of a region page, e.g. selfstoragekent/index.html."""
+    return f"{to_selfstorage_path(region)}/index.html"
+
+def city_page_path(region, city):
+    """Return the site path of a city page within its region folder."""
+    return f"{to_selfstorage_path(region)}/{to_selfstorage_path(city)}/index.html"
+
+def root_prefix(depth):
+    """Return the relative prefix that leads from a page at depth back to the site root."""
+    return '../' * depth
+
+class UrlResolver:
+    """Relative URLs for every page at one depth of the site tree.
+
+    Depth 0 is the root, 1 a region or top-level page and 2 a city page. The
+    prefix and every shared asset and nav target are resolved once, so pages
+    are rendered with correct links and never need a rewriting pass.
+    """
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.prefix = root_prefix(depth)
+        self.targets = {name: self.prefix + path for name, path in SITE_TARGETS.items()}
+
+    def __getitem__(self, name):
+        return self.targets[name]
+
+    def page(self, site_path):
+        """Return the URL of any site path, e.g. faq/index.html."""
+        return self.prefix + site_path
+
+    def region(self, region):
+        return self.prefix + region_page_path(region)
+
+    def city(self, region, city):
+        return self.prefix + city_page_path(region, city)
+
+@functools.lru_cache(maxsize=None)
+def resolver_for(depth):
+    """Return the shared UrlResolver for pages at depth."""
+    return UrlResolver(depth)
+
+def is_generated_page(content):
+    """Check whether a page was rendered by site_templates.py with resolved links."""
+    return GENERATOR_META in content
+
+def relink_page(content, depth, update_links):
+    """Return content with links rewritten by update_links(content, depth).
+
+    Pages rendered by site_templates.py already carry the right links for
+    their depth, so they are returned unchanged.
+    """
+    if is_generated_page(content):
+        return content
+    return update_links(content, depth)
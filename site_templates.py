@@ -0,0 +1,493 @@
+import os
+import sys
+import html
+import argparse
+import functools
+from string import Template
+from datetime import datetime
+from site_paths import INCLUDES_FOLDER, GENERATOR_META, to_selfstorage_path, resolver_for
+from site_writer import write_if_changed
+
+class PageTemplate:
+    """A $name template that is split into literal text and field names once.
+
+    Rendering is a single join over the precompiled parts, so no regular
+    expression or DOM work happens per page. Values are inserted as-is;
+    callers escape text with esc() and pass rendered partials as HTML.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.head = ''
+        self.fields = []
+
+        literal = []
+        pos = 0
+        for match in Template.pattern.finditer(source):
+            literal.append(source[pos:match.start()])
+            pos = match.end()
+
+            if match.group('escaped') is not None:
+                literal.append(Template.delimiter)
+                continue
+
+            name = match.group('named') or match.group('braced')
+            if name is None:
+                raise ValueError(f"Invalid placeholder in template at offset {match.start()}")
+
+            self.add_literal(''.join(literal))
+            self.fields.append([name, ''])
+            literal = []
+
+        literal.append(source[pos:])
+        self.add_literal(''.join(literal))
+
+    def add_literal(self, text):
+        if self.fields:
+            self.fields[-1][1] += text
+        else:
+            self.head += text
+
+    def render(self, **values):
+        parts = [self.head]
+        for name, literal in self.fields:
+            parts.append(values[name])
+            parts.append(literal)
+        return ''.join(parts)
+
+def esc(value):
+    """Escape a plain text value for use in element text or attributes."""
+    return html.escape(str(value), quote=True)
+
+# Links shown in the header on every page, as site_paths.SITE_TARGETS names
+NAV_LINKS = [
+    ("home", "Home"),
+    ("regions", "Regions"),
+    ("faq", "FAQ"),
+    ("about", "About"),
+    ("contact", "Contact"),
+    ("calculator", "Storage Calculator"),
+    ("blog", "Blog")
+]
+
+# Footer columns shown on every page, as site_paths.SITE_TARGETS names
+FOOTER_COLUMNS = [
+    ("Legal", [
+        ("privacy", "Privacy Policy"),
+        ("terms", "Terms of Use"),
+        ("membership", "Membership Terms")
+    ]),
+    ("Navigate", [
+        ("home", "Home"),
+        ("regions", "Regions"),
+        ("faq", "FAQ"),
+        ("sitemap", "Sitemap")
+    ]),
+    ("Company", [
+        ("about", "About Us"),
+        ("contact", "Contact")
+    ])
+]
+
+HEAD_TEMPLATE = PageTemplate("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8"/>
+<meta content="width=device-width, initial-scale=1.0" name="viewport"/>
+<title>$title</title>
+<meta content="$description" name="description"/>
+$generator
+<link rel="icon" type="image/png" sizes="32x32" href="$favicon_32"/>
+<link rel="icon" type="image/png" sizes="16x16" href="$favicon_16"/>
+<link href="$stylesheet" rel="stylesheet"/>
+$extra_head</head>
+""")
+
+HEADER_TEMPLATE = PageTemplate("""<header><div class="container">
+<div class="logo">Storage Finder</div>
+<nav>
+<ul>
+$nav_items</ul></nav>
+</div></header>""")
+
+FOOTER_TEMPLATE = PageTemplate("""<footer><div class="container"><div class="footer-columns">$columns</div><div class="footer-bottom"><p>© $year Storage Finder. All rights reserved.</p></div></div></footer>""")
+
+PAGE_END = """</body>
+</html>
+"""
+
+# How shared fragments are written into pages: inline copies, or SSI/ESI include directives
+FRAGMENT_MODES = ("inline", "ssi", "esi")
+FRAGMENT_MODE = os.environ.get("STORAGE_FRAGMENTS", "inline")
+
+# Include directive written in place of a fragment in ssi and esi mode
+FRAGMENT_DIRECTIVES = {
+    "ssi": '<!--#include virtual="/{path}" -->',
+    "esi": '<esi:include src="/{path}"/>'
+}
+
+# Deepest page level in the site: root, region, city
+MAX_DEPTH = 2
+
+FACILITY_CARD_TEMPLATE = PageTemplate(
+    '<div class="storage-card"><h3>$name</h3><div class="storage-info">'
+    '<p><strong>Address: </strong>$address</p>'
+    '<p><strong>Description: </strong>$description</p>'
+    '<div class="features-list">$features</div>'
+    '<div class="contact-info">$contact</div>'
+    '</div></div>'
+)
+
+CITY_CARD_TEMPLATE = PageTemplate(
+    '<div class="city-card"><h3>$name</h3><p>$count</p><a href="$href">View Storage Options</a></div>'
+)
+
+CITY_PAGE_TEMPLATE = PageTemplate("""<div class="container">
+<h1>Self Storage in $city, $region</h1>
+<p>Find the best self storage facilities in $city, $region.</p>
+<div class="breadcrumbs">
+<a href="$home">Home</a> &gt;
+<a href="$regions">Regions</a> &gt;
+<a href="$region_url">$region</a> &gt;
+<span>$city</span>
+</div>
+<h2>Storage Providers in $city</h2>
+<div class="storage-list">$cards</div>
+<div style="margin-top: 40px;"><h2>About Storage in $city</h2><p>$city offers a variety of self storage options to meet different needs, from household storage during moves to business inventory management. Most facilities provide secure, clean units with various access options and additional services like packing supplies and delivery acceptance.</p><p>When choosing a storage facility in $city, consider factors like location, access hours, security features, and whether climate control is needed for sensitive items. Many facilities offer flexible contracts with monthly payments, and some provide special discounts for long-term storage.</p></div>
+</div>
+""")
+
+REGION_PAGE_TEMPLATE = PageTemplate("""<div class="container"><div class="region-intro"><div class="breadcrumbs"><a href="$home">Home</a> &gt; <a href="$regions">Regions</a> &gt; <span>$region</span></div><h1>Self Storage in $region</h1><p>Find the best self storage facilities in $region. We have $city_count locations available.</p></div><div class="search-form"><input aria-label="Search for a city in $region" id="citySearch" type="text"/><button onclick="searchCity()">Search</button></div><h2 id="search-results-heading">Cities with Self Storage in $region</h2>
+<div class="cities-grid">$cards</div>
+</div>
+""")
+
+REGIONS_INDEX_TEMPLATE = PageTemplate("""<div class="container"><div class="region-intro"><div class="breadcrumbs"><a href="$home">Home</a> &gt; <span>Regions</span></div><h1>Self Storage Regions</h1><p>Browse self storage facilities by region. Click on a region to view available storage facilities in cities across that area.</p></div><div class="search-form"><input aria-label="Search for a region" id="regionSearch" type="text"/><button onclick="searchRegion()">Search</button></div><h2 id="search-results-heading">Storage Regions in the UK</h2>
+<div class="cities-grid">$cards</div>
+</div>
+""")
+
+# Card styles used on city pages
+CITY_PAGE_STYLE = """<style>
+    .storage-list {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+        gap: 20px;
+        margin-top: 30px;
+    }
+
+    .storage-card {
+        background-color: white;
+        border: 1px solid #28A745;
+        border-radius: 8px;
+        padding: 20px;
+        box-shadow: 0 3px 10px rgba(0,0,0,0.1);
+        transition: transform 0.3s ease;
+    }
+
+    .storage-card:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 5px 15px rgba(40, 167, 69, 0.2);
+    }
+
+    .storage-card h3 {
+        color: #006400;
+        font-size: 22px;
+        margin-bottom: 15px;
+        padding-bottom: 10px;
+        border-bottom: 1px solid #e9ecef;
+    }
+
+    .storage-info {
+        display: grid;
+        grid-template-columns: 1fr;
+        gap: 15px;
+    }
+
+    .contact-info {
+        margin-top: 15px;
+        padding-top: 15px;
+        border-top: 1px solid #e9ecef;
+        display: flex;
+        justify-content: space-between;
+        flex-wrap: wrap;
+        gap: 10px;
+    }
+
+    .contact-info p {
+        margin-bottom: 5px;
+    }
+
+    .features-list {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 8px;
+        margin-top: 15px;
+    }
+
+    .feature-tag {
+        background-color: #e8f5e9;
+        color: #006400;
+        padding: 5px 10px;
+        border-radius: 20px;
+        font-size: 14px;
+        font-weight: 500;
+    }
+</style>"""
+
+# Filters the city or region cards on a listing page by the search box text
+CARD_SEARCH_SCRIPT = """<script>
+var defaultHeading = document.getElementById('search-results-heading').innerText;
+
+function filterCards(inputId, noun) {
+    var input = document.getElementById(inputId).value.toLowerCase();
+    var cards = document.querySelectorAll('.city-card');
+    var resultsHeading = document.getElementById('search-results-heading');
+    var foundCount = 0;
+
+    cards.forEach(function(card) {
+        var name = card.querySelector('h3').innerText.toLowerCase();
+
+        if (name.includes(input)) {
+            card.style.display = 'block';
+            foundCount++;
+        } else {
+            card.style.display = 'none';
+        }
+    });
+
+    if (input === '') {
+        resultsHeading.innerText = defaultHeading;
+    } else if (foundCount === 0) {
+        resultsHeading.innerText = 'No ' + noun + ' found matching "' + input + '"';
+    } else {
+        resultsHeading.innerText = noun.charAt(0).toUpperCase() + noun.slice(1) + ' matching "' + input + '"';
+    }
+}
+
+function searchCity() { filterCards('citySearch', 'cities'); }
+function searchRegion() { filterCards('regionSearch', 'regions'); }
+</script>"""
+
+def render_header(depth):
+    """Render the site header for a page at depth."""
+    urls = resolver_for(depth)
+    nav_items = ''.join(f'<li><a href="{urls[target]}">{label}</a></li>\n' for target, label in NAV_LINKS)
+    return HEADER_TEMPLATE.render(nav_items=nav_items)
+
+def render_footer(depth):
+    """Render the site footer for a page at depth."""
+    urls = resolver_for(depth)
+    columns = []
+    for heading, links in FOOTER_COLUMNS:
+        items = ''.join(f'<li><a href="{urls[target]}">{label}</a></li>' for target, label in links)
+        columns.append(f'<div class="footer-column"><h3>{heading}</h3><ul>{items}</ul></div>')
+    return FOOTER_TEMPLATE.render(columns=''.join(columns), year=str(datetime.now().year))
+
+def fragment_path(name, depth):
+    """Return the site path of a shared fragment file, e.g. _includes/header-2.html."""
+    return f"{INCLUDES_FOLDER}/{name}-{depth}.html"
+
+@functools.lru_cache(maxsize=None)
+def shared_fragments(depth, mode):
+    """Return the header and footer bytes for a page at depth.
+
+    They are rendered once per depth and mode and reused for every page. In
+    ssi and esi mode the bytes are include directives for the fragment files
+    written by write_fragments().
+    """
+    if mode == "inline":
+        return render_header(depth).encode('utf-8'), render_footer(depth).encode('utf-8')
+    if mode not in FRAGMENT_DIRECTIVES:
+        raise ValueError(f"Unknown fragment mode: {mode}")
+    directive = FRAGMENT_DIRECTIVES[mode]
+    return (
+        directive.format(path=fragment_path("header", depth)).encode('utf-8'),
+        directive.format(path=fragment_path("footer", depth)).encode('utf-8')
+    )
+
+def write_fragments(website_dir):
+    """Write the header and footer fragment files used by ssi and esi mode."""
+    written = []
+    for depth in range(MAX_DEPTH + 1):
+        header, footer = shared_fragments(depth, "inline")
+        for name, content in (("header", header), ("footer", footer)):
+            path = os.path.join(website_dir, fragment_path(name, depth))
+            write_if_changed(path, content)
+            written.append(path)
+    return written
+
+def ensure_fragments(website_dir):
+    """Write the fragment files that ssi and esi pages include; inline pages need none."""
+    if FRAGMENT_MODE == "inline":
+        return []
+    return write_fragments(website_dir)
+
+def site_fragment_mode(website_dir):
+    """Return the fragment mode a built site uses, judged by the include directives on its homepage."""
+    try:
+        with open(os.path.join(website_dir, 'index.html'), 'r', encoding='utf-8', errors='ignore') as f:
+            homepage = f.read()
+    except OSError:
+        return "inline"
+    for mode, directive in FRAGMENT_DIRECTIVES.items():
+        if directive.format(path=fragment_path("header", 0)) in homepage:
+            return mode
+    return "inline"
+
+def require_inline_pages(website_dir, template_change):
+    """Exit unless the pages in website_dir carry inline copies of the header and footer.
+
+    For scripts that regex-patch the header or footer of every page. In ssi
+    and esi mode the pages hold include directives instead, and the fragment
+    files are rewritten from the templates on every build, so the change
+    belongs in the template (template_change says where).
+    """
+    mode = FRAGMENT_MODE if FRAGMENT_MODE != "inline" else site_fragment_mode(website_dir)
+    if mode != "inline":
+        sys.exit(f"{website_dir} is built in {mode} mode: pages include the header and footer from "
+                 f"{INCLUDES_FOLDER}/ and patching them has no effect. {template_change}")
+
+def render_page(title, description, content, depth, extra_head='', scripts='', fragments=None):
+    """Wrap rendered page content in the shared head, header and footer.
+
+    Returns the page as UTF-8 bytes. fragments selects inline, ssi or esi
+    output and defaults to the STORAGE_FRAGMENTS environment variable.
+    """
+    urls = resolver_for(depth)
+    header, footer = shared_fragments(depth, fragments or FRAGMENT_MODE)
+    head = HEAD_TEMPLATE.render(
+        title=esc(title),
+        description=esc(description),
+        generator=GENERATOR_META,
+        favicon_32=urls["favicon_32"],
+        favicon_16=urls["favicon_16"],
+        stylesheet=urls["stylesheet"],
+        extra_head=extra_head
+    )
+    return b''.join([
+        head.encode('utf-8'),
+        b'<body>',
+        header,
+        content.encode('utf-8'),
+        footer,
+        scripts.encode('utf-8'),
+        PAGE_END.encode('utf-8')
+    ])
+
+def count_label(count, singular, plural):
+    return f"{count} {singular if count == 1 else plural}"
+
+def render_facility_card(facility, city='', region=''):
+    """Render one facility card from a plain facility dictionary.
+
+    Accepts the keys used by the CSV and Excel loaders: name, address (or
+    location), description, features, phone, email and website. A generic
+    description is written when none is given.
+    """
+    name = str(facility.get('name') or 'Storage Facility')
+    address = str(facility.get('address') or facility.get('location') or 'Contact for address').replace('\n', ', ')
+
+    description = facility.get('description')
+    if not description:
+        place = f"{city}, {region}" if city and region else city or region or 'the area'
+        description = f"{name} provides self storage solutions in {place}. Located at {address} with easy access and secure storage options."
+
+    features = ''.join(f'<span class="feature-tag">{esc(feature)}</span>' for feature in facility.get('features') or [])
+
+    contact = []
+    for key, label in (('phone', 'Phone'), ('website', 'Website'), ('email', 'Email')):
+        value = facility.get(key)
+        if value and str(value) != 'Not available':
+            contact.append(f'<p><strong>{label}: </strong>{esc(value)}</p>')
+
+    return FACILITY_CARD_TEMPLATE.render(
+        name=esc(name),
+        address=esc(address),
+        description=esc(description),
+        features=features,
+        contact=''.join(contact)
+    )
+
+def render_city_page(region, city, facilities, fragments=None):
+    """Render a complete city page from a list of facility dictionaries."""
+    urls = resolver_for(2)
+    cards = ''.join(render_facility_card(facility, city, region) for facility in facilities)
+    content = CITY_PAGE_TEMPLATE.render(
+        city=esc(city),
+        region=esc(region),
+        home=urls["home"],
+        regions=urls["regions"],
+        region_url=urls.region(region),
+        cards=cards
+    )
+    return render_page(
+        f"Self Storage in {city}, {region} | Find Local Facilities",
+        f"Looking for self storage in {city}, {region}? Compare local storage facilities, prices, and features to find the perfect storage solution for your needs.",
+        content,
+        depth=2,
+        extra_head=CITY_PAGE_STYLE,
+        fragments=fragments
+    )
+
+def render_region_page(region, cities, fragments=None):
+    """Render a region page from (city name, facility count) pairs."""
+    urls = resolver_for(1)
+    # City folders sit directly inside the region folder
+    cards = ''.join(
+        CITY_CARD_TEMPLATE.render(
+            name=esc(city),
+            count=count_label(count, 'Storage Facility', 'Storage Facilities'),
+            href=f"{to_selfstorage_path(city)}/index.html"
+        )
+        for city, count in cities
+    )
+    content = REGION_PAGE_TEMPLATE.render(
+        region=esc(region),
+        home=urls["home"],
+        regions=urls["regions"],
+        city_count=str(len(cities)),
+        cards=cards
+    )
+    return render_page(
+        f"Self Storage in {region} - Find Storage Units Near You",
+        f"Find the best self storage facilities in {region}. Compare prices, features, and availability of storage units near you.",
+        content,
+        depth=1,
+        scripts=CARD_SEARCH_SCRIPT,
+        fragments=fragments
+    )
+
+def render_regions_index(regions, fragments=None):
+    """Render the list of all regions from (region name, city count) pairs."""
+    urls = resolver_for(1)
+    cards = ''.join(
+        CITY_CARD_TEMPLATE.render(
+            name=esc(region),
+            count=count_label(count, 'City', 'Cities'),
+            href=urls.region(region)
+        )
+        for region, count in regions
+    )
+    content = REGIONS_INDEX_TEMPLATE.render(home=urls["home"], cards=cards)
+    return render_page(
+        "Self Storage Regions | Find Local Storage Facilities",
+        "Browse self storage facilities across all UK regions. Our directory helps you find secure storage solutions no matter where you're located in the United Kingdom.",
+        content,
+        depth=1,
+        scripts=CARD_SEARCH_SCRIPT,
+        fragments=fragments
+    )
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write the shared header and footer fragments for SSI/ESI output")
+    parser.add_argument("--dir", default="website", help="Website directory to write the fragments into")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    for path in write_fragments(args.dir):
+        print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
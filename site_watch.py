@@ -0,0 +1,394 @@
+import os
+import sys
+import json
+import time
+import select
+import hashlib
+import argparse
+import importlib
+import threading
+import subprocess
+import ctypes
+import ctypes.util
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import site_paths
+import site_templates
+from site_writer import write_if_changed
+from facility_stream import iter_csv_facilities, group_rows
+from site_aggregates import aggregates_from_groups
+from facility_db import read_sheet_groups
+from site_api import write_api
+
+# Spreadsheet the full build renders every region and city page from
+EXCEL_FILE = 'self storage facilities uk.xlsx'
+
+# Files every generated page depends on; a change to any of them rebuilds the whole site
+TEMPLATE_FILES = ('site_templates.py', 'site_paths.py', 'facility_db.py', 'create_storage_directory.py')
+
+# Seconds between checks for changed files, and between checks that a save has finished
+POLL_INTERVAL = 0.25
+SETTLE_DELAY = 0.1
+
+# URL the preview pages long-poll to learn about new builds, and how long each poll waits
+RELOAD_PATH = '/__watch'
+RELOAD_WAIT = 25
+
+# Added to every HTML page the dev server sends; reloads the page after each rebuild
+RELOAD_SCRIPT = """<script>
+(function poll(version) {
+    fetch('/__watch?since=' + version, {cache: 'no-store'}).then(function (response) {
+        return response.json();
+    }).then(function (data) {
+        if (data.version !== version) { location.reload(); } else { poll(version); }
+    }).catch(function () { setTimeout(function () { poll(version); }, 1000); });
+})($version);
+</script>
+"""
+
+# inotify events that mean a file in a watched folder was written, moved or deleted
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Watch the data, templates and assets, rebuild affected pages and serve a live preview")
+    parser.add_argument("--excel", default=EXCEL_FILE, help="Spreadsheet the site is built from")
+    parser.add_argument("--csv", action="append", default=[], help="Facility CSV applied to existing city pages (repeatable)")
+    parser.add_argument("--port", type=int, default=8000, help="Port of the preview server")
+    parser.add_argument("--no-serve", action="store_true", help="Rebuild on changes without starting the preview server")
+    parser.add_argument("--build", action="store_true", help="Run a full build before watching")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes even where inotify is available")
+    return parser.parse_args()
+
+def group_digest(facilities):
+    """Hash of everything a page shows about a group of facilities."""
+    data = json.dumps([facility.to_list() for facility in facilities], default=str)
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+def csv_city_groups(csv_file):
+    """Return {'region/city': [Facility]} of a facility CSV, keyed like bulk updates."""
+    def city_key(facility):
+        return f"{facility.region.lower()}/{facility.city.lower()}"
+    return dict(group_rows(iter_csv_facilities(csv_file), city_key))
+
+class PollingNotifier:
+    """Waits out the poll interval; used where inotify is unavailable."""
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+
+class InotifyNotifier:
+    """Wakes the watcher as soon as the kernel reports a write in a watched folder (Linux only)."""
+
+    def __init__(self, folders):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for folder in folders:
+            if libc.inotify_add_watch(self.fd, os.fsencode(folder), INOTIFY_MASK) < 0:
+                raise OSError(ctypes.get_errno(), f"Cannot watch {folder}")
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            # Drain the queued events; the file snapshot says what actually changed
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+def make_notifier(folders, poll=False):
+    if poll:
+        return PollingNotifier()
+    try:
+        return InotifyNotifier(folders)
+    except (OSError, AttributeError):
+        return PollingNotifier()
+
+class Watcher:
+    """Reports which watched files were added, changed or removed.
+
+    Files are compared by size and mtime between snapshots. The notifier
+    only decides how soon the next snapshot is taken, so a missed or
+    coalesced inotify event costs at most one poll interval.
+    """
+
+    def __init__(self, files, folders, poll=False, interval=POLL_INTERVAL):
+        self.files = [os.path.abspath(path) for path in files]
+        self.folders = [os.path.abspath(path) for path in folders]
+        self.interval = interval
+        watched_folders = {os.path.dirname(path) for path in self.files}
+        for folder in self.folders:
+            watched_folders.update(root for root, dirs, files in os.walk(folder))
+        self.notifier = make_notifier(sorted(watched_folders), poll)
+        self.state = self.snapshot()
+
+    def snapshot(self):
+        state = {}
+        paths = list(self.files)
+        for folder in self.folders:
+            for root, dirs, files in os.walk(folder):
+                paths.extend(os.path.join(root, file) for file in files)
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[path] = (stat.st_size, stat.st_mtime_ns)
+        return state
+
+    def changes(self, current):
+        return {path for path in current.keys() | self.state.keys() if current.get(path) != self.state.get(path)}
+
+    def wait(self):
+        """Block until at least one watched file changes and return the changed paths."""
+        while True:
+            self.notifier.wait(self.interval)
+            current = self.snapshot()
+            if not self.changes(current):
+                continue
+            # Wait until the files stop changing so half-saved files are never read
+            while True:
+                time.sleep(SETTLE_DELAY)
+                settled = self.snapshot()
+                if settled == current:
+                    break
+                current = settled
+            changed = self.changes(current)
+            self.state = current
+            if changed:
+                return changed
+
+    def ignore_changes(self):
+        """Take the files as they are now, e.g. after the build itself rewrote assets."""
+        self.state = self.snapshot()
+
+class SiteBuilder:
+    """Maps changed inputs to the pages that depend on them and rebuilds only those.
+
+    The dependency graph is:
+      - templates (TEMPLATE_FILES) -> every page, through a full build
+      - spreadsheet rows of a city -> that city page and its JSON API
+        endpoint; if any city, region or count changes, the region, regions
+        and home pages too, which takes a full build
+      - CSV rows of a city -> that city page and its card on the region page
+      - assets -> no pages; the preview just reloads
+    """
+
+    def __init__(self, website_dir, excel_file, csv_files):
+        self.website_dir = website_dir
+        self.excel_file = os.path.abspath(excel_file)
+        self.csv_files = [os.path.abspath(path) for path in csv_files]
+        self.template_files = [os.path.abspath(path) for path in TEMPLATE_FILES]
+        self.excel_digests = {}
+        self.excel_structure = None
+        self.csv_digests = {}
+
+    def watched_files(self):
+        return [self.excel_file, *self.csv_files, *self.template_files]
+
+    def load_state(self):
+        """Record the current inputs as the state the website was built from."""
+        region_data = read_sheet_groups(self.excel_file)
+        self.excel_digests = self.city_digests(region_data)
+        self.excel_structure = (list(self.excel_digests), aggregates_from_groups(region_data))
+        for csv_file in self.csv_files:
+            if os.path.exists(csv_file):
+                self.csv_digests[csv_file] = {key: group_digest(group) for key, group in csv_city_groups(csv_file).items()}
+
+    def city_digests(self, region_data):
+        return {
+            (region, city): group_digest(facilities)
+            for region, cities in region_data.items()
+            for city, facilities in cities.items()
+        }
+
+    def full_build(self):
+        subprocess.run([sys.executable, 'create_storage_directory.py'], check=True)
+        self.load_state()
+        return "Full rebuild"
+
+    def rebuild(self, changed):
+        """Rebuild what depends on the changed paths and return a list of summary lines."""
+        if changed & set(self.template_files):
+            # New page templates apply to in-process renders too
+            importlib.reload(site_paths)
+            importlib.reload(site_templates)
+            return [self.full_build() + " (templates changed)"]
+
+        summary = []
+        if self.excel_file in changed:
+            summary.append(self.rebuild_excel())
+        for csv_file in self.csv_files:
+            if csv_file in changed:
+                summary.append(self.rebuild_csv(csv_file))
+        if any(path.startswith(os.path.abspath(self.website_dir) + os.sep) for path in changed):
+            summary.append("Assets changed")
+        return summary
+
+    def rebuild_excel(self):
+        region_data = read_sheet_groups(self.excel_file)
+        digests = self.city_digests(region_data)
+        structure = (list(digests), aggregates_from_groups(region_data))
+        if structure != self.excel_structure:
+            return self.full_build() + " (cities or counts changed)"
+
+        changed = [key for key, digest in digests.items() if self.excel_digests.get(key) != digest]
+        for region, city in changed:
+            page = site_templates.render_city_page(region, city, region_data[region][city])
+            write_if_changed(os.path.join(self.website_dir, site_paths.city_page_path(region, city)), page)
+        if changed:
+            # Unchanged endpoints are skipped by the writer; the regions index picks up new hashes
+            write_api(self.website_dir, region_data, structure[1])
+        self.excel_digests = digests
+        return f"Rebuilt {len(changed)} city page(s) from {os.path.basename(self.excel_file)}"
+
+    def rebuild_csv(self, csv_file):
+        from bulk_update_storage_facilities import normalize_path, update_city_page, update_region_city_cards
+        from site_aggregates import update_city_counts
+
+        if not os.path.exists(csv_file):
+            return f"{os.path.basename(csv_file)} was removed"
+
+        groups = csv_city_groups(csv_file)
+        digests = {key: group_digest(group) for key, group in groups.items()}
+        previous = self.csv_digests.get(csv_file, {})
+
+        region_updates = {}
+        for city_key, digest in digests.items():
+            if previous.get(city_key) == digest:
+                continue
+            success, message, facility_count = update_city_page(normalize_path(city_key), groups[city_key])
+            if success:
+                region_updates.setdefault(city_key.split('/')[0], {})[city_key] = facility_count
+            else:
+                print(message)
+
+        for region, city_updates in region_updates.items():
+            update_region_city_cards(region, city_updates)
+        if region_updates:
+            update_city_counts({
+                tuple(city_key.split('/')): count
+                for city_updates in region_updates.values()
+                for city_key, count in city_updates.items()
+            })
+        self.csv_digests[csv_file] = digests
+        return f"Updated {sum(len(updates) for updates in region_updates.values())} city page(s) from {os.path.basename(csv_file)}"
+
+class BuildVersion:
+    """Counter bumped after every rebuild; preview pages wait on it to reload."""
+
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def bump(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, since, timeout=RELOAD_WAIT):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != since, timeout)
+            return self.version
+
+class DevServerHandler(SimpleHTTPRequestHandler):
+    """Static handler that disables caching and adds the live reload script to HTML pages."""
+
+    def __init__(self, *args, builds=None, **kwargs):
+        self.builds = builds
+        super().__init__(*args, **kwargs)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def do_GET(self):
+        url_path, _, query = self.path.partition('?')
+        if url_path == RELOAD_PATH:
+            since = query.partition('since=')[2].split('&', 1)[0]
+            version = self.builds.wait(int(since) if since.isdigit() else -1)
+            self.send_body(json.dumps({"version": version}).encode('utf-8'), "application/json")
+            return
+
+        file_path = self.translate_path(self.path)
+        if os.path.isdir(file_path) and url_path.endswith('/'):
+            file_path = os.path.join(file_path, 'index.html')
+        if not file_path.endswith('.html') or not os.path.isfile(file_path):
+            super().do_GET()
+            return
+
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        script = RELOAD_SCRIPT.replace('$version', str(self.builds.version))
+        position = content.rfind('</body>')
+        content = content[:position] + script + content[position:] if position >= 0 else content + script
+        self.send_body(content.encode('utf-8'), "text/html; charset=utf-8")
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(website_dir, port, builds):
+    handler = partial(DevServerHandler, directory=website_dir, builds=builds)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    args = parse_args()
+    website_dir = 'website'
+    builder = SiteBuilder(website_dir, args.excel, args.csv)
+
+    if args.build or not os.path.exists(os.path.join(website_dir, 'index.html')):
+        print(builder.full_build())
+    else:
+        builder.load_state()
+
+    builds = BuildVersion()
+    server = None
+    if not args.no_serve:
+        server = start_server(website_dir, args.port, builds)
+
+    watcher = Watcher(builder.watched_files(), [os.path.join(website_dir, 'assets')], poll=args.poll)
+    print("Watch summary:")
+    print(f"- Watching: {len(watcher.state)} files ({type(watcher.notifier).__name__})")
+    if server:
+        print(f"- Preview: http://127.0.0.1:{server.server_address[1]}/")
+    print("- Press Ctrl+C to stop")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            start_time = time.time()
+            try:
+                summary = builder.rebuild(changed)
+            except Exception as e:
+                summary = [f"Rebuild failed: {e}"]
+            watcher.ignore_changes()
+            builds.bump()
+            elapsed_time = time.time() - start_time
+            for line in summary:
+                print(f"[{time.strftime('%H:%M:%S')}] {line} ({elapsed_time:.2f} seconds)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
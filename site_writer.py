@@ -0,0 +1,223 @@
+import os
+import atexit
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Set STORAGE_DRY_RUN=changes.patch to record what a script would change instead of writing it
+DRY_RUN_ENV_VAR = "STORAGE_DRY_RUN"
+
+class PageChangedError(Exception):
+    """A page changed on disk between the read and the write of a read-modify-write."""
+
+class SiteWriter:
+    """Write generated files atomically, and only when their content changes.
+
+    New content is compared with the file on disk by size and BLAKE2 hash.
+    Identical files are left alone, so their mtimes and any downstream
+    caches stay valid. Changed files are written to a temporary file in the
+    same folder and moved into place with os.replace, so a reader never sees
+    a half-written page. The size and mtime of every file written or checked
+    are remembered with its hash, so a long-running process does not re-read
+    files it already knows are unchanged.
+
+    Pages read with read() are checked again before they are written: if
+    another process changed the file in between, write() raises
+    PageChangedError instead of overwriting that process's edit.
+
+    In dry-run mode nothing is written: each changed file is diffed against
+    the copy on disk, read once, and the diff goes to a patch file. Pages
+    are only rendered once, so a dry run costs about the same as the run.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = {}
+        self.file_stats = {}
+        self.read_states = {}
+        self.patch = None
+        self.dry_run_pages = {}
+        self.written = 0
+        self.skipped = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+        self.summary_registered = False
+
+    def enable_dry_run(self, patch_path, workers=None):
+        """Send every later write to a unified diff at patch_path instead of to disk, until the process exits."""
+        from site_patch import PatchWriter
+
+        self.patch = PatchWriter(patch_path, workers)
+        atexit.register(self.finish_dry_run)
+
+    @contextmanager
+    def dry_run(self, patch_path, workers=None):
+        """Send writes inside the with block to a unified diff at patch_path.
+
+        The patch is finished when the block exits, even on an error, so a
+        long-running process such as the build daemon writes to disk again
+        for its next job.
+        """
+        from site_patch import PatchWriter
+
+        self.patch = PatchWriter(patch_path, workers)
+        try:
+            yield self.patch
+        finally:
+            self.finish_dry_run()
+
+    def finish_dry_run(self):
+        if self.patch:
+            self.patch.close()
+            self.patch.print_summary()
+            self.patch = None
+            self.dry_run_pages.clear()
+
+    def read(self, path):
+        """Read a page as text, remembering what it held so write() can detect later changes."""
+        with open(path, 'rb') as f:
+            data = f.read()
+            stat = os.fstat(f.fileno())
+        with self.lock:
+            self.read_states[os.path.abspath(path)] = (stat.st_size, stat.st_mtime_ns, hashlib.blake2b(data, digest_size=16).hexdigest())
+        # In a dry run, later steps see what earlier steps would have written
+        data = self.dry_run_pages.get(os.path.abspath(path), data)
+        # Same newline handling as reading in text mode
+        return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+    def forget_read(self, path):
+        with self.lock:
+            self.read_states.pop(os.path.abspath(path), None)
+
+    def unchanged_since_read(self, path, state):
+        size, mtime_ns, digest = state
+        try:
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) == (size, mtime_ns):
+                return True
+            with open(path, 'rb') as f:
+                return hashlib.blake2b(f.read(), digest_size=16).hexdigest() == digest
+        except OSError:
+            return False
+
+    def write(self, path, content):
+        """Write str or bytes content to path. Returns True if the file changed."""
+        with self.lock:
+            read_state = self.read_states.pop(os.path.abspath(path), None)
+        if read_state and not self.unchanged_since_read(path, read_state):
+            raise PageChangedError(f"{path} changed on disk after it was read")
+
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if self.patch:
+            return self.write_dry_run(path, content)
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+
+        changed = not self.matches(path, content, digest)
+        if changed:
+            self.replace(path, content)
+        stat = os.stat(path)
+
+        with self.lock:
+            self.files[os.path.abspath(path)] = digest
+            self.file_stats[os.path.abspath(path)] = (stat.st_size, stat.st_mtime_ns)
+            if changed:
+                self.written += 1
+                self.bytes_written += len(content)
+            else:
+                self.skipped += 1
+                self.bytes_skipped += len(content)
+            if not self.summary_registered:
+                self.summary_registered = True
+                atexit.register(self.print_summary)
+
+        return changed
+
+    def write_dry_run(self, path, content):
+        key = os.path.abspath(path)
+        old = self.dry_run_pages.get(key)
+        if old is None:
+            try:
+                with open(path, 'rb') as f:
+                    old = f.read()
+            except OSError:
+                old = b''
+
+        changed = old != content
+        if changed:
+            self.patch.add(path, old, content)
+        with self.lock:
+            if changed:
+                self.dry_run_pages[key] = content
+                self.written += 1
+                self.bytes_written += len(content)
+            else:
+                self.skipped += 1
+                self.bytes_skipped += len(content)
+        return changed
+
+    def matches(self, path, content, digest):
+        """Check whether the file at path already holds exactly this content."""
+        try:
+            stat = os.stat(path)
+            if stat.st_size != len(content):
+                return False
+            key = os.path.abspath(path)
+            if self.files.get(key) == digest and self.file_stats.get(key) == (stat.st_size, stat.st_mtime_ns):
+                return True
+            with open(path, 'rb') as f:
+                return hashlib.blake2b(f.read(), digest_size=16).hexdigest() == digest
+        except OSError:
+            return False
+
+    def replace(self, path, content):
+        folder = os.path.dirname(path) or '.'
+        os.makedirs(folder, exist_ok=True)
+
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+
+        fd, temp_path = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "skipped": self.skipped,
+            "bytes_written": self.bytes_written,
+            "bytes_skipped": self.bytes_skipped
+        }
+
+    def reset_stats(self):
+        """Start counting afresh, e.g. for each job of a long-running process. The hash cache is kept."""
+        with self.lock:
+            self.written = self.skipped = self.bytes_written = self.bytes_skipped = 0
+
+    def print_summary(self):
+        if not self.written and not self.skipped:
+            return
+        if self.patch:
+            print(f"Files that would be written: {self.written} ({self.bytes_written:,} bytes), "
+                  f"unchanged: {self.skipped} ({self.bytes_skipped:,} bytes)")
+            return
+        print(f"Files written: {self.written} ({self.bytes_written:,} bytes), "
+              f"unchanged and skipped: {self.skipped} ({self.bytes_skipped:,} bytes)")
+
+WRITER = SiteWriter()
+if os.environ.get(DRY_RUN_ENV_VAR):
+    WRITER.enable_dry_run(os.environ[DRY_RUN_ENV_VAR])
+
+def write_if_changed(path, content):
+    """Atomically write content to path unless the file already holds it."""
+    return WRITER.write(path, content)
@@ -0,0 +1,89 @@
+import sys
+import time
+
+# Subcommands as (module, function, description). Nothing is imported until a
+# subcommand runs, so --help and light subcommands never load pandas or bs4.
+# The build script has no main(), so it is run from source instead.
+COMMANDS = {
+    "build": ("create_storage_directory", None, "Build the whole website from the spreadsheet"),
+    "verify": ("check_site_links", "main", "Check every internal link in the website"),
+    "sitemap": ("generate_sitemap", "generate_sitemap", "Write website/sitemap.xml"),
+    "search-index": ("find_all_storage_pages", "find_all_storage_pages", "Write the region and city search data"),
+    "deploy-diff": ("deploy_diff", "main", "List or archive the files changed since the last deploy"),
+    "bulk-update": ("bulk_update_storage_facilities", "main", "Update city pages from a facility CSV"),
+}
+
+# Commands timed by the startup benchmark; each is run with --help
+BENCHMARK_COMMANDS = ("--help", "deploy-diff --help", "verify --help", "bulk-update --help")
+
+def print_help():
+    print("usage: storagefinder.py <command> [arguments]")
+    print()
+    print("commands:")
+    for name, (module, function, description) in COMMANDS.items():
+        print(f"  {name:<16}{description}")
+    print(f"  {'bench-startup':<16}Time how long the CLI takes to start")
+    print()
+    print("Run 'storagefinder.py <command> --help' for the options of a command.")
+
+def run_command(name, args):
+    module_name, function, description = COMMANDS[name]
+    # Only the main() commands parse options; the others would run on --help
+    if function != "main" and any(arg in ("-h", "--help") for arg in args):
+        print(f"usage: storagefinder.py {name}")
+        print()
+        print(f"{description}. This command takes no options.")
+        return
+
+    sys.argv = [f"{module_name}.py", *args]
+    if function is None:
+        import runpy
+        runpy.run_path(f"{module_name}.py", run_name="__main__")
+        return
+
+    import importlib
+    getattr(importlib.import_module(module_name), function)()
+
+def bench_startup(args):
+    """Time each benchmark command in a fresh interpreter and report the median."""
+    import argparse
+    import statistics
+    import subprocess
+
+    parser = argparse.ArgumentParser(prog="storagefinder.py bench-startup", description="Time how long the CLI takes to start")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command")
+    options = parser.parse_args(args)
+
+    print("Startup benchmark summary:")
+    baseline = []
+    for _ in range(options.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append(time.perf_counter() - start)
+    print(f"- python (empty interpreter): {statistics.median(baseline) * 1000:.0f} ms")
+
+    for command in BENCHMARK_COMMANDS:
+        timings = []
+        for _ in range(options.runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, __file__, *command.split()], check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - start)
+        print(f"- storagefinder.py {command}: {statistics.median(timings) * 1000:.0f} ms")
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print_help()
+        return
+
+    name, args = sys.argv[1], sys.argv[2:]
+    if name == "bench-startup":
+        bench_startup(args)
+    elif name in COMMANDS:
+        run_command(name, args)
+    else:
+        print(f"Unknown command: {name}")
+        print_help()
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import pandas as pd
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def update_aberdeen_page():
     """Update the Aberdeen city page with data from Excel."""
@@ -128,8 +129,7 @@ def update_aberdeen_page():
         storage_list.append(card)
     
     # Update the HTML file
-    with open(aberdeen_html, 'w', encoding='utf-8') as f:
-        f.write(str(soup))
+    write_if_changed(aberdeen_html, str(soup))
     
     print(f"Successfully updated Aberdeen page with {len(aberdeen_df)} facilities")
 
@@ -155,8 +155,7 @@ def update_aberdeen_page():
                 print(f"Updated region page with '{facility_text}' for Aberdeen")
     
     # Save the region page
-    with open(region_html, 'w', encoding='utf-8') as f:
-        f.write(str(region_soup))
+    write_if_changed(region_html, str(region_soup))
 
 if __name__ == "__main__":
     update_aberdeen_page() 
\ No newline at end of file
@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 import os
 import re
 import time
+from site_writer import write_if_changed
 
 def normalize_name(name):
     """Normalize a name by converting to lowercase, removing special characters, and replacing spaces with hyphens."""
@@ -185,8 +186,7 @@ def update_city_page(region, city, facilities_data, dry_run=False):
     
     # Update the HTML file
     try:
-        with open(city_html_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(city_html_path, str(soup))
     except Exception as e:
         return False, f"Error writing to file {city_html_path}: {str(e)}"
     
@@ -243,8 +243,7 @@ def update_region_page(region, cities_data, dry_run=False):
     
     # Save the region page
     try:
-        with open(region_html_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(region_html_path, str(soup))
     except Exception as e:
         return False, f"Error writing to file {region_html_path}: {str(e)}"
     
@@ -2,6 +2,7 @@ import os
 import re
 from bs4 import BeautifulSoup
 import time
+from site_writer import write_if_changed
 
 def update_homepage():
     with open('website/index.html', 'r', encoding='utf-8') as f:
@@ -147,8 +148,7 @@ function searchLocation() {
     soup.body.append(script)
     
     # Save updated file
-    with open('website/index.html', 'w', encoding='utf-8') as f:
-        f.write(str(soup))
+    write_if_changed('website/index.html', str(soup))
     print("Updated homepage")
 
 def update_region_pages():
@@ -456,8 +456,7 @@ function searchCity() {
             soup.body.append(script)
         
         # Save updated file
-        with open(region_page, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(region_page, str(soup))
 
 def update_city_pages():
     for region_dir in os.listdir('website'):
@@ -644,8 +643,7 @@ def update_city_pages():
                 footer.append(container)
             
             # Save updated file
-            with open(city_page, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
+            write_if_changed(city_page, str(soup))
             print(f"Updated city page: {region_dir}/{city_dir}")
 
 def update_top_level_pages():
@@ -761,8 +759,7 @@ def update_top_level_pages():
             footer.append(container)
         
         # Save updated file
-        with open(page_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(page_path, str(soup))
         print(f"Updated page: {page_dir}")
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import os
 import re
+from site_writer import write_if_changed
 
 def update_calculator_links():
     """
@@ -25,8 +26,7 @@ def update_calculator_links():
     content = content.replace(pattern, new_link)
     
     # Save the updated homepage
-    with open(homepage_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    write_if_changed(homepage_path, content)
     
     print("Successfully updated calculator links to point to the dedicated page!")
 
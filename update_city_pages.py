@@ -1,9 +1,12 @@
 import pandas as pd
 import os
 import re
-from bs4 import BeautifulSoup
 import random
 import sys
+from site_paths import city_page_path
+from site_templates import render_city_page, ensure_fragments
+from site_writer import write_if_changed
+from facility_record import Facility
 
 # Set to process specific regions by default
 TARGET_REGIONS = ["Hampshire", "Wiltshire"]
@@ -94,117 +97,39 @@ def format_location(location):
 def update_city_page(region, city, facilities_data):
     """Update a city page with real storage facility data."""
     try:
-        # Normalize inputs
-        region = region.lower().replace(' ', '')
-        clean_city = clean_city_name(city).lower().replace(' ', '')
-        clean_city = re.sub(r'[^\w]', '', clean_city)  # Remove any non-alphanumeric chars
-        
         # Define the path to the HTML file
-        file_path = f"website/selfstorage{region}/selfstorage{clean_city}/index.html"
+        file_path = os.path.join("website", city_page_path(region, clean_city_name(city)))
         
         # Check if the file exists
         if not os.path.exists(file_path):
             print(f"File not found: {file_path}")
             return False
         
-        # Read the HTML file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
-        
-        # Find the storage-list div
-        storage_list = soup.select_one('.storage-list')
-        if not storage_list:
-            print(f"Storage list not found in {file_path}")
-            return False
-        
-        # Clear existing storage cards
-        storage_list.clear()
-        
-        # Add real storage facilities
-        facility_count = 0
+        # Build plain facility records from the spreadsheet rows
+        facilities = []
         for _, facility in facilities_data.iterrows():
-            try:
-                # Create a new storage card
-                storage_card = soup.new_tag('div', attrs={'class': 'storage-card'})
-                
-                # Add facility name
-                name = facility['Name of Self Storage']
-                if pd.isna(name) or not name:
-                    name = "Storage Facility"
-                h3 = soup.new_tag('h3')
-                h3.string = str(name)
-                storage_card.append(h3)
-                
-                # Add facility info container
-                info_div = soup.new_tag('div', attrs={'class': 'storage-info'})
-                
-                # Add address
-                address_p = soup.new_tag('p')
-                address_strong = soup.new_tag('strong')
-                address_strong.string = "Address: "
-                address_p.append(address_strong)
-                address_p.append(format_location(facility['Location']))
-                info_div.append(address_p)
-                
-                # Add description
-                desc_p = soup.new_tag('p')
-                desc_strong = soup.new_tag('strong')
-                desc_strong.string = "Description: "
-                desc_p.append(desc_strong)
-                
-                # Generate a description if none is provided
-                description = f"{name} offers self storage solutions in {city}, with various unit sizes available to meet your personal and business storage needs."
-                desc_p.append(description)
-                info_div.append(desc_p)
-                
-                # Add features
-                features_div = soup.new_tag('div', attrs={'class': 'features-list'})
-                for feature in get_features():
-                    feature_span = soup.new_tag('span', attrs={'class': 'feature-tag'})
-                    feature_span.string = feature
-                    features_div.append(feature_span)
-                info_div.append(features_div)
-                
-                # Add contact info
-                contact_div = soup.new_tag('div', attrs={'class': 'contact-info'})
-                
-                # Add phone
-                phone_p = soup.new_tag('p')
-                phone_strong = soup.new_tag('strong')
-                phone_strong.string = "Phone: "
-                phone_p.append(phone_strong)
-                
-                phone_href, phone_display = get_phone_link(facility['Telephone Number'])
-                phone_a = soup.new_tag('a', href=phone_href)
-                phone_a.string = phone_display
-                phone_p.append(phone_a)
-                contact_div.append(phone_p)
-                
-                # Add website
-                website_p = soup.new_tag('p')
-                website_strong = soup.new_tag('strong')
-                website_strong.string = "Website: "
-                website_p.append(website_strong)
-                
-                website_href, website_display = get_website_link(facility['Website'])
-                website_a = soup.new_tag('a', href=website_href, target="_blank")
-                website_a.string = website_display
-                website_p.append(website_a)
-                contact_div.append(website_p)
-                
-                info_div.append(contact_div)
-                storage_card.append(info_div)
-                storage_list.append(storage_card)
-                facility_count += 1
-            except Exception as e:
-                print(f"Error processing facility {_}: {e}")
-                continue
+            name = facility['Name of Self Storage']
+            if pd.isna(name) or not name:
+                name = "Storage Facility"
+            
+            _, phone = get_phone_link(facility['Telephone Number'])
+            _, website = get_website_link(facility['Website'])
+            
+            facilities.append(Facility(
+                name=str(name),
+                address=format_location(facility['Location']),
+                description=f"{name} offers self storage solutions in {city}, with various unit sizes available to meet your personal and business storage needs.",
+                features=get_features(),
+                phone=phone,
+                website=website,
+                region=region,
+                city=city
+            ))
         
-        # Write the updated HTML back to the file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        # Render the whole page from the facility records
+        write_if_changed(file_path, render_city_page(region, city, facilities))
         
-        print(f"Updated {file_path} with {facility_count} facilities")
+        print(f"Updated {file_path} with {len(facilities)} facilities")
         return True
     
     except Exception as e:
@@ -217,6 +142,8 @@ def main():
         excel_data = pd.read_excel("self storage facilities uk.xlsx")
         print(f"Read {len(excel_data)} facilities from Excel file")
         
+        ensure_fragments("website")
+        
         # Process target regions
         for region in TARGET_REGIONS:
             region_data = excel_data[excel_data['Region'] == region]
@@ -1,5 +1,6 @@
 import os
 import re
+from site_writer import write_if_changed
 
 def update_contact_page():
     """
@@ -71,8 +72,7 @@ def update_contact_page():
     )
     
     # Write the updated content back to the file
-    with open(contact_page, 'w', encoding='utf-8') as f:
-        f.write(content)
+    write_if_changed(contact_page, content)
     
     print("Contact page updated successfully")
 
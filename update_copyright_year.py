@@ -1,32 +1,30 @@
-import os
 from datetime import datetime
+from site_writer import write_if_changed
+from page_index import load_page_index
+from site_templates import require_inline_pages
 
 def update_copyright_year():
     """
     Updates the copyright year in the footer across all HTML files
     """
     website_dir = 'website'
+    require_inline_pages(website_dir, "The footer year comes from FOOTER_TEMPLATE in site_templates.py and is current after every build; rebuild instead.")
     current_year = datetime.now().year
     updated_count = 0
     
-    # Walk through all subdirectories of the website directory
-    for root, dirs, files in os.walk(website_dir):
-        for file in files:
-            if file.endswith('.html'):
-                file_path = os.path.join(root, file)
-                
-                # Read the file content
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                # Replace the copyright year
-                if '© 2024 Storage Finder' in content:
-                    content = content.replace('© 2024 Storage Finder', f'© {current_year} Storage Finder')
-                    updated_count += 1
-                    
-                    # Write the updated content back to the file
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+    # Only pages the index found a 2024 copyright on need opening
+    for file_path in load_page_index(website_dir).pages_where('copyright_year', lambda years: '2024' in years):
+        # Read the file content
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        
+        # Replace the copyright year
+        if '© 2024 Storage Finder' in content:
+            content = content.replace('© 2024 Storage Finder', f'© {current_year} Storage Finder')
+            updated_count += 1
+            
+            # Write the updated content back to the file
+            write_if_changed(file_path, content)
     
     print(f"Updated copyright year to {current_year} on {updated_count} pages")
 
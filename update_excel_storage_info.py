@@ -4,6 +4,8 @@ from bs4 import BeautifulSoup
 import time
 import pandas as pd
 import glob
+from site_writer import write_if_changed
+from facility_record import Facility
 
 def parse_excel_data(excel_file):
     """Parse the data from the Excel file."""
@@ -51,15 +53,17 @@ def parse_excel_data(excel_file):
                 # Add some default features
                 features = ["Secure Facility", "24/7 Access"]
                 
-                facility = {
-                    'name': name,
-                    'address': address,
-                    'phone': phone,
-                    'website': website,
-                    'email': email,
-                    'description': description,
-                    'features': features
-                }
+                facility = Facility(
+                    name=name,
+                    address=address,
+                    phone=phone,
+                    website=website,
+                    email=email,
+                    description=description,
+                    features=features,
+                    region=region,
+                    city=city
+                )
                 
                 facilities_by_city[region_key][city_key].append(facility)
                 
@@ -300,8 +304,7 @@ def update_city_page(city, region, region_dir_name, city_dir_name, facilities_da
             storage_list.append(card)
         
         # Update the HTML file
-        with open(city_index, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(city_index, str(soup))
         
         print(f"Successfully updated {city_index} with {len(facilities_data)} facilities")
         return True
@@ -363,8 +366,7 @@ def update_region_page(region, region_dir_name, cities_facilities):
                         updated_count += 1
         
         # Update the HTML file
-        with open(region_index, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(region_index, str(soup))
         
         print(f"Updated {updated_count} city cards in {region_dir_name}")
         return True
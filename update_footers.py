@@ -1,10 +1,13 @@
 import os
 import re
 from pathlib import Path
+from site_locks import edit_page
+from site_templates import require_inline_pages
 
 def update_footers():
     """Update all HTML files to add sitemap link to footer navigation"""
     website_dir = Path("website")
+    require_inline_pages(website_dir, "The footer's Navigate column links the sitemap through FOOTER_COLUMNS in site_templates.py; change it there and rebuild.")
     
     # Counter for tracking changes
     files_updated = 0
@@ -27,17 +30,9 @@ def update_footers():
             if file.endswith(".html"):
                 file_path = os.path.join(root, file)
                 
-                # Read the HTML content
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Update the navigation section in footer
-                updated_content = nav_pattern.sub(replacement, content)
-                
-                # If content was changed, write it back to the file
-                if updated_content != content:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(updated_content)
+                # Update the navigation section in footer, holding the page's
+                # lock so a script running alongside cannot lose either edit
+                if edit_page(file_path, lambda content: nav_pattern.sub(replacement, content)):
                     files_updated += 1
                     print(f"Updated footer in: {file_path}")
     
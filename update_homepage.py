@@ -1,6 +1,7 @@
 import os
 import re
 from bs4 import BeautifulSoup
+from site_writer import write_if_changed
 
 def update_homepage():
     """
@@ -267,8 +268,7 @@ def update_homepage():
     final_html = new_html + f"<script>{script_content}</script></body>\n</html>"
     
     # Save the updated homepage
-    with open(homepage_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
+    write_if_changed(homepage_path, final_html)
     
     print(f"Successfully updated the homepage with new design")
 
@@ -310,14 +310,12 @@ def create_placeholder_image():
         </html>
         """
         
-        with open('website/assets/images/placeholder.html', 'w') as f:
-            f.write(placeholder_html)
+        write_if_changed('website/assets/images/placeholder.html', placeholder_html)
         
         print("Created placeholder image generator HTML. Please open it in a browser to generate the placeholder.jpg")
         
         # For now, create a simple text file as a placeholder since we can't generate an actual image directly
-        with open('website/assets/images/placeholder.jpg', 'w') as f:
-            f.write("This is a placeholder for an image. Replace with an actual JPEG file.")
+        write_if_changed('website/assets/images/placeholder.jpg', "This is a placeholder for an image. Replace with an actual JPEG file.")
             
     except Exception as e:
         print(f"Error creating placeholder image: {e}")
@@ -2,11 +2,14 @@ import pandas as pd
 import os
 import re
 import sys
-from bs4 import BeautifulSoup
 import random
 import time
 import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from placeholder_scanner import EXAMPLE_FACILITY_SCANNER
+from site_templates import render_city_page, ensure_fragments
+from site_writer import write_if_changed
+from facility_record import Facility
 
 # Default regions to process - focus on major metropolitan areas first
 DEFAULT_REGIONS = [
@@ -104,13 +107,17 @@ def get_city_data(city_name, region_name):
     
     city_data = []
     for i in range(num_facilities):
-        facility = {
-            "name": format_storage_name(city_name),
-            "address": f"{random.randint(1, 100)} {random.choice(['High Street', 'Main Road', 'Industrial Estate', 'Business Park', 'Commercial Way'])}, {city_name}, {region_name}",
-            "phone": format_phone(),
-            "website": format_website(city_name, region_name),
-            "features": generate_features()
-        }
+        name = format_storage_name(city_name)
+        facility = Facility(
+            name=name,
+            address=f"{random.randint(1, 100)} {random.choice(['High Street', 'Main Road', 'Industrial Estate', 'Business Park', 'Commercial Way'])}, {city_name}, {region_name}",
+            phone=format_phone(),
+            website=format_website(city_name, region_name),
+            description=f"{name} offers self storage solutions in {city_name}, with various unit sizes available to meet your personal and business storage needs.",
+            features=generate_features(),
+            region=region_name,
+            city=city_name
+        )
         city_data.append(facility)
     
     return city_data
@@ -118,11 +125,6 @@ def get_city_data(city_name, region_name):
 def find_placeholder_cities():
     """Find city pages that contain example/placeholder storage facilities."""
     placeholder_cities = []
-    placeholder_patterns = [
-        "example.com", "example.org", "123-456-7890", "987-654-3210",
-        "abc storage", "xyz storage", "123 main st", "456 oak ave"
-    ]
-    
     for root, dirs, files in os.walk("website"):
         for file in files:
             if file == "index.html" and "selfstorage" in root and "selfstorageregions" not in root:
@@ -133,15 +135,9 @@ def find_placeholder_cities():
                     
                     try:
                         with open(filepath, 'r', encoding='utf-8') as f:
-                            content = f.read().lower()  # Convert to lowercase for case-insensitive matching
-                        
-                        has_placeholder = False
-                        for pattern in placeholder_patterns:
-                            if pattern in content:
-                                has_placeholder = True
-                                break
+                            content = f.read()
                         
-                        if has_placeholder:
+                        if EXAMPLE_FACILITY_SCANNER.contains(content):
                             city_path = root
                             region_path = os.path.dirname(city_path)
                             region_name = os.path.basename(region_path).replace('selfstorage', '')
@@ -159,93 +155,14 @@ def update_city_page(city_info):
     region_name, city_name, filepath = city_info
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
-        
-        # Find the storage-list div
-        storage_list = soup.select_one('.storage-list')
-        if not storage_list:
-            print(f"Storage list not found in {filepath}")
-            return False
-        
-        # Clear existing storage cards
-        storage_list.clear()
-        
         # Generate storage facility data
         clean_city = city_name.replace('-', ' ').title()
         clean_region = region_name.replace('-', ' ').title()
         
         city_data = get_city_data(clean_city, clean_region)
         
-        # Add facilities to the page
-        for facility in city_data:
-            card = soup.new_tag('div', attrs={'class': 'storage-card'})
-            
-            # Add name
-            name_heading = soup.new_tag('h3')
-            name_heading.string = facility['name']
-            card.append(name_heading)
-            
-            # Add info section
-            info_div = soup.new_tag('div', attrs={'class': 'storage-info'})
-            
-            # Add address
-            address_p = soup.new_tag('p')
-            address_strong = soup.new_tag('strong')
-            address_strong.string = "Address: "
-            address_p.append(address_strong)
-            address_p.append(facility['address'])
-            info_div.append(address_p)
-            
-            # Add description
-            desc_p = soup.new_tag('p')
-            desc_strong = soup.new_tag('strong')
-            desc_strong.string = "Description: "
-            desc_p.append(desc_strong)
-            desc_p.append(f"{facility['name']} offers self storage solutions in {clean_city}, with various unit sizes available to meet your personal and business storage needs.")
-            info_div.append(desc_p)
-            
-            # Add features
-            features_div = soup.new_tag('div', attrs={'class': 'features-list'})
-            for feature in facility['features']:
-                feature_span = soup.new_tag('span', attrs={'class': 'feature-tag'})
-                feature_span.string = feature
-                features_div.append(feature_span)
-            info_div.append(features_div)
-            
-            # Add contact info section
-            contact_div = soup.new_tag('div', attrs={'class': 'contact-info'})
-            
-            # Add phone
-            phone_p = soup.new_tag('p')
-            phone_strong = soup.new_tag('strong')
-            phone_strong.string = "Phone: "
-            phone_p.append(phone_strong)
-            
-            phone_a = soup.new_tag('a', href=f"tel:{facility['phone'].replace(' ', '')}")
-            phone_a.string = facility['phone']
-            phone_p.append(phone_a)
-            contact_div.append(phone_p)
-            
-            # Add website
-            website_p = soup.new_tag('p')
-            website_strong = soup.new_tag('strong')
-            website_strong.string = "Website: "
-            website_p.append(website_strong)
-            
-            website_a = soup.new_tag('a', href=facility['website'], target="_blank")
-            website_domain = facility['website'].replace('https://www.', '')
-            website_a.string = website_domain
-            website_p.append(website_a)
-            contact_div.append(website_p)
-            
-            info_div.append(contact_div)
-            card.append(info_div)
-            storage_list.append(card)
-        
-        # Write the updated HTML back to the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        # Render the whole page from the facility records
+        write_if_changed(filepath, render_city_page(clean_region, clean_city, city_data))
         
         return True
     
@@ -296,6 +213,8 @@ def main():
     
     print(f"Updating {len(cities_to_process)} cities...")
     
+    ensure_fragments("website")
+    
     # Process cities with threading for speed
     updated_count = 0
     failed_count = 0
@@ -4,6 +4,7 @@ from bs4 import BeautifulSoup
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from site_writer import write_if_changed
 
 def find_region_pages():
     """Find all region index.html files in the website directory."""
@@ -245,8 +246,7 @@ def update_region_page(filepath):
                 element.replace_with('')
         
         # Write the updated HTML back to the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(filepath, str(soup))
         
         return True
     
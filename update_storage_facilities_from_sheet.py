@@ -5,6 +5,8 @@ from bs4 import BeautifulSoup
 import time
 import argparse
 from concurrent.futures import ThreadPoolExecutor
+from site_writer import write_if_changed
+from facility_record import Facility
 
 def parse_args():
     """Parse command line arguments."""
@@ -42,17 +44,19 @@ def read_csv_data(csv_file):
                 if 'Features' in row:
                     features = [feat.strip() for feat in row['Features'].split(',') if feat.strip()]
                 
-                facility = {
-                    'name': row.get('Name', '').strip(),
-                    'address': row.get('Address', '').strip(),
-                    'phone': row.get('Phone', '').strip(),
-                    'website': row.get('Website', '').strip(),
-                    'description': row.get('Description', '').strip(),
-                    'features': features
-                }
+                facility = Facility(
+                    name=row.get('Name', '').strip(),
+                    address=row.get('Address', '').strip(),
+                    phone=row.get('Phone', '').strip(),
+                    website=row.get('Website', '').strip(),
+                    description=row.get('Description', '').strip(),
+                    features=features,
+                    region=row.get('Region', '').strip(),
+                    city=row.get('City', '').strip()
+                )
                 
                 # Only add if it has at least a name
-                if facility['name']:
+                if facility.name:
                     facilities_data[key].append(facility)
         
         return facilities_data
@@ -179,8 +183,7 @@ def update_city_page(file_path, facilities, dry_run=False):
             return True, f"Dry run: Would update {facility_count} facilities"
         else:
             # Write the updated content back to the file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
+            write_if_changed(file_path, str(soup))
             
             city_name = os.path.basename(os.path.dirname(file_path))
             print(f"Updated {city_name} with {facility_count} facilities")
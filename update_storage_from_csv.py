@@ -5,6 +5,9 @@ import json
 from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor
 import time
+from site_writer import write_if_changed
+from facility_stream import iter_csv_facilities, group_rows
+from facility_record import Facility
 
 def load_csv_data(csv_file='correct_storage_facilities.csv'):
     """Load storage facility data from CSV file."""
@@ -27,14 +30,16 @@ def load_csv_data(csv_file='correct_storage_facilities.csv'):
             if row['Features']:
                 features = [feat.strip() for feat in row['Features'].split(',')]
             
-            facility = {
-                'name': row['Name'],
-                'address': row['Address'],
-                'phone': row['Phone'],
-                'website': row['Website'],
-                'description': row['Description'],
-                'features': features
-            }
+            facility = Facility(
+                name=row['Name'],
+                address=row['Address'],
+                phone=row['Phone'],
+                website=row['Website'],
+                description=row['Description'],
+                features=features,
+                region=row['Region'],
+                city=row['City']
+            )
             
             facilities_by_city[region][city].append(facility)
     
@@ -155,8 +160,7 @@ def update_city_page(region, city, facilities_data):
             storage_list.append(card)
         
         # Update the HTML file
-        with open(city_index, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(city_index, str(soup))
         
         print(f"Successfully updated {city_index} with {len(facilities_data)} facilities")
         return True
@@ -165,7 +169,10 @@ def update_city_page(region, city, facilities_data):
         return False
 
 def update_region_page(region, cities_data):
-    """Update the region page with the correct count of storage facilities per city."""
+    """Update the region page with the correct count of storage facilities per city.
+    
+    cities_data maps each city to its number of facilities.
+    """
     region_dir_name = get_region_directory(region)
     region_dir = f"website/selfstorage{region_dir_name}"
     region_index = f"{region_dir}/index.html"
@@ -196,7 +203,7 @@ def update_region_page(region, cities_data):
                     break
             
             if matched_city:
-                facilities_count = len(cities_data[matched_city])
+                facilities_count = cities_data[matched_city]
                 facility_text = f"{facilities_count} Storage {'Facilities' if facilities_count != 1 else 'Facility'}"
                 
                 # Update the count text
@@ -208,8 +215,7 @@ def update_region_page(region, cities_data):
                         updated_count += 1
         
         # Update the HTML file
-        with open(region_index, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        write_if_changed(region_index, str(soup))
         
         print(f"Updated {updated_count} city cards in {region_dir_name}")
         return True
@@ -217,30 +223,33 @@ def update_region_page(region, cities_data):
         print(f"Error updating {region_index}: {e}")
         return False
 
+def csv_city_key(facility):
+    """Group key matching load_csv_data: lowercase region and city without spaces."""
+    return facility.region.lower().replace(' ', ''), facility.city.lower().replace(' ', '')
+
 def main():
     """Main function to update all pages."""
     start_time = time.time()
     
-    # Load data from CSV
-    facilities_data = load_csv_data()
-    
     total_updated = 0
     errors = 0
+    city_counts = {}
     
-    # Process one region at a time to handle errors better
-    for region, cities in facilities_data.items():
+    # Stream the CSV in city groups, updating each city page as its group
+    # completes, so large feeds are never held in memory at once
+    for (region, city), facilities in group_rows(iter_csv_facilities('correct_storage_facilities.csv'), csv_city_key,
+                                                     encode=Facility.to_list, decode=Facility.from_list):
+        print(f"  Processing city: {city} ({region})")
+        if update_city_page(region, city, facilities):
+            total_updated += 1
+        else:
+            errors += 1
+        city_counts.setdefault(region, {})[city] = len(facilities)
+    
+    # Region pages only need the facility count of each city
+    for region, cities in city_counts.items():
         print(f"\nProcessing region: {region}")
-        
-        # Update the region page
         update_region_page(region, cities)
-        
-        # Update each city page
-        for city, facilities in cities.items():
-            print(f"  Processing city: {city}")
-            if update_city_page(region, city, facilities):
-                total_updated += 1
-            else:
-                errors += 1
     
     end_time = time.time()
     time_taken = end_time - start_time
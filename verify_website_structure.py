@@ -4,6 +4,8 @@ from bs4 import BeautifulSoup
 import time
 from concurrent.futures import ThreadPoolExecutor
 import argparse
+from placeholder_scanner import VERIFY_SCANNER
+from check_site_links import check_links as check_site_links
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Verify website structure")
@@ -40,17 +42,9 @@ def check_html_file(filepath, check_links=False, verbose=False):
             warnings.append(f"Very short meta description: {meta_desc['content']}")
         
         # Check for placeholder content
-        example_patterns = [
-            r'example storage', r'sample facility', r'placeholder', 
-            r'john doe', r'jane smith', r'test storage', 
-            r'demo storage', r'123-?456-?7890', r'www\.example\.com'
-        ]
-        
-        for pattern in example_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                issues.append(f"Contains placeholder content: {matches[0]}")
-                break
+        hit = VERIFY_SCANNER.search(content)
+        if hit:
+            issues.append(f"Contains placeholder content: {hit[2]}")
         
         # Check navigation
         nav = soup.find('nav')
@@ -162,6 +156,21 @@ def main():
             except Exception as e:
                 print(f"Error: {str(e)}")
     
+    # Resolve every internal link against the files on disk
+    if args.check_links:
+        print("Building internal link graph...")
+        website_dir = os.path.join(os.getcwd(), "website")
+        link_report = check_site_links(website_dir)
+        
+        for filepath, issues, warnings in results:
+            rel_page = os.path.relpath(filepath, website_dir).replace(os.sep, '/')
+            for href in link_report["broken"].get(rel_page, []):
+                issues.append(f"Broken link: {href}")
+            if rel_page in link_report["orphans"]:
+                warnings.append("Orphan page")
+        
+        print(f"Checked {link_report['links']} internal links, {len(link_report['orphans'])} orphan pages")
+    
     # Summarize results
     no_issues_files = []
     warnings_only_files = []